@@ -1,46 +1,144 @@
+use pyo3::exceptions::PyRuntimeError;
 use pyo3::prelude::*;
-use tokio::net::TcpStream;
+use std::net::SocketAddr;
+use std::sync::{Arc, OnceLock};
+use tokio::net::{lookup_host, TcpStream};
+use tokio::runtime::Runtime;
+use tokio::sync::Semaphore;
+use tokio::task::{AbortHandle, JoinSet};
 use tokio::time::{timeout, Duration};
-use futures::stream::{FuturesUnordered, StreamExt};
-use std::sync::Arc;
 
-#[pyfunction]
-fn scan_ports(_py: Python<'_>, host: String, ports: Vec<u16>, timeout_ms: u64, concurrency: usize) -> PyResult<Vec<(u16, bool)>> {
-    pyo3::prepare_freethreaded_python();
+// Open ports only, sorted: closed ports cost nothing on either side of the boundary
+type HostResult = (String, Vec<u16>);
+
+// One multi-threaded runtime per process, built on first use and shared by every call
+static RUNTIME: OnceLock<Runtime> = OnceLock::new();
+
+fn runtime() -> PyResult<&'static Runtime> {
+    if let Some(rt) = RUNTIME.get() {
+        return Ok(rt);
+    }
     let rt = tokio::runtime::Builder::new_multi_thread()
         .enable_all()
+        .thread_name("sentinelscope-rs")
         .build()
-        .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(format!("tokio runtime error: {e}")))?;
-
-    let result = rt.block_on(async move {
-        let sem = Arc::new(tokio::sync::Semaphore::new(concurrency));
-        let mut tasks = FuturesUnordered::new();
-        for port in ports {
-            let sem_clone = Arc::clone(&sem);
-            let permit = sem_clone.acquire_owned().await.unwrap();
-            let h = host.clone();
-            tasks.push(async move {
-                let res = timeout(Duration::from_millis(timeout_ms), TcpStream::connect((h.as_str(), port))).await;
-                drop(permit);
-                match res {
-                    Ok(Ok(_stream)) => (port, true),
-                    _ => (port, false),
-                }
-            });
+        .map_err(|e| PyRuntimeError::new_err(format!("tokio runtime error: {e}")))?;
+    // A racing thread may have won; its runtime is kept and ours is dropped
+    Ok(RUNTIME.get_or_init(|| rt))
+}
+
+async fn probe(addr: SocketAddr, timeout_ms: u64) -> bool {
+    matches!(
+        timeout(Duration::from_millis(timeout_ms), TcpStream::connect(addr)).await,
+        Ok(Ok(_))
+    )
+}
+
+async fn scan_host(host: String, ports: Vec<u16>, timeout_ms: u64, sem: Arc<Semaphore>) -> HostResult {
+    // Resolve once per host rather than once per port
+    let ip = match lookup_host((host.as_str(), 0)).await {
+        Ok(mut addrs) => addrs.next().map(|a| a.ip()),
+        Err(_) => None,
+    };
+    let Some(ip) = ip else {
+        return (host, Vec::new());
+    };
+    let mut tasks = JoinSet::new();
+    for port in ports {
+        let sem = Arc::clone(&sem);
+        // Each task waits for its own permit, so every probe is queued up front and
+        // starts the moment a slot frees up
+        tasks.spawn(async move {
+            let _permit = sem.acquire_owned().await;
+            (port, probe(SocketAddr::new(ip, port), timeout_ms).await)
+        });
+    }
+    let mut out = Vec::new();
+    while let Some(r) = tasks.join_next().await {
+        if let Ok((port, true)) = r {
+            out.push(port);
         }
-        let mut out: Vec<(u16, bool)> = Vec::new();
-        while let Some(r) = tasks.next().await {
-            out.push(r);
+    }
+    out.sort_unstable();
+    (host, out)
+}
+
+async fn scan_targets(targets: Vec<(String, Vec<u16>)>, timeout_ms: u64, concurrency: usize) -> Vec<HostResult> {
+    // One budget of in-flight connects shared by every host
+    let sem = Arc::new(Semaphore::new(concurrency.max(1)));
+    // Held in a JoinSet so that dropping this future (a cancelled ScanHandle) aborts every host
+    let mut hosts = JoinSet::new();
+    let mut slots: Vec<Option<HostResult>> = Vec::with_capacity(targets.len());
+    for (i, (host, ports)) in targets.into_iter().enumerate() {
+        let sem = Arc::clone(&sem);
+        hosts.spawn(async move { (i, scan_host(host, ports, timeout_ms, sem).await) });
+        slots.push(None);
+    }
+    while let Some(r) = hosts.join_next().await {
+        if let Ok((i, result)) = r {
+            slots[i] = Some(result);
         }
-        out
-    });
+    }
+    // Back in input order
+    slots.into_iter().flatten().collect()
+}
 
-    Ok(result)
+/// Scan ``ports`` on ``host`` and return the open ones, sorted; the GIL is released for
+/// the duration of the scan.
+#[pyfunction]
+fn scan_ports(py: Python<'_>, host: String, ports: Vec<u16>, timeout_ms: u64, concurrency: usize) -> PyResult<Vec<u16>> {
+    let rt = runtime()?;
+    let (_, out) = py.allow_threads(|| rt.block_on(scan_host(host, ports, timeout_ms, Arc::new(Semaphore::new(concurrency.max(1))))));
+    Ok(out)
+}
+
+/// Scan many ``(host, ports)`` targets at once, sharing ``concurrency`` across all of them.
+/// Results come back in input order as ``(host, [open_port, ...])``.
+#[pyfunction]
+fn scan_many(py: Python<'_>, targets: Vec<(String, Vec<u16>)>, timeout_ms: u64, concurrency: usize) -> PyResult<Vec<HostResult>> {
+    let rt = runtime()?;
+    Ok(py.allow_threads(|| rt.block_on(scan_targets(targets, timeout_ms, concurrency))))
+}
+
+/// A scan running on the shared runtime; see ``spawn_scan_many``.
+#[pyclass]
+struct ScanHandle {
+    handle: AbortHandle,
+}
+
+#[pymethods]
+impl ScanHandle {
+    fn cancel(&self) {
+        self.handle.abort();
+    }
+
+    fn done(&self) -> bool {
+        self.handle.is_finished()
+    }
+}
+
+/// Start ``scan_many`` in the background and return immediately. ``callback(results)`` is
+/// called from a runtime thread (holding the GIL) when the scan finishes; it is never
+/// called if the scan is cancelled.
+#[pyfunction]
+fn spawn_scan_many(targets: Vec<(String, Vec<u16>)>, timeout_ms: u64, concurrency: usize, callback: PyObject) -> PyResult<ScanHandle> {
+    let rt = runtime()?;
+    let handle = rt.spawn(async move {
+        let out = scan_targets(targets, timeout_ms, concurrency).await;
+        Python::with_gil(|py| {
+            if let Err(e) = callback.call1(py, (out,)) {
+                e.print(py);
+            }
+        });
+    });
+    Ok(ScanHandle { handle: handle.abort_handle() })
 }
 
 #[pymodule]
 fn sentinelscope_rs(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(scan_ports, m)?)?;
+    m.add_function(wrap_pyfunction!(scan_many, m)?)?;
+    m.add_function(wrap_pyfunction!(spawn_scan_many, m)?)?;
+    m.add_class::<ScanHandle>()?;
     Ok(())
 }
-
@@ -1,35 +1,98 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
+import os
+from contextlib import ExitStack, asynccontextmanager, closing
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, List, Optional
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pathlib import Path
 
-from sentinelscope.models import DomainScanRequest, DomainScanResult
-from sentinelscope.scanning.http_headers import analyze_security_headers
-from sentinelscope.scanning.ports import TOP_30_PORTS, scan_ports
-from sentinelscope.scanning.subdomains import enumerate_subdomains
-from sentinelscope.scanning.tls import get_tls_info
-from sentinelscope.scanning.dns_records import assess_dns
-from sentinelscope.scanning.web_preview import fetch_preview
-from sentinelscope.scanning.takeover import check_takeover_candidates
-from sentinelscope.scanning.cors import analyze_cors
-from sentinelscope.scanning.cookies import analyze_cookies
-from sentinelscope.scanning.fingerprint import fingerprint_web
-from sentinelscope.scanning.dns_axfr import check_dns_axfr
-from sentinelscope.scanning.security_txt import fetch_security_txt
-from sentinelscope.scanning.mixed_content import check_mixed_content
-from sentinelscope.scanning.dns_extras import gather_dns_extras
-
-
-app = FastAPI(title="SentinelScope API", version="0.1.0")
+from sentinelscope.jobs import JobQueue, JobStore, QueueFull
+from sentinelscope.models import DomainScanRequest, DomainScanResult, FieldChange, ScanJob, ScanRecord
+from sentinelscope.pipeline import DEFAULT_STAGE_CAPS, stage_limits
+from sentinelscope.scan import normalize_target, run_domain_scan
+from sentinelscope.scanning.ct import use_ct_cache
+from sentinelscope.store import ResultStore, diff_results
+from sentinelscope.utils.dns import get_dns_cache
+from sentinelscope.utils.http import http_client_scope
+from sentinelscope.utils.serialization import dumps
+
+
+# Job queue settings; the SQLite file keeps queued and finished jobs across restarts
+JOBS_DB = os.environ.get("SENTINELSCOPE_JOBS_DB", "sentinelscope-jobs.db")
+JOB_WORKERS = int(os.environ.get("SENTINELSCOPE_JOB_WORKERS", "4"))
+JOB_MAX_QUEUED = int(os.environ.get("SENTINELSCOPE_JOB_MAX_QUEUED", "100"))
+# Opt-in result history; when set, every finished scan is recorded and /results is served
+RESULTS_DB = os.environ.get("SENTINELSCOPE_RESULTS_DB")
+# Optional directory caching crt.sh answers per domain
+CT_CACHE_DIR = os.environ.get("SENTINELSCOPE_CT_CACHE")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON rendered by the chunked serializer (orjson when installed).
+
+    Endpoints that return a large model wrap it in this directly, which also skips
+    FastAPI's re-validation and ``jsonable_encoder`` pass over the whole result.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+async def _scan_and_record(req: DomainScanRequest, **kwargs: Any) -> DomainScanResult:
+    # Every scan of the process (direct, streamed or queued) draws from the same stage caps
+    kwargs.setdefault("limits", getattr(app.state, "limits", None))
+    # SQLite reads/writes and payload (de)serialisation run off the event loop
+    results = getattr(app.state, "results", None)
+    if req.incremental and results is not None:
+        previous = await asyncio.to_thread(results.latest, normalize_target(req.domain)[0])
+        if previous is not None:
+            kwargs["previous"] = previous
+    result = await run_domain_scan(req, **kwargs)
+    if results is not None:
+        await asyncio.to_thread(results.save, result)
+    return result
+
+
+def _check_request(req: DomainScanRequest) -> None:
+    # A server-side path would let clients read files out through DNS queries
+    if req.subdomain_wordlist is not None:
+        raise HTTPException(status_code=400, detail="subdomain_wordlist is only available from the CLI")
+
+
+def _results() -> ResultStore:
+    results = getattr(app.state, "results", None)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Result store not configured (set SENTINELSCOPE_RESULTS_DB)")
+    return results
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client for the whole process: connections and TLS sessions are reused across scans
+    async with http_client_scope():
+        with ExitStack() as stack:
+            stack.enter_context(use_ct_cache(CT_CACHE_DIR))
+            app.state.limits = stage_limits(**DEFAULT_STAGE_CAPS)
+            store = stack.enter_context(closing(JobStore(JOBS_DB)))
+            app.state.results = stack.enter_context(closing(ResultStore(RESULTS_DB))) if RESULTS_DB else None
+            app.state.jobs = JobQueue(store, workers=JOB_WORKERS, max_queued=JOB_MAX_QUEUED, runner=_scan_and_record)
+            await app.state.jobs.start()
+            try:
+                yield
+            finally:
+                await app.state.jobs.stop()
+
+
+app = FastAPI(title="SentinelScope API", version="0.1.0", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {"status": "ok", "dns_cache": get_dns_cache().stats(), "jobs": app.state.jobs.store.counts()}
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -41,103 +104,134 @@ async def ui_root():
 
 
 @app.post("/scan/domain", response_model=DomainScanResult)
-async def scan_domain(req: DomainScanRequest) -> DomainScanResult:
-    started = datetime.utcnow()
-    # Normalize input: accept either bare domain or full URL
-    raw = req.domain.strip()
-    host = raw
-    if raw.startswith("http://") or raw.startswith("https://"):
-        try:
-            from urllib.parse import urlparse
-
-            parsed = urlparse(raw)
-            host = (parsed.hostname or raw).strip('/')
-        except Exception:
-            host = raw.replace("https://", "").replace("http://", "").strip('/')
-    else:
-        host = raw.strip('/')
-    # Preserve scheme if provided; otherwise choose a sensible default
-    scheme = "https"
-    if raw.startswith("http://") or raw.startswith("https://"):
-        try:
-            from urllib.parse import urlparse
-
-            parsed = urlparse(raw)
-            if parsed.scheme in ("http", "https"):
-                scheme = parsed.scheme
-        except Exception:
-            pass
-    else:
-        if host in {"localhost", "127.0.0.1", "::1"}:
-            scheme = "http"
-    base_url = f"{scheme}://{host}"
-    ports_list = TOP_30_PORTS
-    if req.port_profile == "top100":
-        # Keep in sync with CLI; basic extension
-        ports_list = sorted(set(TOP_30_PORTS + [
-            19, 37, 49, 88, 161, 162, 389, 636, 873, 1025,
-            1433, 1521, 2049, 2082, 2083, 2086, 2087, 2483, 2484, 3268,
-            3269, 4444, 5000, 5001, 5060, 5222, 5900, 5985, 5986, 8081,
-            9000, 9090, 9200, 9300, 11211, 27017, 27018, 27019, 6379, 6380,
-        ]))
-    elif req.port_profile == "custom" and req.custom_ports:
-        ports_list = sorted(set(req.custom_ports))
-
-    # Schedule async tasks
-    subdomains_task = asyncio.create_task(enumerate_subdomains(host)) if req.scan_subdomains else None
-    ports_task = asyncio.create_task(scan_ports(host, ports_list)) if req.scan_ports else None
-    headers_task = asyncio.create_task(analyze_security_headers(base_url)) if req.analyze_headers else None
-    preview_task = asyncio.create_task(fetch_preview(base_url)) if req.web_preview else None
-    cors_task = asyncio.create_task(analyze_cors(base_url)) if req.analyze_cors else None
-    cookies_task = asyncio.create_task(analyze_cookies(base_url)) if req.analyze_cookies else None
-    fp_task = asyncio.create_task(fingerprint_web(base_url)) if req.fingerprint_web else None
-    sec_txt_task = asyncio.create_task(fetch_security_txt(host)) if req.check_security_txt else None
-    mixed_task = asyncio.create_task(check_mixed_content(base_url)) if req.check_mixed_content else None
-
-    # Offload blocking calls to threads
-    tls_future = asyncio.to_thread(get_tls_info, host) if req.analyze_tls else None
-    dns_future = asyncio.to_thread(assess_dns, host) if req.analyze_dns else None
-    axfr_future = asyncio.to_thread(check_dns_axfr, host)
-    dns_extra_future = asyncio.to_thread(gather_dns_extras, host) if req.check_dnssec_caa else None
-
-    subdomains_res = await subdomains_task if subdomains_task else None
-    ports_res = await ports_task if ports_task else None
-    headers_res = await headers_task if headers_task else None
-    preview_res = await preview_task if preview_task else None
-    cors_res = await cors_task if cors_task else None
-    cookies_res = await cookies_task if cookies_task else None
-    fp_res = await fp_task if fp_task else None
-    sec_txt_res = await sec_txt_task if sec_txt_task else None
-    mixed_res = await mixed_task if mixed_task else None
-    tls_info = await tls_future if tls_future else None
-    dns_info = await dns_future if dns_future else None
-    axfr_res = await axfr_future
-    dns_extra_res = await dns_extra_future if dns_extra_future else None
-    takeover_res = None
-    if subdomains_res and subdomains_res.discovered:
-        try:
-            takeover_res = await check_takeover_candidates(subdomains_res.discovered)
-        except Exception:
-            takeover_res = None
-
-    finished = datetime.utcnow()
-    return DomainScanResult(
-        domain=host,
-        started_at=started,
-        finished_at=finished,
-        subdomains=subdomains_res,
-        ports=ports_res,
-        tls=tls_info,
-        headers=headers_res,
-        dns=dns_info,
-        preview=preview_res,
-        takeover=takeover_res,
-        cors=cors_res,
-        cookies=cookies_res,
-        web_fingerprint=fp_res,
-        dns_axfr=axfr_res,
-        security_txt=sec_txt_res,
-        mixed_content=mixed_res,
-        dns_extras=dns_extra_res,
+async def scan_domain(req: DomainScanRequest) -> FastJSONResponse:
+    _check_request(req)
+    return FastJSONResponse(await _scan_and_record(req))
+
+
+@app.post("/scans", response_model=ScanJob, status_code=202)
+async def submit_scan(req: DomainScanRequest) -> ScanJob:
+    """Queue a domain scan and return its job immediately; poll ``GET /scans/{id}``."""
+    _check_request(req)
+    try:
+        return app.state.jobs.submit(req)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+
+@app.get("/scans/{job_id}", response_model=ScanJob)
+async def get_scan(job_id: str) -> ScanJob:
+    job = app.state.jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+
+@app.get("/results", response_model=List[ScanRecord])
+async def query_results(
+    domain: Optional[str] = None,
+    since: Optional[datetime] = None,
+    open_port: Optional[int] = None,
+    tls_expires_before: Optional[datetime] = None,
+    headers_grade: Optional[str] = None,
+    latest_only: bool = False,
+    limit: int = Query(100, ge=1, le=10000),
+) -> List[ScanRecord]:
+    """Search stored scans by domain, time, open port, TLS expiry or header grade."""
+    return await asyncio.to_thread(
+        _results().query,
+        domain=normalize_target(domain)[0] if domain else None,
+        since=since,
+        open_port=open_port,
+        tls_expires_before=tls_expires_before,
+        headers_grade=headers_grade,
+        latest_only=latest_only,
+        limit=limit,
     )
 
+
+@app.get("/results/{scan_id}", response_model=DomainScanResult)
+async def get_result(scan_id: int) -> FastJSONResponse:
+    result = await asyncio.to_thread(_results().get, scan_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Unknown scan")
+    return FastJSONResponse(result)
+
+
+@app.get("/diff/{domain}", response_model=List[FieldChange])
+async def diff_domain(domain: str, since_days: Optional[float] = Query(None, gt=0)) -> List[FieldChange]:
+    """Changes between the latest stored scan of ``domain`` and the previous one (or the last one older than ``since_days``)."""
+    results = _results()
+    host, _ = normalize_target(domain)
+
+    def diff_latest() -> Optional[List[FieldChange]]:
+        new = results.latest(host)
+        if new is None:
+            return None
+        cutoff = new.started_at - timedelta(days=since_days) if since_days else new.started_at
+        old = results.latest(host, before=cutoff)
+        return diff_results(old, new) if old is not None else None
+
+    changes = await asyncio.to_thread(diff_latest)
+    if changes is None:
+        raise HTTPException(status_code=404, detail="Need two stored scans to diff")
+    return changes
+
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _encode_event(fmt: str, event: str, data: Any) -> str:
+    payload = dumps({"event": event, "data": data}).decode()
+    if fmt == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+@app.post("/scan/domain/stream")
+async def scan_domain_stream(
+    req: DomainScanRequest,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson or sse"),
+) -> StreamingResponse:
+    """Stream each module's result the moment it completes, then a final ``done`` event.
+
+    Every event is ``{"event": <module>, "data": <module result>}``; ``done`` carries the
+    domain, timings and the list of modules emitted. A client disconnect cancels the scan.
+    """
+    _check_request(req)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run() -> None:
+        try:
+            result = await _scan_and_record(req, on_result=lambda name, value: queue.put_nowait((name, value)))
+            meta = {"domain", "addresses", "started_at", "finished_at", "validators", "carried_over"}
+            modules = [name for name in DomainScanResult.model_fields if name not in meta]
+            queue.put_nowait((
+                "done",
+                {
+                    "domain": result.domain,
+                    "addresses": result.addresses,
+                    "started_at": result.started_at.isoformat(),
+                    "finished_at": result.finished_at.isoformat(),
+                    "modules": [m for m in modules if getattr(result, m) is not None],
+                    "carried_over": result.carried_over,
+                },
+            ))
+        except Exception as e:  # noqa: BLE001
+            queue.put_nowait(("error", {"detail": str(e)}))
+        finally:
+            queue.put_nowait(None)
+
+    async def events() -> AsyncIterator[str]:
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield _encode_event(format, *item)
+        finally:
+            task.cancel()
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type=STREAM_MEDIA_TYPES[format], headers=headers)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, TextIO
+
+from sentinelscope.models import DomainScanRequest, DomainScanResult
+from sentinelscope.pipeline import DEFAULT_STAGE_CAPS, stage_limits
+from sentinelscope.scan import normalize_target, run_domain_scan
+from sentinelscope.target import TargetContext
+from sentinelscope.utils.serialization import write_json
+
+
+@dataclass
+class BatchStats:
+    scanned: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def iter_targets(lines: Iterable[str]) -> Iterator[str]:
+    """Yield targets lazily, one per line; blank lines and ``#`` comments are ignored."""
+    for line in lines:
+        target = line.strip()
+        if target and not target.startswith("#"):
+            yield target
+
+
+def load_checkpoint(path: Optional[Path]) -> Set[str]:
+    if path is None or not path.exists():
+        return set()
+    return set(iter_targets(path.read_text(encoding="utf-8").splitlines()))
+
+
+async def run_batch(
+    targets: Iterable[str],
+    template: DomainScanRequest,
+    out: TextIO,
+    *,
+    concurrency: int = 10,
+    stage_caps: Optional[Dict[str, int]] = None,
+    checkpoint: Optional[Path] = None,
+    on_done: Optional[Callable[[str, Optional[DomainScanResult]], None]] = None,
+    previous: Optional[Callable[[str], Optional[DomainScanResult]]] = None,
+) -> BatchStats:
+    """Scan many targets in one event loop and stream one JSON result per line to ``out``.
+
+    At most ``concurrency`` targets are in flight and targets are pulled lazily, so memory
+    stays flat for arbitrarily long lists. Completed targets are appended to ``checkpoint``
+    and skipped when the batch is re-run with the same checkpoint. ``previous`` maps a
+    host to its last result, which makes each scan incremental.
+    """
+    stats = BatchStats()
+    done = load_checkpoint(checkpoint)
+    limits = stage_limits(**(DEFAULT_STAGE_CAPS if stage_caps is None else stage_caps))
+    slots = asyncio.Semaphore(concurrency)
+    # Shared by every scan: a name is resolved once per batch and targets on the same
+    # address share its port scan
+    context = TargetContext(timeout=template.dns_timeout)
+    in_flight: Set[asyncio.Task] = set()
+    checkpoint_fp = checkpoint.open("a", encoding="utf-8") if checkpoint else None
+
+    async def scan_one(target: str) -> None:
+        try:
+            req = template.model_copy(update={"domain": target})
+            prior = previous(normalize_target(target)[0]) if previous is not None else None
+            result = await run_domain_scan(req, limits=limits, previous=prior, target=context)
+        except Exception:  # noqa: BLE001
+            stats.failed += 1
+            result = None
+        else:
+            write_json(result, out)
+            out.write("\n")
+            out.flush()
+            if checkpoint_fp is not None:
+                checkpoint_fp.write(target + "\n")
+                checkpoint_fp.flush()
+            stats.scanned += 1
+        finally:
+            slots.release()
+        if on_done is not None:
+            on_done(target, result)
+
+    try:
+        for target in targets:
+            if target in done:
+                stats.skipped += 1
+                continue
+            await slots.acquire()
+            task = asyncio.create_task(scan_one(target))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    finally:
+        if checkpoint_fp is not None:
+            checkpoint_fp.close()
+    return stats
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import json
+import sys
+from contextlib import ExitStack, nullcontext
+from datetime import timedelta
 from pathlib import Path
 from typing import Optional
 
@@ -9,24 +12,26 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
-from sentinelscope.models import DomainScanResult
+from sentinelscope.models import DomainScanRequest, DomainScanResult
 from sentinelscope import __version__
+from sentinelscope.batch import iter_targets, run_batch
+from sentinelscope.pipeline import DEFAULT_STAGE_CAPS, stage_limits
 from sentinelscope.reporting.html import write_html_report
+from sentinelscope.scan import normalize_target, run_domain_scan
 from sentinelscope.scanning.http_headers import analyze_security_headers
-from sentinelscope.scanning.ports import TOP_30_PORTS, scan_ports
-from sentinelscope.scanning.subdomains import enumerate_subdomains
-from sentinelscope.scanning.tls import get_tls_info
-from sentinelscope.scanning.dns_records import assess_dns
-from sentinelscope.scanning.web_preview import fetch_preview
-from sentinelscope.scanning.takeover import check_takeover_candidates
+from sentinelscope.scanning.ports import TOP_30_PORTS, TOP_100_PORTS, scan_ports
+from sentinelscope.scanning.ranges import DEFAULT_DISCOVERY_PORTS, RangeScanStats, iter_addresses, scan_ranges
+from sentinelscope.scanning.tls import DEFAULT_CONCURRENCY as TLS_CONCURRENCY, DEFAULT_PORTS as TLS_PORTS, get_tls_info, inspect_tls_endpoints
 from sentinelscope.scanning.cors import analyze_cors
 from sentinelscope.scanning.cookies import analyze_cookies
 from sentinelscope.scanning.fingerprint import fingerprint_web
+from sentinelscope.scanning.bruteforce import DEFAULT_QPS, DEFAULT_SOCKETS, brute_force_subdomains, iter_wordlist
+from sentinelscope.scanning.ct import use_ct_cache
 from sentinelscope.scanning.dns_axfr import check_dns_axfr
-from sentinelscope.scanning.security_txt import fetch_security_txt
-from sentinelscope.scanning.mixed_content import check_mixed_content
-from sentinelscope.scanning.dns_extras import gather_dns_extras
-from datetime import datetime
+from sentinelscope.store import ResultStore, diff_results
+from sentinelscope.utils.dns import dns_cache_snapshot
+from sentinelscope.utils.http import http_client_scope
+from sentinelscope.utils.serialization import write_json, write_json_file
 
 
 app = typer.Typer(
@@ -58,18 +63,26 @@ def _main_callback(
     return
 
 
+def _run_async(coro):
+    """Run a command coroutine with a pooled HTTP client shared by every scanner it calls."""
+    async def _main():
+        async with http_client_scope():
+            return await coro
+    return asyncio.run(_main())
+
+
+def _open_text(path: str, std, mode: str = "r"):
+    """``path`` opened as UTF-8 text, or ``std`` (left open on exit) when ``path`` is ``-``."""
+    if path == "-":
+        return nullcontext(std)
+    return open(path, mode, encoding="utf-8")
+
+
 def _resolve_ports(profile: str, custom: Optional[str]) -> list[int]:
     if profile == "top30":
         return TOP_30_PORTS
     if profile == "top100":
-        # Basic extension of common ports
-        extra = [
-            19, 37, 49, 88, 161, 162, 389, 636, 873, 1025,
-            1433, 1521, 2049, 2082, 2083, 2086, 2087, 2483, 2484, 3268,
-            3269, 4444, 5000, 5001, 5060, 5222, 5900, 5985, 5986, 8081,
-            9000, 9090, 9200, 9300, 11211, 27017, 27018, 27019, 6379, 6380,
-        ]
-        return sorted(set(TOP_30_PORTS + extra))
+        return TOP_100_PORTS
     if profile == "custom":
         if not custom:
             raise typer.BadParameter("--custom-ports must be provided when --ports=custom")
@@ -77,6 +90,16 @@ def _resolve_ports(profile: str, custom: Optional[str]) -> list[int]:
     raise typer.BadParameter("--ports must be one of: top30, top100, custom")
 
 
+def _stage_caps(items: list[str]) -> dict[str, int]:
+    caps = dict(DEFAULT_STAGE_CAPS)
+    for item in items:
+        name, _, value = item.partition("=")
+        if not name or not value.isdigit() or int(value) < 1:
+            raise typer.BadParameter("--stage-limit must look like name=N")
+        caps[name.strip()] = int(value)
+    return caps
+
+
 @app.command()
 def domain(
     domain: str = typer.Argument(..., help="Domain to scan, e.g., example.com"),
@@ -85,11 +108,13 @@ def domain(
     ),
     custom_ports: Optional[str] = typer.Option(None, "--custom-ports", help="CSV of ports"),
     json_out: Optional[Path] = typer.Option(None, "--json", help="Write JSON to path"),
+    pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output"),
     html_out: Optional[Path] = typer.Option(None, "--html", help="Write HTML report to path"),
     do_scan_subdomains: bool = typer.Option(True, "--scan-subdomains/--no-scan-subdomains", help="Enumerate subdomains (CT + DNS)", show_default=True),
     do_scan_ports: bool = typer.Option(True, "--scan-ports/--no-scan-ports", help="Scan common ports", show_default=True),
     analyze_headers: bool = typer.Option(True, "--analyze-headers/--no-analyze-headers", help="Analyze HTTP security headers", show_default=True),
     analyze_tls: bool = typer.Option(True, "--analyze-tls/--no-analyze-tls", help="Collect TLS info", show_default=True),
+    tls_inventory: bool = typer.Option(False, "--tls-inventory/--no-tls-inventory", help="Collect certificates from 443/8443 and every subdomain", show_default=True),
     analyze_dns: bool = typer.Option(True, "--analyze-dns/--no-analyze-dns", help="Assess DNS + SPF/DMARC", show_default=True),
     web_preview: bool = typer.Option(True, "--web-preview/--no-web-preview", help="Fetch basic web preview", show_default=True),
     analyze_cors_opt: bool = typer.Option(True, "--analyze-cors/--no-analyze-cors", help="Assess CORS policy", show_default=True),
@@ -99,8 +124,18 @@ def domain(
     check_mixed_content_opt: bool = typer.Option(True, "--check-mixed-content/--no-check-mixed-content", help="Scan for insecure http references", show_default=True),
     check_dnssec_caa_opt: bool = typer.Option(True, "--check-dnssec-caa/--no-check-dnssec-caa", help="Query DNSSEC and CAA records", show_default=True),
     concurrency: int = typer.Option(200, "--concurrency", min=1, help="Max concurrent port connections"),
+    port_timeout: float = typer.Option(1.0, "--port-timeout", min=0.05, help="Per-port connect timeout (seconds); a ceiling with --adaptive"),
+    adaptive: bool = typer.Option(True, "--adaptive/--no-adaptive", help="Adapt port timeouts to measured RTT and back off on timeout spikes", show_default=True),
     timeout: float = typer.Option(6.0, "--timeout", min=0.1, help="Network timeout (seconds) for HTTP checks"),
     dns_timeout: float = typer.Option(2.0, "--dns-timeout", min=0.1, help="DNS resolution timeout (seconds)"),
+    dns_cache: Optional[Path] = typer.Option(None, "--dns-cache", help="Load/save the DNS cache snapshot at this path"),
+    ct_cache: Optional[Path] = typer.Option(None, "--ct-cache", help="Directory caching crt.sh results per domain (refreshed after 24h)"),
+    wordlist: Optional[Path] = typer.Option(None, "--wordlist", help="Brute-force subdomains from this wordlist (one label per line)"),
+    qps: int = typer.Option(2000, "--qps", min=1, help="DNS queries per second for --wordlist"),
+    store: Optional[Path] = typer.Option(None, "--store", help="Also record results in this SQLite result store"),
+    incremental: bool = typer.Option(False, "--incremental", help="Reuse unchanged modules from the previous scan (--previous, or the latest in --store)"),
+    previous: Optional[Path] = typer.Option(None, "--previous", help="Previous JSON result to rescan incrementally against"),
+    stage_limit: list[str] = typer.Option([], "--stage-limit", help="Cap a stage, e.g. ports=8 (repeatable)"),
 ):
     """Run a full domain scan and optionally emit JSON/HTML reports.
 
@@ -113,88 +148,53 @@ def domain(
 
       - Use a custom port set:
         sscan domain example.com --ports custom --custom-ports "22,80,443,8443"
-    """
-    async def _run():
-        started = datetime.utcnow()
-        # Normalize input: accept either bare domain or full URL
-        raw = domain.strip()
-        host = raw
-        if raw.startswith("http://") or raw.startswith("https://"):
-            try:
-                from urllib.parse import urlparse
 
-                parsed = urlparse(raw)
-                host = (parsed.hostname or raw).strip('/')
-            except Exception:
-                host = raw.replace("https://", "").replace("http://", "").strip('/')
-        else:
-            host = raw.strip('/')
-        # Preserve scheme if provided; otherwise choose a sensible default
-        scheme = "https"
-        if raw.startswith("http://") or raw.startswith("https://"):
-            try:
-                from urllib.parse import urlparse
+      - Daily rescan that only recomputes what changed:
+        sscan domain example.com --store out/results.db --incremental
+    """
+    caps = _stage_caps(stage_limit)
+    host, _ = normalize_target(domain)
+    # The earlier result is loaded before the loop starts so file and SQLite reads never block it
+    prior = None
+    if previous:
+        prior = DomainScanResult.model_validate_json(previous.read_text(encoding="utf-8"))
+    elif incremental and store:
+        result_store = ResultStore(store)
+        try:
+            prior = result_store.latest(host)
+        finally:
+            result_store.close()
 
-                parsed = urlparse(raw)
-                if parsed.scheme in ("http", "https"):
-                    scheme = parsed.scheme
-            except Exception:
-                pass
-        else:
-            # Default to HTTP for localhost/loopback, HTTPS otherwise
-            if host in {"localhost", "127.0.0.1", "::1"}:
-                scheme = "http"
-        base_url = f"{scheme}://{host}"
-        ports_list = _resolve_ports(ports, custom_ports)
+    async def _run():
+        req = DomainScanRequest(
+            domain=domain,
+            scan_ports=do_scan_ports,
+            scan_subdomains=do_scan_subdomains,
+            analyze_headers=analyze_headers,
+            analyze_tls=analyze_tls,
+            tls_inventory=tls_inventory,
+            analyze_dns=analyze_dns,
+            web_preview=web_preview,
+            analyze_cors=analyze_cors_opt,
+            analyze_cookies=analyze_cookies_opt,
+            fingerprint_web=fingerprint_web_opt,
+            check_security_txt=check_security_txt_opt,
+            check_mixed_content=check_mixed_content_opt,
+            check_dnssec_caa=check_dnssec_caa_opt,
+            port_profile="custom",
+            custom_ports=_resolve_ports(ports, custom_ports),
+            http_timeout=timeout,
+            dns_timeout=dns_timeout,
+            port_concurrency=concurrency,
+            port_timeout=port_timeout,
+            port_adaptive=adaptive,
+            subdomain_wordlist=str(wordlist) if wordlist else None,
+            bruteforce_qps=qps,
+        )
 
         console.rule(f"[bold]Scanning {host}")
-
-        # Schedule async tasks where possible
-        subdomains_task = enumerate_subdomains(host, dns_timeout=dns_timeout, http_timeout=timeout) if do_scan_subdomains else None
-        ports_task = scan_ports(host, ports_list, concurrency=concurrency, timeout=1.0) if do_scan_ports else None
-        headers_task = analyze_security_headers(base_url, timeout=timeout) if analyze_headers else None
-        preview_task = fetch_preview(base_url, timeout=timeout) if web_preview else None
-
-        subdomains = await subdomains_task if subdomains_task else None
-        ports_res = await ports_task if ports_task else None
-        headers = await headers_task if headers_task else None
-        preview = await preview_task if preview_task else None
-
-        takeover = None
-        if subdomains and subdomains.discovered:
-            try:
-                takeover = await check_takeover_candidates(subdomains.discovered)
-            except Exception:
-                takeover = None
-
-        cors_res = await analyze_cors(base_url, timeout=timeout) if analyze_cors_opt else None
-        cookies_res = await analyze_cookies(base_url, timeout=timeout) if analyze_cookies_opt else None
-        fp = await fingerprint_web(base_url, timeout=timeout) if fingerprint_web_opt else None
-        axfr = check_dns_axfr(host)
-        sec_txt = await fetch_security_txt(host, timeout=timeout) if check_security_txt_opt else None
-        mixed = await check_mixed_content(base_url, timeout=timeout) if check_mixed_content_opt else None
-        dns_extra = gather_dns_extras(host) if check_dnssec_caa_opt else None
-
-        finished = datetime.utcnow()
-        result = DomainScanResult(
-            domain=host,
-            started_at=started,
-            finished_at=finished,
-            subdomains=subdomains,
-            ports=ports_res,
-            tls=get_tls_info(host, timeout=timeout) if analyze_tls else None,
-            headers=headers,
-            dns=assess_dns(host) if analyze_dns else None,
-            preview=preview,
-            takeover=takeover,
-            cors=cors_res,
-            cookies=cookies_res,
-            web_fingerprint=fp,
-            dns_axfr=axfr,
-            security_txt=sec_txt,
-            mixed_content=mixed,
-            dns_extras=dns_extra,
-        )
+        # Independent checks run concurrently; takeover starts as soon as subdomains are in
+        result = await run_domain_scan(req, previous=prior, limits=stage_limits(**caps))
 
         # Console summary
         table = Table(title=f"Summary for {domain}")
@@ -203,22 +203,184 @@ def domain(
         table.add_row("Open ports", str(len(result.ports.open_ports) if result.ports else 0))
         table.add_row("Subdomains", str(len(result.subdomains.discovered) if result.subdomains else 0))
         table.add_row("TLS protocol", result.tls.protocol if result.tls and result.tls.protocol else "n/a")
+        if result.tls_inventory:
+            table.add_row("Certificates", str(len(result.tls_inventory.certificates)))
         table.add_row("Headers grade", result.headers.grade if (result.headers and result.headers.grade) else "n/a")
         table.add_row("SPF present", str(result.dns.spf_present if result.dns else False))
         table.add_row("DMARC policy", result.dns.dmarc_policy if result.dns else "n/a")
         table.add_row("AXFR open NS", str(len(result.dns_axfr.axfr_allowed_on) if result.dns_axfr else 0))
         table.add_row("CORS allow-origin", result.cors.allow_origin if result.cors else "n/a")
+        if prior is not None:
+            table.add_row("Carried over", ", ".join(result.carried_over) or "none")
         console.print(table)
 
         if json_out:
-            json_out.parent.mkdir(parents=True, exist_ok=True)
-            json_out.write_text(result.model_dump_json(indent=2))
+            write_json_file(result, json_out, pretty=pretty)
             console.print(f"[green]Wrote JSON[/green] {json_out}")
         if html_out:
             write_html_report(result, html_out)
             console.print(f"[green]Wrote HTML[/green] {html_out}")
+        if store:
+            result_store = ResultStore(store)
+            try:
+                scan_id = result_store.save(result)
+            finally:
+                result_store.close()
+            console.print(f"[green]Stored scan[/green] #{scan_id} in {store}")
+
+    with dns_cache_snapshot(dns_cache), use_ct_cache(ct_cache):
+        _run_async(_run())
 
-    asyncio.run(_run())
+
+@app.command()
+def batch(
+    targets: str = typer.Argument(..., help="File with one domain per line, or - for stdin"),
+    out: str = typer.Option("-", "--out", help="JSONL output path (one DomainScanResult per line), or - for stdout"),
+    checkpoint: Optional[Path] = typer.Option(None, "--checkpoint", help="Record finished targets here and skip them on re-runs"),
+    ports: str = typer.Option("top30", "--ports", help="Port profile: top30, top100, custom"),
+    custom_ports: Optional[str] = typer.Option(None, "--custom-ports", help="CSV of ports"),
+    do_scan_subdomains: bool = typer.Option(True, "--scan-subdomains/--no-scan-subdomains", help="Enumerate subdomains (CT + DNS)", show_default=True),
+    do_scan_ports: bool = typer.Option(True, "--scan-ports/--no-scan-ports", help="Scan common ports", show_default=True),
+    concurrency: int = typer.Option(10, "--concurrency", min=1, help="Targets scanned at the same time"),
+    stage_limit: list[str] = typer.Option([], "--stage-limit", help="Cap a stage across the batch, e.g. ports=8 (repeatable)"),
+    timeout: float = typer.Option(6.0, "--timeout", min=0.1, help="Network timeout (seconds) for HTTP checks"),
+    dns_timeout: float = typer.Option(2.0, "--dns-timeout", min=0.1, help="DNS resolution timeout (seconds)"),
+    dns_cache: Optional[Path] = typer.Option(None, "--dns-cache", help="Load/save the DNS cache snapshot at this path"),
+    ct_cache: Optional[Path] = typer.Option(None, "--ct-cache", help="Directory caching crt.sh results per domain (refreshed after 24h)"),
+    wordlist: Optional[Path] = typer.Option(None, "--wordlist", help="Brute-force subdomains from this wordlist (one label per line)"),
+    qps: int = typer.Option(2000, "--qps", min=1, help="DNS queries per second for --wordlist"),
+    store: Optional[Path] = typer.Option(None, "--store", help="Also record results in this SQLite result store"),
+    incremental: bool = typer.Option(False, "--incremental", help="Reuse unchanged modules from each target's latest scan in --store"),
+):
+    """Scan many domains in one process and stream results as JSON Lines.
+
+    Examples:
+      - From a file, resumable:
+        sscan batch domains.txt --out out/results.jsonl --checkpoint out/done.txt
+      - From stdin, ports only:
+        cat domains.txt | sscan batch - --no-scan-subdomains --stage-limit ports=4
+      - Recurring monitoring, recomputing only what changed:
+        sscan batch domains.txt --out out/today.jsonl --store out/results.db --incremental
+    """
+    if incremental and not store:
+        raise typer.BadParameter("--incremental needs --store")
+    caps = _stage_caps(stage_limit)
+    template = DomainScanRequest(
+        domain="",
+        scan_subdomains=do_scan_subdomains,
+        scan_ports=do_scan_ports,
+        port_profile="custom",
+        custom_ports=_resolve_ports(ports, custom_ports),
+        http_timeout=timeout,
+        dns_timeout=dns_timeout,
+        subdomain_wordlist=str(wordlist) if wordlist else None,
+        bruteforce_qps=qps,
+    )
+    err = Console(stderr=True)
+    result_store = ResultStore(store) if store else None
+
+    def on_done(target: str, result) -> None:
+        if result is not None and result_store is not None:
+            result_store.save(result)
+        err.print(f"[green]done[/green] {target}" if result is not None else f"[red]failed[/red] {target}")
+
+    async def _run(source, sink):
+        return await run_batch(
+            iter_targets(source), template, sink,
+            concurrency=concurrency, stage_caps=caps, checkpoint=checkpoint, on_done=on_done,
+            previous=result_store.latest if incremental else None,
+        )
+
+    if out != "-":
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with (
+            _open_text(targets, sys.stdin) as source,
+            _open_text(out, sys.stdout, "a" if checkpoint else "w") as sink,
+            dns_cache_snapshot(dns_cache),
+            use_ct_cache(ct_cache),
+        ):
+            stats = _run_async(_run(source, sink))
+    finally:
+        if result_store is not None:
+            result_store.close()
+    err.print(f"Scanned {stats.scanned}, skipped {stats.skipped}, failed {stats.failed}")
+
+
+@app.command()
+def history(
+    domain: str,
+    store: Path = typer.Option(..., "--store", help="SQLite result store written by --store"),
+    limit: int = typer.Option(20, "--limit", min=1),
+):
+    """List stored scans of a domain, newest first."""
+    host, _ = normalize_target(domain)
+    result_store = ResultStore(store)
+    try:
+        records = result_store.query(domain=host, limit=limit)
+    finally:
+        result_store.close()
+    table = Table(title=f"Stored scans for {host}")
+    for col in ("ID", "Started", "Headers grade", "TLS valid to", "Open ports"):
+        table.add_column(col)
+    for r in records:
+        table.add_row(
+            str(r.id),
+            r.started_at.isoformat(timespec="seconds"),
+            r.headers_grade or "n/a",
+            r.tls_valid_to.date().isoformat() if r.tls_valid_to else "n/a",
+            ",".join(map(str, r.open_ports)) or "-",
+        )
+    console.print(table)
+
+
+@app.command()
+def diff(
+    domain: str,
+    store: Path = typer.Option(..., "--store", help="SQLite result store written by --store"),
+    since_days: Optional[float] = typer.Option(None, "--since-days", help="Compare the latest scan with the last one older than this many days"),
+    old_id: Optional[int] = typer.Option(None, "--from", help="Older scan ID"),
+    new_id: Optional[int] = typer.Option(None, "--to", help="Newer scan ID"),
+    json_out: Optional[Path] = typer.Option(None, "--json"),
+    pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output"),
+):
+    """Show what changed between two stored scans (default: the latest two).
+
+    Examples:
+      sscan diff example.com --store out/results.db
+      sscan diff example.com --store out/results.db --since-days 7
+    """
+    host, _ = normalize_target(domain)
+    result_store = ResultStore(store)
+    try:
+        new = result_store.get(new_id) if new_id is not None else result_store.latest(host)
+        if old_id is not None:
+            old = result_store.get(old_id)
+        elif new is None:
+            old = None
+        elif since_days is not None:
+            old = result_store.latest(host, before=new.started_at - timedelta(days=since_days))
+        else:
+            old = result_store.latest(host, before=new.started_at)
+    finally:
+        result_store.close()
+    if old is None or new is None:
+        console.print(f"[yellow]Need two stored scans of {host} to diff[/yellow]")
+        raise typer.Exit(code=1)
+
+    changes = diff_results(old, new)
+    table = Table(title=f"{host}: {old.started_at:%Y-%m-%d %H:%M} -> {new.started_at:%Y-%m-%d %H:%M}")
+    table.add_column("Field")
+    table.add_column("Before")
+    table.add_column("After")
+    for c in changes:
+        if c.added or c.removed:
+            table.add_row(c.path, ", ".join(map(str, c.removed)) or "-", ", ".join(map(str, c.added)) or "-")
+        else:
+            table.add_row(c.path, json.dumps(c.before), json.dumps(c.after))
+    console.print(table if changes else "[green]No changes[/green]")
+    if json_out:
+        write_json_file(changes, json_out, pretty=pretty)
 
 
 @app.command()
@@ -269,11 +431,13 @@ def interactive():
         ports=ports_choice,
         custom_ports=custom_ports,
         json_out=json_out,
+        pretty=True,
         html_out=html_out,
         do_scan_subdomains=do_scan_subdomains,
         do_scan_ports=do_scan_ports,
         analyze_headers=analyze_headers,
         analyze_tls=analyze_tls,
+        tls_inventory=False,
         analyze_dns=analyze_dns,
         web_preview=web_preview,
         analyze_cors_opt=analyze_cors_opt,
@@ -283,13 +447,23 @@ def interactive():
         check_mixed_content_opt=check_mixed_content_opt,
         check_dnssec_caa_opt=check_dnssec_caa_opt,
         concurrency=concurrency,
+        port_timeout=1.0,
+        adaptive=True,
         timeout=timeout,
         dns_timeout=dns_timeout,
+        dns_cache=None,
+        ct_cache=None,
+        wordlist=None,
+        qps=2000,
+        store=None,
+        incremental=False,
+        previous=None,
+        stage_limit=[],
     )
 
 
 @app.command()
-def headers(url: str, json_out: Optional[Path] = typer.Option(None, "--json")):
+def headers(url: str, json_out: Optional[Path] = typer.Option(None, "--json"), pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output")):
     """Analyze HTTP security headers and output a grade and recommendations.
 
     Example:
@@ -299,13 +473,12 @@ def headers(url: str, json_out: Optional[Path] = typer.Option(None, "--json")):
         res = await analyze_security_headers(url)
         console.print(res)
         if json_out:
-            json_out.parent.mkdir(parents=True, exist_ok=True)
-            json_out.write_text(res.model_dump_json(indent=2))
-    asyncio.run(_run())
+            write_json_file(res, json_out, pretty=pretty)
+    _run_async(_run())
 
 
 @app.command()
-def tls(domain: str, json_out: Optional[Path] = typer.Option(None, "--json")):
+def tls(domain: str, json_out: Optional[Path] = typer.Option(None, "--json"), pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output")):
     """Inspect TLS certificate validity, issuer/subject, SANs, and protocol.
 
     Example:
@@ -314,8 +487,58 @@ def tls(domain: str, json_out: Optional[Path] = typer.Option(None, "--json")):
     info = get_tls_info(domain)
     console.print(info)
     if json_out:
-        json_out.parent.mkdir(parents=True, exist_ok=True)
-        json_out.write_text(info.model_dump_json(indent=2))
+        write_json_file(info, json_out, pretty=pretty)
+
+
+@app.command()
+def certs(
+    hosts: list[str] = typer.Argument(None, help="Hosts to inspect; host:port pins a port"),
+    targets_file: Optional[str] = typer.Option(None, "--file", help="Read more hosts from this file (one per line), or - for stdin"),
+    port: list[int] = typer.Option([], "--port", help="Port to try on every host without one (repeatable; default: 443, 8443)"),
+    concurrency: int = typer.Option(TLS_CONCURRENCY, "--concurrency", min=1, help="Handshakes in flight"),
+    timeout: float = typer.Option(3.0, "--timeout", min=0.1, help="Per-handshake timeout (seconds)"),
+    json_out: Optional[Path] = typer.Option(None, "--json"),
+    pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output"),
+):
+    """Collect certificates from many endpoints at once, one row per distinct certificate.
+
+    Examples:
+      sscan certs example.com www.example.com mail.example.com:993
+      sscan certs --file hosts.txt --port 443 --json out/certs.json
+    """
+    names = list(hosts or [])
+    if targets_file:
+        with _open_text(targets_file, sys.stdin) as source:
+            names.extend(iter_targets(source))
+    if not names:
+        raise typer.BadParameter("give at least one host or --file")
+    endpoints = []
+    for name in names:
+        host, sep, pinned = name.rpartition(":")
+        # A bare IPv6 address has colons too; only [addr]:port pins a port there
+        if sep and pinned.isdigit() and (":" not in host or host.startswith("[")):
+            endpoints.append((host.strip("[]"), int(pinned)))
+        else:
+            endpoints.extend((name, p) for p in (port or TLS_PORTS))
+
+    inventory = asyncio.run(inspect_tls_endpoints(endpoints, timeout=timeout, concurrency=concurrency))
+    table = Table(title=f"{len(inventory.certificates)} certificates from {inventory.handshake_count} handshakes")
+    table.add_column("Subject")
+    table.add_column("Issuer")
+    table.add_column("Expires")
+    table.add_column("Endpoints")
+    for cert in inventory.certificates:
+        table.add_row(
+            (cert.subject or {}).get("commonName", "n/a"),
+            (cert.issuer or {}).get("commonName", "n/a"),
+            cert.valid_to.date().isoformat() if cert.valid_to else "n/a",
+            ", ".join(cert.endpoints),
+        )
+    console.print(table)
+    for failure in inventory.failures:
+        console.print(f"[yellow]{failure}[/yellow]")
+    if json_out:
+        write_json_file(inventory, json_out, pretty=pretty)
 
 
 @app.command()
@@ -324,6 +547,10 @@ def ports(
     ports: str = typer.Option("top30", "--ports"),
     custom_ports: Optional[str] = typer.Option(None, "--custom-ports"),
     json_out: Optional[Path] = typer.Option(None, "--json"),
+    pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output"),
+    concurrency: int = typer.Option(200, "--concurrency", min=1, help="Max concurrent connections"),
+    timeout: float = typer.Option(1.0, "--timeout", min=0.05, help="Per-port connect timeout (seconds); a ceiling with --adaptive"),
+    adaptive: bool = typer.Option(True, "--adaptive/--no-adaptive", help="Adapt timeouts to measured RTT and back off on timeout spikes", show_default=True),
 ):
     """Scan common TCP ports using async connect checks.
 
@@ -335,16 +562,75 @@ def ports(
     """
     async def _run():
         plist = _resolve_ports(ports, custom_ports)
-        res = await scan_ports(host, plist)
+        res = await scan_ports(host, plist, concurrency=concurrency, timeout=timeout, adaptive=adaptive)
         console.print(res)
         if json_out:
-            json_out.parent.mkdir(parents=True, exist_ok=True)
-            json_out.write_text(res.model_dump_json(indent=2))
-    asyncio.run(_run())
+            write_json_file(res, json_out, pretty=pretty)
+    _run_async(_run())
+
+
+@app.command("range")
+def range_scan(
+    specs: list[str] = typer.Argument(None, help="CIDR blocks, ranges (10.0.0.1-10.0.0.50 or 10.0.0.1-50) or addresses"),
+    targets_file: Optional[str] = typer.Option(None, "--file", help="Read more specs from this file (one per line), or - for stdin"),
+    ports: str = typer.Option("top30", "--ports", help="Port profile: top30, top100, custom"),
+    custom_ports: Optional[str] = typer.Option(None, "--custom-ports", help="CSV of ports"),
+    concurrency: int = typer.Option(500, "--concurrency", min=1, help="Max concurrent connections across all hosts"),
+    timeout: float = typer.Option(1.0, "--timeout", min=0.05, help="Per-port connect timeout (seconds); a ceiling with --adaptive"),
+    adaptive: bool = typer.Option(True, "--adaptive/--no-adaptive", help="Adapt timeouts to measured RTT and back off on timeout spikes", show_default=True),
+    discover: bool = typer.Option(True, "--discover/--no-discover", help="Only port-scan hosts that answer a quick liveness probe", show_default=True),
+    discovery_ports: Optional[str] = typer.Option(None, "--discovery-ports", help="CSV of ports used for liveness (default: 80,443,22,3389)"),
+    out: str = typer.Option("-", "--out", help="JSONL output path (one PortScanResult per live host), or - for stdout"),
+):
+    """Sweep whole address ranges: find live hosts, then port-scan them.
+
+    Results stream out as JSON Lines while the sweep runs; memory stays flat for any range size.
+
+    Examples:
+      sscan range 10.20.0.0/16 --ports top100 --out out/hosts.jsonl
+      sscan range 192.0.2.1-40 198.51.100.7 --no-discover --ports custom --custom-ports "22,443"
+    """
+    if not specs and not targets_file:
+        raise typer.BadParameter("give at least one CIDR/range/address or --file")
+    # Fail on a malformed spec before anything is sent
+    for spec in specs or []:
+        try:
+            next(iter_addresses([spec]), None)
+        except ValueError as e:
+            raise typer.BadParameter(str(e)) from None
+    probe_ports = DEFAULT_DISCOVERY_PORTS
+    if discovery_ports:
+        probe_ports = tuple(int(x.strip()) for x in discovery_ports.split(",") if x.strip())
+    plist = _resolve_ports(ports, custom_ports)
+    err = Console(stderr=True)
+    stats = RangeScanStats()
+
+    async def _run(sources, sink):
+        async for result in scan_ranges(
+            (spec for source in sources for spec in source), plist,
+            concurrency=concurrency, timeout=timeout, adaptive=adaptive,
+            discover=discover, discovery_ports=probe_ports, stats=stats,
+        ):
+            write_json(result, sink)
+            sink.write("\n")
+            sink.flush()
+
+    if out != "-":
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        sources: list = [specs or []]
+        if targets_file:
+            sources.append(iter_targets(stack.enter_context(_open_text(targets_file, sys.stdin))))
+        sink = stack.enter_context(_open_text(out, sys.stdout, "w"))
+        try:
+            asyncio.run(_run(sources, sink))
+        except ValueError as e:
+            raise typer.BadParameter(str(e)) from None
+    err.print(f"{stats.addresses} addresses, {stats.live} live, {stats.open_ports} open ports")
 
 
 @app.command()
-def cors(url: str, json_out: Optional[Path] = typer.Option(None, "--json")):
+def cors(url: str, json_out: Optional[Path] = typer.Option(None, "--json"), pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output")):
     """Check CORS policy for a URL (allow-origin/credentials, common risks).
 
     Example:
@@ -354,13 +640,12 @@ def cors(url: str, json_out: Optional[Path] = typer.Option(None, "--json")):
         res = await analyze_cors(url)
         console.print(res)
         if json_out:
-            json_out.parent.mkdir(parents=True, exist_ok=True)
-            json_out.write_text(res.model_dump_json(indent=2))
-    asyncio.run(_run())
+            write_json_file(res, json_out, pretty=pretty)
+    _run_async(_run())
 
 
 @app.command()
-def cookies(url: str, json_out: Optional[Path] = typer.Option(None, "--json")):
+def cookies(url: str, json_out: Optional[Path] = typer.Option(None, "--json"), pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output")):
     """Inspect Set-Cookie flags (Secure/HttpOnly/SameSite) and highlight issues.
 
     Example:
@@ -370,13 +655,12 @@ def cookies(url: str, json_out: Optional[Path] = typer.Option(None, "--json")):
         res = await analyze_cookies(url)
         console.print(res)
         if json_out:
-            json_out.parent.mkdir(parents=True, exist_ok=True)
-            json_out.write_text(res.model_dump_json(indent=2))
-    asyncio.run(_run())
+            write_json_file(res, json_out, pretty=pretty)
+    _run_async(_run())
 
 
 @app.command()
-def fingerprint(url: str, json_out: Optional[Path] = typer.Option(None, "--json")):
+def fingerprint(url: str, json_out: Optional[Path] = typer.Option(None, "--json"), pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output")):
     """Detect server banner and common WAF/CDN fingerprints.
 
     Example:
@@ -386,13 +670,12 @@ def fingerprint(url: str, json_out: Optional[Path] = typer.Option(None, "--json"
         res = await fingerprint_web(url)
         console.print(res)
         if json_out:
-            json_out.parent.mkdir(parents=True, exist_ok=True)
-            json_out.write_text(res.model_dump_json(indent=2))
-    asyncio.run(_run())
+            write_json_file(res, json_out, pretty=pretty)
+    _run_async(_run())
 
 
 @app.command()
-def axfr(domain: str, json_out: Optional[Path] = typer.Option(None, "--json")):
+def axfr(domain: str, json_out: Optional[Path] = typer.Option(None, "--json"), pretty: bool = typer.Option(False, "--pretty", help="Indent the JSON output")):
     """Check if DNS zone transfer (AXFR) is allowed on any authoritative nameserver.
 
     Example:
@@ -401,8 +684,57 @@ def axfr(domain: str, json_out: Optional[Path] = typer.Option(None, "--json")):
     res = check_dns_axfr(domain)
     console.print(res)
     if json_out:
-        json_out.parent.mkdir(parents=True, exist_ok=True)
-        json_out.write_text(res.model_dump_json(indent=2))
+        write_json_file(res, json_out, pretty=pretty)
+
+
+@app.command()
+def bruteforce(
+    domain: str,
+    wordlist: Path = typer.Option(..., "--wordlist", help="One label per line; read lazily, any size"),
+    qps: int = typer.Option(DEFAULT_QPS, "--qps", min=1, help="DNS queries per second"),
+    sockets: int = typer.Option(DEFAULT_SOCKETS, "--sockets", min=1, help="UDP sockets to pipeline over"),
+    nameserver: list[str] = typer.Option([], "--nameserver", help="Resolver IP (repeatable; default: system resolvers)"),
+    timeout: float = typer.Option(2.0, "--timeout", min=0.1, help="Per-query timeout (seconds)"),
+    out: Optional[Path] = typer.Option(None, "--out", help="Write found names (name<TAB>addresses) to this file"),
+):
+    """Brute-force subdomains over raw UDP DNS with wildcard filtering.
+
+    Examples:
+      sscan bruteforce example.com --wordlist words.txt --qps 5000
+      sscan bruteforce example.com --wordlist big.txt --qps 20000 --nameserver 10.0.0.53 --out out/found.tsv
+    """
+    err = Console(stderr=True)
+
+    def on_found(name: str, addresses: list[str]) -> None:
+        line = f"{name}\t{','.join(addresses)}"
+        if sink is not None:
+            sink.write(line + "\n")
+        else:
+            console.print(line, highlight=False)
+
+    def on_progress(stats) -> None:
+        err.print(
+            f"{stats.sent} sent, {stats.found} found, {stats.wildcard_filtered} wildcard, "
+            f"{stats.timeouts} timeouts, {stats.rate:,.0f}/s",
+            highlight=False,
+        )
+
+    async def _run():
+        return await brute_force_subdomains(
+            domain,
+            iter_wordlist(wordlist),
+            qps=qps,
+            sockets=sockets,
+            nameservers=nameserver or None,
+            timeout=timeout,
+            on_found=on_found,
+            on_progress=on_progress,
+        )
+
+    with open(out, "w", encoding="utf-8") if out else nullcontext() as sink:
+        result = asyncio.run(_run())
+    if result.wildcard_addresses:
+        err.print(f"[yellow]Wildcard DNS[/yellow] ({', '.join(sorted(result.wildcard_addresses))}); matching answers were dropped")
 
 
 def main():  # entrypoint
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from sentinelscope.models import DomainScanResult
+
+
+# Modules computed from the single GET of the base URL
+PAGE_MODULES = ("headers", "preview", "cookies", "web_fingerprint", "mixed_content")
+
+
+class Rescan:
+    """Validator bookkeeping for one scan.
+
+    ``validators`` collects what this scan observed (saved with the result); ``prior``
+    reads what the previous scan observed. When they match, a stage calls ``carry`` to
+    reuse the previous module result instead of recomputing it.
+    """
+
+    def __init__(self, previous: Optional[DomainScanResult] = None):
+        self.previous = previous
+        self.validators: Dict[str, str] = {}
+        self.carried_over: List[str] = []
+
+    def prior(self, key: str) -> Optional[str]:
+        return self.previous.validators.get(key) if self.previous is not None else None
+
+    def has(self, *modules: str) -> bool:
+        """True if the previous scan produced every one of ``modules``."""
+        return self.previous is not None and all(getattr(self.previous, m) is not None for m in modules)
+
+    def carry(self, module: str) -> Any:
+        self.carried_over.append(module)
+        return getattr(self.previous, module)
+
+    def conditional_headers(self, modules: List[str]) -> Dict[str, str]:
+        """``If-None-Match``/``If-Modified-Since`` for the base URL, if ``modules`` can be carried over."""
+        if not modules or not self.has(*modules):
+            return {}
+        headers: Dict[str, str] = {}
+        if self.prior("http.etag"):
+            headers["If-None-Match"] = self.prior("http.etag")
+        if self.prior("http.last_modified"):
+            headers["If-Modified-Since"] = self.prior("http.last_modified")
+        return headers
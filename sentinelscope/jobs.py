@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sentinelscope.models import DERIVED_FIELDS, DomainScanRequest, DomainScanResult, ScanJob, utc_now
+from sentinelscope.scan import run_domain_scan
+
+
+Runner = Callable[[DomainScanRequest], Awaitable[DomainScanResult]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobStore:
+    """SQLite-backed job table; it is the queue, so queued jobs survive restarts."""
+
+    def __init__(self, path: str | Path):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def create(self, req: DomainScanRequest) -> ScanJob:
+        job = ScanJob(id=uuid.uuid4().hex, status="queued", request=req, created_at=utc_now())
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, request, created_at) VALUES (?, ?, ?, ?)",
+                (job.id, job.status, req.model_dump_json(), job.created_at.isoformat()),
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def claim_next(self) -> Optional[ScanJob]:
+        """Atomically move the oldest queued job to running and return it."""
+        now = utc_now().isoformat()
+        with self._lock:
+            row = self._db.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ("
+                " SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ") RETURNING *",
+                (now,),
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def finish(self, job_id: str, result: Optional[DomainScanResult] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                (
+                    "failed" if error is not None else "done",
+                    utc_now().isoformat(),
+                    result.model_dump_json(exclude=DERIVED_FIELDS) if result is not None else None,
+                    error,
+                    job_id,
+                ),
+            )
+
+    def requeue_running(self) -> int:
+        """Jobs left running by a crashed or stopped process go back to the queue."""
+        with self._lock:
+            return self._db.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'"
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> ScanJob:
+        return ScanJob(
+            id=row["id"],
+            status=row["status"],
+            request=DomainScanRequest.model_validate_json(row["request"]),
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            result=DomainScanResult.model_validate_json(row["result"]) if row["result"] else None,
+            error=row["error"],
+        )
+
+
+class JobQueue:
+    """Bounded worker pool draining a :class:`JobStore`.
+
+    ``submit`` rejects new work with :class:`QueueFull` once ``max_queued`` jobs are
+    waiting, so callers get backpressure instead of an unbounded backlog.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 4, max_queued: int = 100, runner: Runner = run_domain_scan):
+        self.store = store
+        self.workers = workers
+        self.max_queued = max_queued
+        self._runner = runner
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self.store.counts().get("queued", 0)
+
+    def submit(self, req: DomainScanRequest) -> ScanJob:
+        if self.depth >= self.max_queued:
+            raise QueueFull(f"{self.max_queued} scans already queued")
+        job = self.store.create(req)
+        self._wakeup.set()
+        return job
+
+    async def start(self) -> None:
+        self.store.requeue_running()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Interrupted scans are picked up again on the next start
+        self.store.requeue_running()
+
+    async def _work(self) -> None:
+        while True:
+            self._wakeup.clear()
+            job = self.store.claim_next()
+            if job is None:
+                await self._wakeup.wait()
+                continue
+            # More work may be waiting; let another idle worker look too
+            self._wakeup.set()
+            try:
+                result = await self._runner(job.request)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001
+                self.store.finish(job.id, error=str(e) or e.__class__.__name__)
+            else:
+                self.store.finish(job.id, result=result)
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List, Optional, Dict
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Dict
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
+
+
+def utc_now() -> datetime:
+    """Current UTC time as the naive datetime every timestamp in these models (and the stores) uses."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class DomainScanRequest(BaseModel):
@@ -25,6 +30,15 @@ class DomainScanRequest(BaseModel):
         description="One of: top30, top100, custom",
     )
     custom_ports: Optional[List[int]] = None
+    http_timeout: float = Field(default=6.0, gt=0, description="Timeout (seconds) for HTTP checks")
+    dns_timeout: float = Field(default=2.0, gt=0, description="DNS resolution timeout (seconds)")
+    port_concurrency: int = Field(default=200, ge=1, description="Max concurrent port connections")
+    port_timeout: float = Field(default=1.0, gt=0, description="Per-port connect timeout (seconds); an upper bound when port_adaptive")
+    port_adaptive: bool = Field(default=True, description="Derive port timeouts from measured RTT and back off concurrency on timeout spikes")
+    subdomain_wordlist: Optional[str] = Field(default=None, description="Wordlist file for DNS brute force (CLI only)")
+    bruteforce_qps: int = Field(default=2000, ge=1, description="DNS brute-force queries per second")
+    tls_inventory: bool = Field(default=False, description="Handshake with the domain on 443/8443 and every discovered subdomain on 443, grouped by certificate")
+    incremental: bool = Field(default=False, description="Reuse modules whose validators are unchanged since the latest stored scan")
 
 
 class PortResult(BaseModel):
@@ -36,7 +50,13 @@ class PortScanResult(BaseModel):
     host: str
     ports_scanned: List[int]
     open_ports: List[int]
-    results: List[PortResult]
+
+    @computed_field
+    @property
+    def results(self) -> List[PortResult]:
+        """Per-port view, derived from the two lists when read or serialised (never stored)."""
+        open_ports = set(self.open_ports)
+        return [PortResult(port=p, is_open=p in open_ports) for p in self.ports_scanned]
 
 
 class TLSInfo(BaseModel):
@@ -49,7 +69,40 @@ class TLSInfo(BaseModel):
     issuer: Optional[Dict[str, str]] = None
     subject_alternative_names: List[str] = Field(default_factory=list)
     protocol: Optional[str] = None
+    fingerprint_sha256: Optional[str] = None  # leaf certificate, DER
+    address: Optional[str] = None  # IP the handshake went to
+    key_type: Optional[str] = None  # RSA, EC (secp256r1), Ed25519, ...
+    key_size: Optional[int] = None
+    signature_algorithm: Optional[str] = None
+    serial_number: Optional[str] = None  # hex
+    chain_length: Optional[int] = None  # certificates sent, when the runtime exposes the chain
+    chain_issues: List[str] = Field(default_factory=list)
+    warnings: List[str] = Field(default_factory=list)
+
+
+class TLSCertificate(BaseModel):
+    """One certificate of a TLS inventory and every endpoint that served it."""
+
+    fingerprint_sha256: str
+    subject: Optional[Dict[str, str]] = None
+    issuer: Optional[Dict[str, str]] = None
+    valid_from: Optional[datetime] = None
+    valid_to: Optional[datetime] = None
+    days_until_expiry: Optional[int] = None
+    subject_alternative_names: List[str] = Field(default_factory=list)
+    key_type: Optional[str] = None
+    key_size: Optional[int] = None
+    signature_algorithm: Optional[str] = None
     warnings: List[str] = Field(default_factory=list)
+    endpoints: List[str] = Field(default_factory=list)  # host:port
+    addresses: List[str] = Field(default_factory=list)
+
+
+class TLSInventory(BaseModel):
+    endpoint_count: int = 0
+    handshake_count: int = 0
+    certificates: List[TLSCertificate] = Field(default_factory=list)
+    failures: List[str] = Field(default_factory=list)
 
 
 class HeaderFinding(BaseModel):
@@ -73,11 +126,13 @@ class SubdomainsResult(BaseModel):
 
 class DomainScanResult(BaseModel):
     domain: str
+    addresses: List[str] = Field(default_factory=list)  # pinned for every check of the scan
     started_at: datetime
     finished_at: datetime
     subdomains: Optional[SubdomainsResult] = None
     ports: Optional[PortScanResult] = None
     tls: Optional[TLSInfo] = None
+    tls_inventory: Optional[TLSInventory] = None
     headers: Optional[SecurityHeadersAssessment] = None
     dns: Optional["DNSAssessment"] = None
     preview: Optional["WebPreview"] = None
@@ -89,6 +144,14 @@ class DomainScanResult(BaseModel):
     security_txt: Optional["SecurityTxt"] = None
     mixed_content: Optional["MixedContentReport"] = None
     dns_extras: Optional["DNSExtras"] = None
+    # Cheap change detectors recorded for the next incremental rescan
+    validators: Dict[str, str] = Field(default_factory=dict)
+    # Modules copied from the previous scan because their validators matched
+    carried_over: List[str] = Field(default_factory=list)
+
+
+# Computed views left out of stored payloads; rebuilt from the stored lists when read
+DERIVED_FIELDS = {"ports": {"results"}}
 
 
 class DNSAssessment(BaseModel):
@@ -120,6 +183,7 @@ class TakeoverFinding(BaseModel):
 
 class TakeoverAssessment(BaseModel):
     checked_count: int
+    probed_count: int = 0  # hosts fetched after the CNAME pre-filter
     flagged: List[TakeoverFinding] = Field(default_factory=list)
 
 
@@ -176,3 +240,32 @@ class DNSExtras(BaseModel):
     dnssec_present: bool
     caa_records: List[str] = Field(default_factory=list)
 
+
+
+class ScanJob(BaseModel):
+    id: str
+    status: str  # queued | running | done | failed
+    request: DomainScanRequest
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[DomainScanResult] = None
+    error: Optional[str] = None
+
+
+class ScanRecord(BaseModel):
+    id: int
+    domain: str
+    started_at: datetime
+    finished_at: datetime
+    headers_grade: Optional[str] = None
+    tls_valid_to: Optional[datetime] = None
+    open_ports: List[int] = Field(default_factory=list)
+
+
+class FieldChange(BaseModel):
+    path: str  # dotted path into DomainScanResult, e.g. "headers.grade"
+    before: Any = None
+    after: Any = None
+    added: List[Any] = Field(default_factory=list)
+    removed: List[Any] = Field(default_factory=list)
@@ -1,19 +1,74 @@
 from __future__ import annotations
 
+import asyncio
+
 try:
     # The Rust extension module, if built via maturin
     import sentinelscope_rs  # type: ignore
 
-    def scan_ports_native(host: str, ports: list[int], timeout_ms: int, concurrency: int) -> list[tuple[int, bool]]:
-        return sentinelscope_rs.scan_ports(host, ports, timeout_ms, concurrency)
+    def _open_only(ports: list) -> list[int]:
+        # Extensions built before results were reduced to open ports return (port, open) pairs
+        if ports and isinstance(ports[0], tuple):
+            return [p for p, is_open in ports if is_open]
+        return ports
+
+    def scan_ports_native(host: str, ports: list[int], timeout_ms: int, concurrency: int) -> list[int]:
+        """Open ports of ``host``, sorted."""
+        return _open_only(sentinelscope_rs.scan_ports(host, ports, timeout_ms, concurrency))
+
+    def scan_many_native(targets: list[tuple[str, list[int]]], timeout_ms: int, concurrency: int) -> list[tuple[str, list[int]]]:
+        return [(host, _open_only(ports)) for host, ports in sentinelscope_rs.scan_many(targets, timeout_ms, concurrency)]
+
+    async def scan_many_native_async(
+        targets: list[tuple[str, list[int]]], timeout_ms: int, concurrency: int
+    ) -> list[tuple[str, list[int]]]:
+        """Run ``scan_many`` on the extension's own runtime without blocking the event loop.
+
+        Returns ``(host, open_ports)`` per target, in input order.
+        """
+        if not hasattr(sentinelscope_rs, "spawn_scan_many"):
+            # Extension built before the async handle existed
+            return await asyncio.to_thread(scan_many_native, targets, timeout_ms, concurrency)
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        def _set(results) -> None:
+            if not future.done():
+                future.set_result(results)
+
+        def _done(results) -> None:
+            # Called on a runtime thread
+            try:
+                loop.call_soon_threadsafe(_set, results)
+            except RuntimeError:
+                pass  # loop already closed
+
+        handle = sentinelscope_rs.spawn_scan_many(targets, timeout_ms, concurrency, _done)
+        try:
+            results = await future
+        finally:
+            handle.cancel()
+        return [(host, _open_only(ports)) for host, ports in results]
+
+    async def scan_ports_native_async(host: str, ports: list[int], timeout_ms: int, concurrency: int) -> list[int]:
+        results = await scan_many_native_async([(host, ports)], timeout_ms, concurrency)
+        return results[0][1] if results else []
 
     def scan_ports_native_available() -> bool:
         return True
 
 except Exception:  # noqa: BLE001
-    def scan_ports_native(host: str, ports: list[int], timeout_ms: int, concurrency: int) -> list[tuple[int, bool]]:  # type: ignore[no-redef]
+    def scan_ports_native(host: str, ports: list[int], timeout_ms: int, concurrency: int) -> list[int]:  # type: ignore[no-redef]
+        raise RuntimeError("Native extension not available")
+
+    def scan_many_native(targets: list[tuple[str, list[int]]], timeout_ms: int, concurrency: int) -> list[tuple[str, list[int]]]:  # type: ignore[no-redef]
+        raise RuntimeError("Native extension not available")
+
+    async def scan_many_native_async(targets: list[tuple[str, list[int]]], timeout_ms: int, concurrency: int) -> list[tuple[str, list[int]]]:  # type: ignore[no-redef]
+        raise RuntimeError("Native extension not available")
+
+    async def scan_ports_native_async(host: str, ports: list[int], timeout_ms: int, concurrency: int) -> list[int]:  # type: ignore[no-redef]
         raise RuntimeError("Native extension not available")
 
     def scan_ports_native_available() -> bool:  # type: ignore[no-redef]
         return False
-
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+StageFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+ResultCallback = Callable[[str, Any], Any]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One unit of scan work.
+
+    ``run`` receives the results of ``deps`` keyed by stage name. ``limit`` names the
+    concurrency group the stage draws from (defaults to the stage name). Stages with
+    ``emit=False`` are plumbing (e.g. a shared fetch) and are not reported to callbacks.
+    """
+
+    name: str
+    run: StageFn
+    deps: Tuple[str, ...] = ()
+    limit: Optional[str] = None
+    emit: bool = True
+
+
+# Stages that hit third parties or many sockets get their own caps, shared by every scan
+# of a process (API requests and jobs, a batch, a CLI run)
+DEFAULT_STAGE_CAPS: Dict[str, int] = {
+    "subdomains": 4,
+    "takeover": 4,
+    "ports": 8,
+    "tls": 16,
+    "http": 32,
+}
+
+
+def stage_limits(**caps: int) -> Dict[str, asyncio.Semaphore]:
+    """Concurrency caps per stage/limit group, e.g. ``stage_limits(ports=4, takeover=2)``.
+
+    Pass the same mapping to many ``run_stages`` calls to cap a stage across scans.
+    """
+    return {name: asyncio.Semaphore(cap) for name, cap in caps.items()}
+
+
+def _check_graph(stages: List[Stage]) -> None:
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate stage names")
+    known = set(names)
+    for s in stages:
+        missing = [d for d in s.deps if d not in known]
+        if missing:
+            raise ValueError(f"Stage {s.name!r} depends on unknown stage(s): {', '.join(missing)}")
+    # Kahn's algorithm: anything left over sits on a cycle
+    pending = {s.name: set(s.deps) for s in stages}
+    ready = [n for n, deps in pending.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del pending[done]
+        for n, deps in pending.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps and n not in ready:
+                    ready.append(n)
+    if pending:
+        raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(pending))}")
+
+
+async def run_stages(
+    stages: Iterable[Stage],
+    *,
+    limits: Optional[Mapping[str, asyncio.Semaphore]] = None,
+    on_result: Optional[ResultCallback] = None,
+) -> Dict[str, Any]:
+    """Run every stage as soon as its dependencies finish; independent stages run concurrently.
+
+    A stage that raises yields ``None`` (scanners already degrade to neutral results,
+    this only guards the scan as a whole). ``on_result`` (sync or async) is called with
+    each emitting stage's result the moment it is ready.
+    """
+    stages = list(stages)
+    _check_graph(stages)
+    limits = limits or {}
+    loop = asyncio.get_running_loop()
+    finished: Dict[str, asyncio.Future] = {s.name: loop.create_future() for s in stages}
+    results: Dict[str, Any] = {}
+
+    async def run_one(stage: Stage) -> None:
+        inputs = {d: await finished[d] for d in stage.deps}
+        semaphore = limits.get(stage.limit or stage.name)
+        try:
+            if semaphore is not None:
+                async with semaphore:
+                    value = await stage.run(inputs)
+            else:
+                value = await stage.run(inputs)
+        except Exception:  # noqa: BLE001
+            value = None
+        results[stage.name] = value
+        finished[stage.name].set_result(value)
+        if on_result is not None and stage.emit:
+            ret = on_result(stage.name, value)
+            if inspect.isawaitable(ret):
+                await ret
+
+    await asyncio.gather(*(run_one(s) for s in stages))
+    return results
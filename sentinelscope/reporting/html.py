@@ -1,28 +1,73 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
-from sentinelscope.models import DomainScanResult
+from sentinelscope.models import DomainScanResult, PortScanResult
 
 
-def render_html_report(result: DomainScanResult) -> str:
+# Subdomains per collapsible page; pages after the first start closed so the browser
+# does not lay out tens of thousands of rows on open
+SUBDOMAIN_PAGE_SIZE = 1_000
+
+
+@lru_cache(maxsize=1)
+def _template() -> Template:
+    # Compiled once per process; batch reports reuse it
     templates_dir = Path(__file__).parent / "templates"
     env = Environment(
         loader=FileSystemLoader(str(templates_dir)),
         autoescape=select_autoescape(["html", "xml"]),
+        auto_reload=False,
     )
-    template = env.get_template("report.html")
+    return env.get_template("report.html")
+
+
+def _port_runs(ports: PortScanResult) -> List[Tuple[str, bool]]:
+    """Scanned ports as ``("start–end", is_open)`` runs of consecutive ports with one status."""
+    open_ports = set(ports.open_ports)
+    runs: List[Tuple[str, bool]] = []
+    start: Optional[int] = None
+    prev = state = None
+    for port in sorted(set(ports.ports_scanned)):
+        is_open = port in open_ports
+        if start is not None and port == prev + 1 and is_open == state:
+            prev = port
+            continue
+        if start is not None:
+            runs.append((str(start) if start == prev else f"{start}–{prev}", state))
+        start = prev = port
+        state = is_open
+    if start is not None:
+        runs.append((str(start) if start == prev else f"{start}–{prev}", state))
+    return runs
+
+
+def _context(result: DomainScanResult) -> Dict[str, Any]:
+    return {
+        "result": result,
+        "port_runs": _port_runs(result.ports) if result.ports else [],
+        "page_size": SUBDOMAIN_PAGE_SIZE,
+    }
+
+
+def iter_html_report(result: DomainScanResult) -> Iterator[str]:
+    """The report, rendered piece by piece."""
+    return _template().generate(**_context(result))
+
+
+def render_html_report(result: DomainScanResult) -> str:
     # Ensure grade/score are shown consistently: render as-is from result
-    return template.render(result=result)
+    return _template().render(**_context(result))
 
 
 def write_html_report(result: DomainScanResult, output_path: str | Path) -> Path:
-    html = render_html_report(result)
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(html, encoding="utf-8")
+    # Streamed into the file; the whole document is never held as one string
+    with output_path.open("w", encoding="utf-8") as fp:
+        fp.writelines(iter_html_report(result))
     return output_path
-
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from sentinelscope.incremental import PAGE_MODULES, Rescan
+from sentinelscope.models import DomainScanRequest, DomainScanResult, utc_now
+from sentinelscope.pipeline import ResultCallback, Stage, run_stages
+from sentinelscope.scanning.cookies import analyze_cookies
+from sentinelscope.scanning.cors import analyze_cors
+from sentinelscope.scanning.ct import fetch_crtsh
+from sentinelscope.scanning.dns_posture import DNSPosture, dns_posture
+from sentinelscope.scanning.fetch import fetch_page
+from sentinelscope.scanning.fingerprint import fingerprint_web
+from sentinelscope.scanning.http_headers import analyze_security_headers
+from sentinelscope.scanning.mixed_content import check_mixed_content
+from sentinelscope.scanning.ports import TOP_30_PORTS, TOP_100_PORTS, scan_ports
+from sentinelscope.scanning.security_txt import fetch_security_txt
+from sentinelscope.scanning.subdomains import enumerate_subdomains
+from sentinelscope.scanning.takeover import check_takeover_candidates
+from sentinelscope.scanning.tls import DEFAULT_PORTS as TLS_PORTS, get_tls_info_async, inspect_tls_endpoints, refresh_expiry
+from sentinelscope.scanning.web_preview import fetch_preview
+from sentinelscope.target import TargetContext
+
+
+def normalize_target(raw: str) -> Tuple[str, str]:
+    """Accept a bare domain or a full URL; return ``(host, base_url)``.
+
+    A scheme given in the input is preserved; otherwise HTTP is used for
+    localhost/loopback and HTTPS for everything else.
+    """
+    raw = raw.strip()
+    if raw.startswith("http://") or raw.startswith("https://"):
+        try:
+            parsed = urlparse(raw)
+            host = (parsed.hostname or raw).strip('/')
+            scheme = parsed.scheme if parsed.scheme in ("http", "https") else "https"
+        except Exception:
+            host = raw.replace("https://", "").replace("http://", "").strip('/')
+            scheme = "https"
+    else:
+        host = raw.strip('/')
+        scheme = "http" if host in {"localhost", "127.0.0.1", "::1"} else "https"
+    return host, f"{scheme}://{host}"
+
+
+def ports_for_request(req: DomainScanRequest) -> List[int]:
+    if req.port_profile == "top100":
+        return TOP_100_PORTS
+    if req.port_profile == "custom" and req.custom_ports:
+        return sorted(set(req.custom_ports))
+    return TOP_30_PORTS
+
+
+def build_domain_stages(
+    req: DomainScanRequest,
+    host: str,
+    base_url: str,
+    rescan: Optional[Rescan] = None,
+    target: Optional[TargetContext] = None,
+) -> List[Stage]:
+    """The stage graph of a domain scan; only enabled checks are included.
+
+    ``rescan`` carries the previous result of an incremental scan; stages whose
+    validators still match reuse its modules instead of recomputing them.
+    """
+    timeout = req.http_timeout
+    rescan = rescan or Rescan()
+    target = target or TargetContext(timeout=req.dns_timeout)
+    stages: List[Stage] = []
+
+    def add(name: str, run, deps: Tuple[str, ...] = (), limit: Optional[str] = None, emit: bool = True) -> None:
+        stages.append(Stage(name=name, run=run, deps=deps, limit=limit, emit=emit))
+
+    # One GET of the base URL feeds every analyzer that only reads the response
+    enabled = {
+        "headers": (req.analyze_headers, analyze_security_headers),
+        "preview": (req.web_preview, fetch_preview),
+        "cookies": (req.analyze_cookies, analyze_cookies),
+        "web_fingerprint": (req.fingerprint_web, fingerprint_web),
+        "mixed_content": (req.check_mixed_content, check_mixed_content),
+    }
+    page_modules = [name for name in PAGE_MODULES if enabled[name][0]]
+    if page_modules:
+        conditional = rescan.conditional_headers(page_modules)
+
+        async def page(_):
+            snapshot = await fetch_page(base_url, timeout=timeout, headers=conditional or None)
+            if snapshot.status_code in (200, 304):
+                for key, header in (("http.etag", "etag"), ("http.last_modified", "last-modified")):
+                    value = snapshot.headers.get(header) or (rescan.prior(key) if snapshot.status_code == 304 else None)
+                    if value:
+                        rescan.validators[key] = value
+            return snapshot
+
+        add("page", page, limit="http", emit=False)
+    for name in page_modules:
+        add(name, _from_page(name, enabled[name][1], base_url, timeout, rescan), ("page",))
+    if req.analyze_cors:
+        add("cors", lambda _: analyze_cors(base_url, timeout=timeout), limit="http")
+    if req.check_security_txt:
+        add("security_txt", lambda _: fetch_security_txt(host, timeout=timeout), limit="http")
+
+    if req.scan_subdomains:
+        wordlist = _wordlist_validator(req.subdomain_wordlist)
+
+        async def subdomains(_):
+            ct_names, high_water = await fetch_crtsh(host, http_timeout=timeout)
+            if wordlist:
+                rescan.validators["subdomains.wordlist"] = wordlist
+            if high_water is not None:
+                rescan.validators["crtsh.max_id"] = str(high_water)
+                # No new certificates logged since the last scan, and the same brute-force wordlist (if any)
+                if (
+                    str(high_water) == rescan.prior("crtsh.max_id")
+                    and wordlist == rescan.prior("subdomains.wordlist")
+                    and rescan.has("subdomains")
+                ):
+                    return rescan.carry("subdomains")
+            return await enumerate_subdomains(
+                host,
+                dns_timeout=req.dns_timeout,
+                http_timeout=timeout,
+                ct_names=ct_names,
+                wordlist=req.subdomain_wordlist,
+                bruteforce_qps=req.bruteforce_qps,
+            )
+
+        add("subdomains", subdomains)
+
+        async def takeover(r: Dict[str, Any]):
+            subdomains = r["subdomains"]
+            if subdomains and subdomains.discovered:
+                return await check_takeover_candidates(subdomains.discovered, timeout=timeout, dns_timeout=req.dns_timeout)
+            return None
+
+        add("takeover", takeover, ("subdomains",))
+
+    if req.scan_ports:
+        ports_list = ports_for_request(req)
+
+        async def ports(_):
+            # A port scan is about the machine, not the name: names with the same addresses
+            # (within a scan or across a batch) share one scan
+            addresses = await target.resolve(host)
+            # Round-robin DNS returns the same set in varying order: key on the set
+            result = await target.once(("ports", tuple(sorted(set(addresses))) or host, tuple(ports_list)), lambda: scan_ports(
+                host, ports_list, concurrency=req.port_concurrency, timeout=req.port_timeout, adaptive=req.port_adaptive,
+            ))
+            return result.model_copy(update={"host": host})
+
+        add("ports", ports)
+    if req.analyze_tls:
+        # The base URL fetch already saw the leaf certificate; if it is the one we parsed
+        # last time, skip the separate handshake
+        reuse_tls = bool(page_modules) and base_url.startswith("https://") and rescan.has("tls") and rescan.prior("tls.sha256")
+
+        async def tls(r: Dict[str, Any]):
+            seen = r["page"].peer_cert_sha256 if reuse_tls and _same_origin(r["page"].final_url, host) else None
+            if seen and seen == rescan.prior("tls.sha256"):
+                rescan.validators["tls.sha256"] = seen
+                return refresh_expiry(rescan.carry("tls"))
+            info = await get_tls_info_async(host, timeout=timeout)
+            if info.fingerprint_sha256:
+                rescan.validators["tls.sha256"] = info.fingerprint_sha256
+            return info
+
+        add("tls", tls, ("page",) if reuse_tls else ())
+    if req.tls_inventory:
+        async def tls_inventory(r: Dict[str, Any]):
+            endpoints = [(host, port) for port in TLS_PORTS]
+            subdomains = r.get("subdomains")
+            if subdomains:
+                endpoints += [(name, 443) for name in subdomains.discovered]
+            return await inspect_tls_endpoints(endpoints, timeout=timeout)
+
+        add("tls_inventory", tls_inventory, ("subdomains",) if req.scan_subdomains else (), limit="tls")
+
+    # DNS records, DNSSEC/CAA and AXFR share one batch of queries
+    dns_modules = [name for name, on in (("dns", req.analyze_dns), ("dns_extras", req.check_dnssec_caa), ("dns_axfr", True)) if on]
+
+    async def posture(_):
+        fresh_until = rescan.prior("dns.fresh_until")
+        if fresh_until and datetime.fromisoformat(fresh_until) > utc_now() and rescan.has(*dns_modules):
+            # Every answer of the previous scan is still within its TTL
+            for key in ("dns.fresh_until", "dns.zone"):
+                if rescan.prior(key):
+                    rescan.validators[key] = rescan.prior(key)
+            return DNSPosture(*(rescan.carry(m) if m in dns_modules else None for m in ("dns", "dns_extras", "dns_axfr")))
+        known_zone = rescan.prior("dns.zone") if rescan.has("dns_axfr") else None
+        result = await dns_posture(host, timeout=req.dns_timeout, records=req.analyze_dns, extras=req.check_dnssec_caa, known_zone=known_zone)
+        if result.zone:
+            rescan.validators["dns.zone"] = result.zone
+        if result.fresh_until:
+            rescan.validators["dns.fresh_until"] = result.fresh_until.isoformat()
+        if result.axfr is None and result.zone is not None and result.zone == known_zone:
+            result = result._replace(axfr=rescan.carry("dns_axfr"))
+        return result
+
+    add("dns_posture", posture, emit=False)
+    if req.analyze_dns:
+        add("dns", _pick("dns_posture", 0), ("dns_posture",))
+    if req.check_dnssec_caa:
+        add("dns_extras", _pick("dns_posture", 1), ("dns_posture",))
+    add("dns_axfr", _pick("dns_posture", 2), ("dns_posture",))
+    return stages
+
+
+def _from_page(name: str, analyze, base_url: str, timeout: float, rescan: Rescan):
+    async def run(r: Dict[str, Any]):
+        page = r["page"]
+        if page.status_code == 304:
+            return rescan.carry(name)
+        return await analyze(base_url, timeout=timeout, page=page)
+    return run
+
+
+def _wordlist_validator(path: Optional[str]) -> Optional[str]:
+    # Path, size and mtime: an edited or different wordlist means brute force has to run again
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path
+    return f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def _same_origin(url: str, host: str) -> bool:
+    parsed = urlparse(url)
+    return parsed.scheme == "https" and parsed.hostname == host and parsed.port in (None, 443)
+
+
+def _pick(stage: str, index: int):
+    async def run(r: Dict[str, Any]):
+        return r[stage][index] if r[stage] else None
+    return run
+
+
+async def run_domain_scan(
+    req: DomainScanRequest,
+    *,
+    limits: Optional[Mapping[str, asyncio.Semaphore]] = None,
+    on_result: Optional[ResultCallback] = None,
+    previous: Optional[DomainScanResult] = None,
+    target: Optional[TargetContext] = None,
+) -> DomainScanResult:
+    """Run a full domain scan through the stage scheduler (shared by the CLI and the API).
+
+    With ``previous`` (an earlier result for the same target) the scan is incremental:
+    modules whose validators are unchanged are copied and listed in ``carried_over``.
+    Names are resolved once and pinned for every stage through ``target``; pass one
+    context to many scans to share pins and per-address work between them.
+    """
+    started = utc_now()
+    host, base_url = normalize_target(req.domain)
+    rescan = Rescan(previous)
+    target = target or TargetContext(timeout=req.dns_timeout)
+    with target.pinned():
+        stages = build_domain_stages(req, host, base_url, rescan, target)
+        results = await run_stages(stages, limits=limits, on_result=on_result)
+    fields = {k: v for k, v in results.items() if k in DomainScanResult.model_fields}
+    return DomainScanResult(
+        domain=host,
+        addresses=target.addresses(host),
+        started_at=started,
+        finished_at=utc_now(),
+        validators=rescan.validators,
+        carried_over=sorted(rescan.carried_over),
+        **fields,
+    )
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import codecs
+import re
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+
+# An in-memory body is handed to analyzers in slices of this size
+CHUNK_BYTES = 65536
+# A title (or URL) longer than this is not worth holding on to
+MAX_TITLE_CHARS = 10000
+MAX_URL_CHARS = 8192
+MAX_EXAMPLES = 10
+
+_TITLE_OPEN = "<title>"
+_TITLE_CLOSE = "</title>"
+# Searched case-insensitively in place: offsets into a lowered copy drift when lower()
+# changes the length (e.g. "İ" lowers to two characters)
+_TITLE_OPEN_RE = re.compile(re.escape(_TITLE_OPEN), re.IGNORECASE)
+_TITLE_CLOSE_RE = re.compile(re.escape(_TITLE_CLOSE), re.IGNORECASE)
+_URL_END = set(" \t\r\n\f\v'\"")
+
+
+class BodyAnalyzer(ABC):
+    """Consumes a decoded body chunk by chunk; ``done`` means it needs no more input."""
+
+    done: bool = False
+
+    @abstractmethod
+    def feed(self, text: str) -> None:
+        """Consume the next decoded chunk."""
+
+    def close(self) -> None:
+        """End of input (or of the byte cap)."""
+
+
+class TitleExtractor(BodyAnalyzer):
+    """Finds ``<title>...</title>`` and stops reading as soon as the closing tag arrives."""
+
+    def __init__(self) -> None:
+        self.title: Optional[str] = None
+        self.done = False
+        self._buf = ""
+        self._inside = False
+
+    def feed(self, text: str) -> None:
+        if self.done:
+            return
+        self._buf += text
+        if not self._inside:
+            start = _TITLE_OPEN_RE.search(self._buf)
+            if start is None:
+                # Keep just enough to catch a tag split across chunks
+                self._buf = self._buf[-(len(_TITLE_OPEN) - 1):]
+                return
+            self._inside = True
+            self._buf = self._buf[start.end():]
+        end = _TITLE_CLOSE_RE.search(self._buf)
+        if end is not None:
+            self.title = self._buf[:end.start()].strip()
+            self._buf = ""
+            self.done = True
+        elif len(self._buf) > MAX_TITLE_CHARS + len(_TITLE_CLOSE):
+            self._buf = ""
+            self.done = True
+
+
+class InsecureReferenceCounter(BodyAnalyzer):
+    """Counts ``http://`` references without materialising them; keeps a few examples.
+
+    A URL cut by a chunk boundary is carried over to the next chunk and counted once.
+    """
+
+    PATTERN = re.compile(r"http://[^\s'\"]+", re.IGNORECASE)
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.examples: List[str] = []
+        self._carry = ""
+        self._skipping = False
+
+    def _hit(self, url: str) -> None:
+        self.count += 1
+        if len(self.examples) < MAX_EXAMPLES and url not in self.examples:
+            self.examples.append(url)
+
+    def feed(self, text: str) -> None:
+        buf = self._carry + text
+        pos = 0
+        if self._skipping:
+            # Rest of an over-long URL that was already counted
+            while pos < len(buf) and buf[pos] not in _URL_END:
+                pos += 1
+            if pos == len(buf):
+                self._carry = ""
+                return
+            self._skipping = False
+        tail = max(pos, len(buf) - len("http://"))
+        for m in self.PATTERN.finditer(buf, pos):
+            if m.end() == len(buf):
+                # The URL may go on in the next chunk
+                if m.end() - m.start() > MAX_URL_CHARS:
+                    self._hit(m.group())
+                    self._skipping = True
+                    self._carry = ""
+                else:
+                    self._carry = buf[m.start():]
+                return
+            self._hit(m.group())
+            tail = max(tail, m.end())
+        # Keep a possible "http://" still waiting for its first URL character
+        self._carry = buf[tail:]
+
+    def close(self) -> None:
+        m = self.PATTERN.match(self._carry)
+        if m:
+            self._hit(m.group())
+        self._carry = ""
+
+
+class BodyPipeline:
+    """Decodes body bytes incrementally and feeds every analyzer, up to ``max_bytes``."""
+
+    def __init__(self, analyzers: Sequence[BodyAnalyzer], charset: str = "utf-8", max_bytes: Optional[int] = None):
+        self.analyzers = list(analyzers)
+        self.max_bytes = max_bytes
+        self.consumed = 0
+        self.set_charset(charset)
+        self._closed = False
+
+    def set_charset(self, charset: str) -> None:
+        """Pick the decoder; only meaningful before the first ``feed``."""
+        try:
+            self._decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    @property
+    def done(self) -> bool:
+        return self._closed or all(a.done for a in self.analyzers)
+
+    def feed(self, data: bytes) -> bool:
+        """Feed raw bytes; returns True once no analyzer wants more."""
+        if self.done:
+            return True
+        if self.max_bytes is not None:
+            data = data[:max(0, self.max_bytes - self.consumed)]
+        self.consumed += len(data)
+        text = self._decoder.decode(data)
+        if text:
+            for a in self.analyzers:
+                if not a.done:
+                    a.feed(text)
+        if self.max_bytes is not None and self.consumed >= self.max_bytes:
+            self.close()
+        return self.done
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        text = self._decoder.decode(b"", final=True)
+        for a in self.analyzers:
+            if text and not a.done:
+                a.feed(text)
+            a.close()
+
+
+def analyze_body(body: bytes, analyzers: Sequence[BodyAnalyzer], charset: str = "utf-8", max_bytes: Optional[int] = None) -> None:
+    """Run ``analyzers`` over an in-memory body in slices, without decoding it all at once."""
+    pipeline = BodyPipeline(analyzers, charset=charset, max_bytes=max_bytes)
+    view = memoryview(body)
+    for start in range(0, len(body), CHUNK_BYTES):
+        if pipeline.feed(bytes(view[start:start + CHUNK_BYTES])):
+            break
+    pipeline.close()
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import hashlib
+import ipaddress
+import ssl
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import dsa, ec, ed448, ed25519, rsa
+
+from sentinelscope.models import utc_now
+
+
+DEFAULT_CACHE_SIZE = 10_000
+MIN_RSA_BITS = 2048
+WEAK_HASHES = {"md5", "sha1"}
+
+
+@dataclass(frozen=True)
+class ParsedCertificate:
+    """What we keep from one DER certificate; shared by every host that presents it."""
+
+    fingerprint_sha256: str
+    subject: Dict[str, str]
+    issuer: Dict[str, str]
+    valid_from: datetime
+    valid_to: datetime
+    subject_alternative_names: List[str] = field(default_factory=list)
+    ip_addresses: List[str] = field(default_factory=list)
+    key_type: Optional[str] = None
+    key_size: Optional[int] = None
+    signature_algorithm: Optional[str] = None
+    serial_number: Optional[str] = None
+    is_ca: bool = False
+    # Problems that depend on nothing but the certificate itself
+    issues: List[str] = field(default_factory=list)
+    # Raw names, compared when checking the chain order
+    subject_der: bytes = b""
+    issuer_der: bytes = b""
+
+    @property
+    def self_issued(self) -> bool:
+        return self.subject_der == self.issuer_der
+
+    @property
+    def label(self) -> str:
+        return self.subject.get("commonName") or self.fingerprint_sha256[:16]
+
+
+class CertificateCache:
+    """Size-bounded LRU of parsed certificates keyed by SHA-256 fingerprint.
+
+    A wildcard or CDN certificate seen on thousands of hosts, and the intermediates
+    most chains share, are parsed once.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ParsedCertificate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, fingerprint: str) -> Optional[ParsedCertificate]:
+        with self._lock:
+            parsed = self._entries.get(fingerprint)
+            if parsed is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            return parsed
+
+    def put(self, parsed: ParsedCertificate) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[parsed.fingerprint_sha256] = parsed
+            self._entries.move_to_end(parsed.fingerprint_sha256)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_cache = CertificateCache()
+
+
+def get_certificate_cache() -> CertificateCache:
+    return _cache
+
+
+def _name(name: x509.Name) -> Dict[str, str]:
+    # Same keys getpeercert() used (commonName, organizationName, ...)
+    out: Dict[str, str] = {}
+    for attr in name:
+        key = getattr(attr.oid, "_name", None) or attr.oid.dotted_string
+        out[key] = attr.value if isinstance(attr.value, str) else attr.value.hex()
+    return out
+
+
+def _key(cert: x509.Certificate) -> Tuple[Optional[str], Optional[int]]:
+    try:
+        key = cert.public_key()
+    except Exception:  # noqa: BLE001  (unsupported or malformed key)
+        return None, None
+    if isinstance(key, rsa.RSAPublicKey):
+        return "RSA", key.key_size
+    if isinstance(key, ec.EllipticCurvePublicKey):
+        return f"EC ({key.curve.name})", key.key_size
+    if isinstance(key, dsa.DSAPublicKey):
+        return "DSA", key.key_size
+    if isinstance(key, ed25519.Ed25519PublicKey):
+        return "Ed25519", 256
+    if isinstance(key, ed448.Ed448PublicKey):
+        return "Ed448", 456
+    return type(key).__name__, None
+
+
+def _parse(der: bytes, fingerprint: str) -> ParsedCertificate:
+    cert = x509.load_der_x509_certificate(der)
+    sans: List[str] = []
+    ips: List[str] = []
+    try:
+        ext = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+        sans = ext.get_values_for_type(x509.DNSName)
+        ips = [str(ip) for ip in ext.get_values_for_type(x509.IPAddress)]
+    except x509.ExtensionNotFound:
+        pass
+    is_ca = False
+    try:
+        is_ca = cert.extensions.get_extension_for_class(x509.BasicConstraints).value.ca
+    except x509.ExtensionNotFound:
+        pass
+    key_type, key_size = _key(cert)
+    hash_name = cert.signature_hash_algorithm.name if cert.signature_hash_algorithm else None
+    oid = cert.signature_algorithm_oid
+    signature_algorithm = getattr(oid, "_name", None) or oid.dotted_string
+
+    issues: List[str] = []
+    if key_type == "RSA" and key_size is not None and key_size < MIN_RSA_BITS:
+        issues.append(f"Weak RSA key ({key_size} bits)")
+    if key_type == "DSA":
+        issues.append("DSA key")
+    if hash_name in WEAK_HASHES:
+        issues.append(f"Weak signature algorithm ({signature_algorithm})")
+    return ParsedCertificate(
+        fingerprint_sha256=fingerprint,
+        subject=_name(cert.subject),
+        issuer=_name(cert.issuer),
+        valid_from=cert.not_valid_before_utc.replace(tzinfo=None),
+        valid_to=cert.not_valid_after_utc.replace(tzinfo=None),
+        subject_alternative_names=sans,
+        ip_addresses=ips,
+        key_type=key_type,
+        key_size=key_size,
+        signature_algorithm=signature_algorithm,
+        serial_number=format(cert.serial_number, "x"),
+        is_ca=is_ca,
+        issues=issues,
+        subject_der=cert.subject.public_bytes(),
+        issuer_der=cert.issuer.public_bytes(),
+    )
+
+
+def parse_certificate(der: bytes, cache: Optional[CertificateCache] = None) -> ParsedCertificate:
+    """Parse a DER certificate, or return the cached parse of an identical one.
+
+    Raises ``ValueError`` if ``der`` is not a certificate.
+    """
+    cache = _cache if cache is None else cache
+    fingerprint = hashlib.sha256(der).hexdigest()
+    parsed = cache.get(fingerprint)
+    if parsed is None:
+        parsed = _parse(der, fingerprint)
+        cache.put(parsed)
+    return parsed
+
+
+def peer_chain(ssl_object: ssl.SSLObject) -> Tuple[List[bytes], bool]:
+    """The DER certificates the peer sent, leaf first, and whether that is the whole chain.
+
+    Needs ``get_unverified_chain`` (public from Python 3.13, on the private object
+    before that); otherwise only the leaf is returned.
+    """
+    getter = getattr(ssl_object, "get_unverified_chain", None)
+    if getter is None:
+        getter = getattr(getattr(ssl_object, "_sslobj", None), "get_unverified_chain", None)
+    chain = []
+    if getter is not None:
+        try:
+            chain = getter() or []
+        except Exception:  # noqa: BLE001
+            chain = []
+    if chain:
+        # 3.13 returns bytes; older versions return _ssl.Certificate objects
+        return [c if isinstance(c, bytes) else ssl.PEM_cert_to_DER_cert(c.public_bytes()) for c in chain], True
+    leaf = ssl_object.getpeercert(binary_form=True)
+    return ([leaf] if leaf else []), False
+
+
+def _matches(pattern: str, host: str) -> bool:
+    pattern, host = pattern.lower().rstrip("."), host.lower().rstrip(".")
+    if pattern.startswith("*."):
+        # A wildcard covers exactly one label
+        head, _, rest = host.partition(".")
+        return bool(head) and rest == pattern[2:]
+    return pattern == host
+
+
+def covers(cert: ParsedCertificate, host: str) -> bool:
+    """Whether ``cert`` is valid for ``host`` (SANs, or the CN when there are none)."""
+    try:
+        return str(ipaddress.ip_address(host.strip("[]"))) in cert.ip_addresses
+    except ValueError:
+        pass
+    names = cert.subject_alternative_names or [cert.subject.get("commonName", "")]
+    return any(_matches(n, host) for n in names if n)
+
+
+def chain_issues(
+    chain: Sequence[ParsedCertificate],
+    host: Optional[str] = None,
+    now: Optional[datetime] = None,
+    complete: bool = True,
+) -> List[str]:
+    """Problems with a served chain (leaf first). Cheap: works on already-parsed entries.
+
+    ``complete=False`` means only the leaf is known, so missing intermediates are not reported.
+    """
+    if not chain:
+        return []
+    now = now or utc_now()
+    leaf = chain[0]
+    issues = list(leaf.issues)
+    if host and not covers(leaf, host):
+        issues.append(f"Certificate does not cover {host}")
+    if now < leaf.valid_from:
+        issues.append("Certificate not yet valid")
+    if leaf.self_issued:
+        issues.append("Self-signed certificate")
+    for child, parent in zip(chain, chain[1:]):
+        if child.issuer_der != parent.subject_der:
+            issues.append(f"Chain out of order: {child.label} is not issued by {parent.label}")
+    for cert in chain[1:]:
+        if cert.valid_to < now:
+            issues.append(f"Expired chain certificate: {cert.label}")
+        issues.extend(f"{cert.label}: {issue}" for issue in cert.issues)
+    if complete and len(chain) == 1 and not leaf.self_issued:
+        issues.append("No intermediate certificates sent")
+    return issues
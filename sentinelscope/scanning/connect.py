@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import asyncio
+import errno
+import ipaddress
+import socket
+import struct
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+DEFAULT_CONCURRENCY = 200
+# File descriptors left for everything else in the process
+FD_HEADROOM = 128
+# Adaptive timeouts never drop below this, whatever the measured RTT
+MIN_TIMEOUT = 0.1
+# Probes in flight before the first answers arrive; the window grows from here
+INITIAL_WINDOW = 32
+MIN_WINDOW = 4
+
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, getattr(errno, "WSAEWOULDBLOCK", -1)}
+# Close with RST: no FIN handshake and no TIME_WAIT left behind per probe
+_LINGER_RESET = struct.pack("ii", 1, 0)
+
+Target = Tuple[str, int]
+
+
+def fd_budget(concurrency: int) -> int:
+    """``concurrency`` capped to what the open-files limit allows."""
+    if resource is None:
+        return concurrency
+    try:
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (OSError, ValueError):
+        return concurrency
+    if soft == resource.RLIM_INFINITY:
+        return concurrency
+    return max(1, min(concurrency, soft - FD_HEADROOM))
+
+
+def supported() -> bool:
+    """Whether the running loop can watch raw sockets (not the case for Windows' Proactor)."""
+    return not isinstance(asyncio.get_running_loop(), getattr(asyncio, "ProactorEventLoop", ()))
+
+
+@lru_cache(maxsize=4096)
+def _family(host: str) -> socket.AddressFamily:
+    return socket.AF_INET6 if ipaddress.ip_address(host).version == 6 else socket.AF_INET
+
+
+class RTTEstimator:
+    """Smoothed round-trip time and the timeout derived from it (RFC 6298).
+
+    Until the first sample the timeout is ``max_timeout``; afterwards it is
+    ``SRTT + 4 * RTTVAR`` clamped to ``[min_timeout, max_timeout]``. Refused connects
+    are samples too: the RST takes one round trip just like the SYN/ACK.
+    """
+
+    def __init__(self, max_timeout: float, min_timeout: float = MIN_TIMEOUT):
+        self.max_timeout = max_timeout
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+
+    def update(self, sample: float) -> None:
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - sample)
+            self.srtt = 0.875 * self.srtt + 0.125 * sample
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+
+
+class CongestionWindow:
+    """AIMD limit on probes in flight.
+
+    Every completed probe grows the window (by one while below the slow-start threshold,
+    by ``1/window`` after). Timeouts are only treated as congestion when their recent
+    rate jumps above the long-run rate, so silently dropped ports (a firewall, an empty
+    address range) are that host's baseline and do not throttle the scan; on a spike the
+    window is halved, at most once per ``hold`` seconds.
+    """
+
+    SPIKE = 0.25
+
+    def __init__(self, maximum: int, initial: int = INITIAL_WINDOW, minimum: int = MIN_WINDOW):
+        self.maximum = max(1, maximum)
+        self.minimum = min(minimum, self.maximum)
+        self.window = float(min(max(initial, self.minimum), self.maximum))
+        self.ssthresh = float(self.maximum)
+        self._recent = 0.0  # fast-moving timeout rate
+        self._baseline: Optional[float] = None  # slow-moving timeout rate
+        self._hold_until = 0.0
+
+    @property
+    def size(self) -> int:
+        return int(self.window)
+
+    def _observe(self, timed_out: float) -> None:
+        self._recent = 0.9 * self._recent + 0.1 * timed_out
+        self._baseline = timed_out if self._baseline is None else 0.99 * self._baseline + 0.01 * timed_out
+
+    def _grow(self) -> None:
+        step = 1.0 if self.window < self.ssthresh else 1.0 / self.window
+        self.window = min(float(self.maximum), self.window + step)
+
+    def on_answer(self) -> None:
+        self._observe(0.0)
+        self._grow()
+
+    def on_timeout(self, now: float, hold: float) -> None:
+        self._observe(1.0)
+        if self._recent - (self._baseline or 0.0) <= self.SPIKE:
+            self._grow()
+        elif now >= self._hold_until:
+            self.window = max(float(self.minimum), self.window / 2)
+            self.ssthresh = self.window
+            self._hold_until = now + hold
+
+
+class _Probe:
+    __slots__ = ("target", "sock", "timer", "started")
+
+    def __init__(self, target: Target, sock: socket.socket, started: float):
+        self.target = target
+        self.sock = sock
+        self.started = started
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class ConnectScanner:
+    """TCP connect scan driven by raw non-blocking ``connect_ex`` calls.
+
+    Each probe is one socket, one writer callback on the event loop and one timer; no
+    transports or streams are built and sockets are closed with RST. Completion is
+    read from ``SO_ERROR`` when the socket turns writable. At most ``concurrency``
+    probes are in flight, and the next one starts from the callback that ends the last.
+    Targets must be IP literals; anything else counts as closed. ``on_answer`` is called
+    for every probe the host answered, open or refused, which is enough to tell a live
+    host from a silent one. With ``collect=False`` results only go to ``on_result`` (e.g. a
+    :class:`~sentinelscope.scanning.porttable.PortTable`) and ``run`` returns an empty dict,
+    so nothing is kept per closed port.
+
+    With ``adaptive`` (the default) ``timeout`` and ``concurrency`` are ceilings: each
+    host's timeout follows its measured RTT (:class:`RTTEstimator`) and the number of
+    probes in flight follows a :class:`CongestionWindow`. Filtered ports then cost a few
+    round trips instead of the full timeout.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = 1.0,
+        on_result: Optional[Callable[[Target, bool], None]] = None,
+        adaptive: bool = True,
+        min_timeout: float = MIN_TIMEOUT,
+        on_answer: Optional[Callable[[Target], None]] = None,
+        collect: bool = True,
+    ):
+        self.concurrency = fd_budget(max(1, concurrency))
+        self.timeout = timeout
+        self.on_result = on_result
+        self.on_answer = on_answer
+        self.collect = collect
+        self.adaptive = adaptive
+        self.min_timeout = min_timeout
+        self.window = CongestionWindow(self.concurrency) if adaptive else None
+        self.rtt: Dict[str, RTTEstimator] = {}
+        self._results: Dict[Target, bool] = {}
+        self._targets: Iterator[Target] = iter(())
+        self._in_flight = 0
+        self._filling = False
+        self._pending: Set[_Probe] = set()
+        self._done: Optional[asyncio.Future] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def forget(self, host: str) -> None:
+        """Drop the RTT state kept for ``host`` (long sweeps call this once a host is done)."""
+        self.rtt.pop(host, None)
+
+    async def run(self, targets: Iterable[Target]) -> Dict[Target, bool]:
+        """Probe every ``(address, port)``; returns whether each one accepted a connection."""
+        self._loop = asyncio.get_running_loop()
+        self._done = self._loop.create_future()
+        self._targets = iter(targets)
+        self._results = {}
+        self._fill()
+        try:
+            await self._done
+        finally:
+            # Cancelled mid-scan: drop whatever is still waiting on the loop
+            for probe in list(self._pending):
+                probe.timer.cancel()
+                self._loop.remove_writer(probe.sock.fileno())
+                probe.sock.close()
+            self._pending.clear()
+        return self._results
+
+    def _fill(self) -> None:
+        # Probes that end straight away (refused on loopback, bad address) are recorded
+        # while this loop runs; the guard keeps that from recursing once per target
+        if self._filling:
+            return
+        self._filling = True
+        try:
+            while self._in_flight < (self.window.size if self.window is not None else self.concurrency):
+                target = next(self._targets, None)
+                if target is None:
+                    break
+                self._in_flight += 1
+                self._start(target)
+        finally:
+            self._filling = False
+        if self._in_flight == 0 and not self._done.done():
+            self._done.set_result(None)
+
+    def _start(self, target: Target) -> None:
+        host, port = target
+        try:
+            sock = socket.socket(_family(host), socket.SOCK_STREAM)
+        except (ValueError, OSError):
+            self._record(target, False)
+            return
+        probe = _Probe(target, sock, self._loop.time())
+        try:
+            sock.setblocking(False)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+            err = sock.connect_ex((host, port))
+        except OSError:
+            err = -1
+        if err in (0, errno.ECONNREFUSED):
+            self._answered(probe)
+            self._finish(probe, err == 0)
+        elif err in _IN_PROGRESS:
+            self._loop.add_writer(sock.fileno(), self._writable, probe)
+            probe.timer = self._loop.call_later(self._timeout(host), self._expire, probe)
+            self._pending.add(probe)
+        else:
+            self._finish(probe, False)  # refused (or unreachable) straight away
+
+    def _timeout(self, host: str) -> float:
+        if not self.adaptive:
+            return self.timeout
+        rtt = self.rtt.get(host)
+        return rtt.timeout if rtt is not None else self.timeout
+
+    def _writable(self, probe: _Probe) -> None:
+        try:
+            err = probe.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        except OSError:
+            err = -1
+        if err in (0, errno.ECONNREFUSED):
+            self._answered(probe)
+        self._finish(probe, err == 0)
+
+    def _answered(self, probe: _Probe) -> None:
+        # Open or refused, the host answered: a round-trip sample, and room for one more probe
+        if self.on_answer is not None:
+            self.on_answer(probe.target)
+        if not self.adaptive:
+            return
+        host = probe.target[0]
+        if host not in self.rtt:
+            self.rtt[host] = RTTEstimator(self.timeout, self.min_timeout)
+        self.rtt[host].update(self._loop.time() - probe.started)
+        self.window.on_answer()
+
+    def _expire(self, probe: _Probe) -> None:
+        if self.window is not None:
+            self.window.on_timeout(self._loop.time(), self._timeout(probe.target[0]))
+        self._finish(probe, False)
+
+    def _finish(self, probe: _Probe, is_open: bool) -> None:
+        if probe.sock.fileno() == -1:
+            return  # already finished
+        if probe.timer is not None:
+            probe.timer.cancel()
+            self._loop.remove_writer(probe.sock.fileno())
+            self._pending.discard(probe)
+        probe.sock.close()
+        self._record(probe.target, is_open)
+
+    def _record(self, target: Target, is_open: bool) -> None:
+        if self.collect:
+            self._results[target] = is_open
+        if self.on_result is not None:
+            self.on_result(target, is_open)
+        self._in_flight -= 1
+        self._fill()
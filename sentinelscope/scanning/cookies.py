@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 import httpx
 
 from sentinelscope.models import CookieAssessment, CookieInfo
+from sentinelscope.scanning.fetch import PageSnapshot, fetch_page
 
 
 def _parse_set_cookie(header_value: str) -> CookieInfo:
@@ -25,11 +26,16 @@ def _parse_set_cookie(header_value: str) -> CookieInfo:
     return CookieInfo(name=name, secure=secure, http_only=http_only, same_site=same_site, issues=issues)
 
 
-async def analyze_cookies(url: str, timeout: float = 6.0) -> CookieAssessment:
+async def analyze_cookies(
+    url: str,
+    timeout: float = 6.0,
+    page: Optional[PageSnapshot] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> CookieAssessment:
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-            resp = await client.get(url)
-        cookies_headers = resp.headers.get_list('set-cookie') if hasattr(resp.headers, 'get_list') else resp.headers.get('set-cookie', '').split('\n')
+        if page is None:
+            page = await fetch_page(url, timeout=timeout, max_body_bytes=0, client=client)
+        cookies_headers = page.headers.get_list('set-cookie')
     except Exception:
         cookies_headers = []
     cookies: List[CookieInfo] = []
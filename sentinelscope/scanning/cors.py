@@ -5,12 +5,13 @@ from typing import List, Optional
 import httpx
 
 from sentinelscope.models import CORSAssessment
+from sentinelscope.utils.http import borrow_client
 
 
-async def analyze_cors(url: str, timeout: float = 6.0) -> CORSAssessment:
+async def analyze_cors(url: str, timeout: float = 6.0, client: Optional[httpx.AsyncClient] = None) -> CORSAssessment:
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-            resp = await client.get(url, headers={"Origin": "https://example.com"})
+        async with borrow_client(client, timeout=timeout) as c:
+            resp = await c.get(url, headers={"Origin": "https://example.com"}, timeout=timeout, follow_redirects=True)
         ao = resp.headers.get("access-control-allow-origin")
         ac = resp.headers.get("access-control-allow-credentials")
         risks: List[str] = []
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Iterator, List, Optional, Set, Tuple
+
+import httpx
+
+from sentinelscope.utils.http import borrow_client
+
+
+CRTSH_URL = "https://crt.sh/?q=%25.{domain}&output=json"
+# A cached CT answer younger than this is used without touching the network
+DEFAULT_MAX_AGE = 24 * 3600.0
+
+_SEPARATORS = " \t\r\n,"
+# Cache files are named after the domain, so only plain hostnames get one
+_HOSTNAME = re.compile(r"^(?!-)[a-z0-9_-]{1,63}(?<!-)(\.(?!-)[a-z0-9_-]{1,63}(?<!-))*$")
+
+
+async def iter_json_array(chunks: AsyncIterable[str]) -> AsyncIterator[Any]:
+    """Yield the elements of a top-level JSON array as their text arrives.
+
+    Only the current partial element and one chunk are held in memory, so a response
+    of any size is parsed in constant space (per element).
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    started = False
+    async for chunk in chunks:
+        buf = buf[pos:] + chunk
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in _SEPARATORS:
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # the element continues in the next chunk
+            if end == len(buf) and not isinstance(item, (dict, list, str)):
+                break  # a bare number may still have digits to come
+            yield item
+            pos = end
+    raise ValueError("Truncated JSON array")
+
+
+def _names(entry: Any, domain: str) -> Iterator[str]:
+    if not isinstance(entry, dict):
+        return
+    for n in str(entry.get("name_value", "")).split("\n"):
+        n = n.strip().lower()
+        if n.endswith(domain):
+            yield n
+
+
+@dataclass
+class CTCacheEntry:
+    fetched_at: float
+    max_id: int
+    names: Set[str] = field(default_factory=set)
+
+
+class CTCache:
+    """One JSON file per domain holding every name seen so far and the crt.sh high-water mark.
+
+    CT logs are append-only, so a refresh only has to merge entries above ``max_id``.
+    """
+
+    def __init__(self, directory: str | Path, max_age: float = DEFAULT_MAX_AGE):
+        self.directory = Path(directory)
+        self.max_age = max_age
+
+    def _path(self, domain: str) -> Optional[Path]:
+        """The cache file for ``domain``, or None if it is not a hostname (e.g. contains ``/`` or ``..``)."""
+        name = domain.lower().strip(".")
+        if len(name) > 253 or not _HOSTNAME.match(name):
+            return None
+        path = self.directory / f"{name}.json"
+        if path.resolve().parent != self.directory.resolve():
+            return None
+        return path
+
+    def load(self, domain: str) -> Optional[CTCacheEntry]:
+        path = self._path(domain)
+        if path is None:
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return CTCacheEntry(fetched_at=float(data["fetched_at"]), max_id=int(data["max_id"]), names=set(data["names"]))
+        except Exception:  # noqa: BLE001
+            return None
+
+    def store(self, domain: str, entry: CTCacheEntry) -> None:
+        path = self._path(domain)
+        if path is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"domain": domain, "fetched_at": entry.fetched_at, "max_id": entry.max_id, "names": sorted(entry.names)}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+    def is_fresh(self, entry: CTCacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.max_age
+
+
+_ct_cache: Optional[CTCache] = None
+
+
+def get_ct_cache() -> Optional[CTCache]:
+    return _ct_cache
+
+
+@contextmanager
+def use_ct_cache(directory: Optional[str | Path], max_age: float = DEFAULT_MAX_AGE) -> Iterator[Optional[CTCache]]:
+    """Cache crt.sh answers under ``directory`` (if given) for the duration of the block."""
+    global _ct_cache
+    previous = _ct_cache
+    if directory:
+        _ct_cache = CTCache(directory, max_age=max_age)
+    try:
+        yield _ct_cache
+    finally:
+        _ct_cache = previous
+
+
+async def fetch_crtsh(
+    domain: str,
+    http_timeout: float = 8.0,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Tuple[List[str], Optional[int]]:
+    """Names under ``domain`` seen in CT logs, plus the highest crt.sh entry ID (None on failure).
+
+    The response is parsed as it streams in and names are deduplicated on the fly, so
+    memory follows the number of distinct names rather than the response size. With a
+    CT cache configured, a fresh entry is returned without a request and a stale one is
+    refreshed by merging only entries above its high-water mark; if crt.sh fails, the
+    cached names are returned. The ID is a high-water mark: if it has not moved, no new
+    certificates were logged.
+    """
+    domain = domain.lower()
+    cache = get_ct_cache()
+    cached = cache.load(domain) if cache is not None else None
+    if cached is not None and cache.is_fresh(cached):
+        return sorted(cached.names), cached.max_id
+
+    min_id = cached.max_id if cached is not None else 0
+    names: Set[str] = set(cached.names) if cached is not None else set()
+    high_water = min_id
+    fetched_at = time.time()
+    try:
+        async with borrow_client(client, timeout=http_timeout) as c:
+            async with c.stream("GET", CRTSH_URL.format(domain=domain), timeout=http_timeout) as r:
+                if r.status_code != 200:
+                    raise httpx.HTTPStatusError(f"crt.sh returned {r.status_code}", request=r.request, response=r)
+                async for entry in iter_json_array(r.aiter_text()):
+                    entry_id = int(entry.get("id") or 0) if isinstance(entry, dict) else 0
+                    if entry_id and entry_id <= min_id:
+                        continue  # merged on an earlier refresh
+                    high_water = max(high_water, entry_id)
+                    names.update(_names(entry, domain))
+    except Exception:  # noqa: BLE001
+        if cached is not None:
+            return sorted(cached.names), cached.max_id
+        return [], None
+
+    if cache is not None:
+        cache.store(domain, CTCacheEntry(fetched_at=fetched_at, max_id=high_water, names=names))
+    return sorted(names), high_water
@@ -1,29 +1,42 @@
 from __future__ import annotations
 
-from typing import List
+import asyncio
+from typing import List, Optional
 
-import dns.resolver
-import dns.query
+import dns.asyncquery
 import dns.zone
 
 from sentinelscope.models import DNSAxfrCheck
+from sentinelscope.utils.dns import resolve, resolve_many, run_sync
 
 
-def check_dns_axfr(domain: str, timeout: float = 3.0) -> DNSAxfrCheck:
-    attempted: List[str] = []
-    allowed: List[str] = []
-    try:
-        answers = dns.resolver.resolve(domain, 'NS', lifetime=timeout)
-        ns_list = [rdata.to_text().strip('.') for rdata in answers]
-    except Exception:
-        ns_list = []
-    for ns in ns_list:
-        attempted.append(ns)
+async def _try_axfr(ns: str, domain: str, timeout: float) -> bool:
+    # Zone transfers need an address, not a nameserver hostname
+    answers = await resolve_many([(ns, 'A'), (ns, 'AAAA')], timeout=timeout)
+    addresses = [rdata.to_text() for rdatas in answers.values() for rdata in rdatas]
+    for address in addresses:
         try:
-            z = dns.zone.from_xfr(dns.query.xfr(ns, domain, timeout=timeout))
-            if z is not None:
-                allowed.append(ns)
-        except Exception:
+            zone = dns.zone.Zone(domain)
+            await dns.asyncquery.inbound_xfr(address, zone, timeout=timeout, lifetime=timeout)
+            if zone.nodes:
+                return True
+        except Exception:  # noqa: BLE001
             continue
-    return DNSAxfrCheck(domain=domain, attempted_ns=attempted, axfr_allowed_on=allowed)
+    return False
+
+
+async def check_dns_axfr_async(
+    domain: str, timeout: float = 3.0, nameservers: Optional[List[str]] = None
+) -> DNSAxfrCheck:
+    if nameservers is None:
+        nameservers = [rdata.to_text().strip('.') for rdata in await resolve(domain, 'NS', timeout=timeout)]
+    allowed = await asyncio.gather(*(_try_axfr(ns, domain, timeout) for ns in nameservers))
+    return DNSAxfrCheck(
+        domain=domain,
+        attempted_ns=list(nameservers),
+        axfr_allowed_on=[ns for ns, ok in zip(nameservers, allowed) if ok],
+    )
 
+
+def check_dns_axfr(domain: str, timeout: float = 3.0) -> DNSAxfrCheck:
+    return run_sync(check_dns_axfr_async(domain, timeout=timeout))
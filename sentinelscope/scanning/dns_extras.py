@@ -1,35 +1,39 @@
 from __future__ import annotations
 
-from typing import List
-
-import dns.resolver
+from typing import Any, Dict, List
 
 from sentinelscope.models import DNSExtras
+from sentinelscope.utils.dns import DEFAULT_TIMEOUT, Query, resolve, resolve_many, run_sync
+
+
+def extras_queries(domain: str) -> List[Query]:
+    return [(domain, "DNSKEY"), (domain, "CAA")]
 
 
 def query_txt(name: str) -> List[str]:
-    try:
-        return [rdata.to_text().strip('"') for rdata in dns.resolver.resolve(name, 'TXT')]
-    except Exception:
-        return []
+    return [rdata.to_text().strip('"') for rdata in run_sync(resolve(name, 'TXT'))]
 
 
 def query_caa(domain: str) -> List[str]:
-    try:
-        return [rdata.to_text() for rdata in dns.resolver.resolve(domain, 'CAA')]
-    except Exception:
-        return []
+    return [rdata.to_text() for rdata in run_sync(resolve(domain, 'CAA'))]
 
 
 def check_dnssec(domain: str) -> bool:
     # Heuristic: presence of DNSKEY records indicates DNSSEC configured
-    try:
-        list(dns.resolver.resolve(domain, 'DNSKEY'))
-        return True
-    except Exception:
-        return False
+    return bool(run_sync(resolve(domain, 'DNSKEY')))
+
+
+def build_dns_extras(domain: str, answers: Dict[Query, List[Any]]) -> DNSExtras:
+    return DNSExtras(
+        domain=domain,
+        dnssec_present=bool(answers.get((domain, 'DNSKEY'))),
+        caa_records=[rdata.to_text() for rdata in answers.get((domain, 'CAA'), [])],
+    )
+
 
+async def gather_dns_extras_async(domain: str, timeout: float = DEFAULT_TIMEOUT) -> DNSExtras:
+    return build_dns_extras(domain, await resolve_many(extras_queries(domain), timeout=timeout))
 
-def gather_dns_extras(domain: str) -> DNSExtras:
-    return DNSExtras(domain=domain, dnssec_present=check_dnssec(domain), caa_records=query_caa(domain))
 
+def gather_dns_extras(domain: str, timeout: float = DEFAULT_TIMEOUT) -> DNSExtras:
+    return run_sync(gather_dns_extras_async(domain, timeout=timeout))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sentinelscope.models import DNSAssessment, DNSAxfrCheck, DNSExtras
+from sentinelscope.scanning.dns_axfr import check_dns_axfr_async
+from sentinelscope.scanning.dns_extras import build_dns_extras, extras_queries
+from sentinelscope.scanning.dns_records import build_dns_assessment, dns_queries
+from sentinelscope.utils.dns import DEFAULT_TIMEOUT, Query, get_dns_cache, resolve_many
+
+
+class DNSPosture(NamedTuple):
+    records: Optional[DNSAssessment]
+    extras: Optional[DNSExtras]
+    axfr: Optional[DNSAxfrCheck]
+    # "ns1,ns2|serial": AXFR only needs repeating when the servers or the zone change
+    zone: Optional[str] = None
+    # Earliest TTL expiry of the answers; until then a rescan would see the same records
+    fresh_until: Optional[datetime] = None
+
+
+def zone_validator(domain: str, answers: Dict[Query, List[Any]]) -> Optional[str]:
+    nameservers = sorted(rdata.to_text().strip(".").lower() for rdata in answers.get((domain, "NS"), []))
+    soa = answers.get((domain, "SOA"), [])
+    if not nameservers or not soa:
+        return None
+    return f"{','.join(nameservers)}|{soa[0].serial}"
+
+
+def _fresh_until(queries: List[Query]) -> Optional[datetime]:
+    cache = get_dns_cache()
+    expiries = [cache.expires_at(name, rdtype) for name, rdtype in queries]
+    if not expiries or None in expiries:
+        return None  # something timed out or was not cacheable
+    return datetime.fromtimestamp(min(expiries), timezone.utc).replace(tzinfo=None)
+
+
+async def dns_posture(
+    domain: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    *,
+    records: bool = True,
+    extras: bool = True,
+    axfr: bool = True,
+    axfr_timeout: float = 3.0,
+    known_zone: Optional[str] = None,
+) -> DNSPosture:
+    """Run the DNS, DNSSEC/CAA and AXFR checks from one concurrent batch of queries.
+
+    A/AAAA/MX/TXT/_dmarc/DNSKEY/CAA/NS/SOA all go out together; only the AXFR attempts
+    (which need the NS answer) follow in a second round. They are skipped (``axfr`` is
+    None) when the zone validator still equals ``known_zone``.
+    """
+    queries: List[Query] = []
+    if records:
+        queries += dns_queries(domain)
+    if extras:
+        queries += extras_queries(domain)
+    if axfr:
+        queries += [(domain, "NS"), (domain, "SOA")]
+    answers = await resolve_many(queries, timeout=timeout)
+
+    assessment = build_dns_assessment(domain, answers) if records else None
+    extras_res = build_dns_extras(domain, answers) if extras else None
+    zone = zone_validator(domain, answers) if axfr else None
+    axfr_res = None
+    if axfr and (zone is None or zone != known_zone):
+        nameservers = [rdata.to_text().strip(".") for rdata in answers.get((domain, "NS"), [])]
+        axfr_res = await check_dns_axfr_async(domain, timeout=axfr_timeout, nameservers=nameservers)
+    return DNSPosture(assessment, extras_res, axfr_res, zone, _fresh_until(list(answers)))
@@ -1,32 +1,36 @@
 from __future__ import annotations
 
-from typing import List
-
-import dns.resolver
+from typing import Any, Dict, List
 
 from sentinelscope.models import DNSAssessment
+from sentinelscope.utils.dns import DEFAULT_TIMEOUT, Query, resolve_many, run_sync
+
+
+def dns_queries(domain: str) -> List[Query]:
+    return [
+        (domain, "A"),
+        (domain, "AAAA"),
+        (domain, "MX"),
+        (domain, "TXT"),
+        (f"_dmarc.{domain}", "TXT"),
+    ]
 
 
-def _txt_values(domain: str) -> List[str]:
-    try:
-        return [b"".join(rdata.strings).decode("utf-8", errors="ignore") for rdata in dns.resolver.resolve(domain, "TXT")]
-    except Exception:
-        return []
+def _txt_values(rdatas: List[Any]) -> List[str]:
+    return [b"".join(rdata.strings).decode("utf-8", errors="ignore") for rdata in rdatas]
 
 
-def _records(domain: str, rtype: str) -> List[str]:
-    try:
-        answers = dns.resolver.resolve(domain, rtype)
-        return [rdata.to_text() for rdata in answers]
-    except Exception:
-        return []
+def _records(rdatas: List[Any]) -> List[str]:
+    return [rdata.to_text() for rdata in rdatas]
 
 
-def assess_dns(domain: str) -> DNSAssessment:
-    a_records = _records(domain, "A")
-    aaaa_records = _records(domain, "AAAA")
-    mx_records = _records(domain, "MX")
-    txt_records = _txt_values(domain)
+def build_dns_assessment(domain: str, answers: Dict[Query, List[Any]]) -> DNSAssessment:
+    a_records = _records(answers.get((domain, "A"), []))
+    aaaa_records = _records(answers.get((domain, "AAAA"), []))
+    mx_records = _records(answers.get((domain, "MX"), []))
+    txt_records = _txt_values(answers.get((domain, "TXT"), []))
+    # DMARC policy lives at _dmarc.<domain>; keep apex TXT as a fallback for odd setups
+    dmarc_records = _txt_values(answers.get((f"_dmarc.{domain}", "TXT"), [])) + txt_records
 
     spf_present = any(v.lower().startswith("v=spf1") for v in txt_records)
     spf_policy = None
@@ -40,11 +44,11 @@ def assess_dns(domain: str) -> DNSAssessment:
         if spf_policy in {"?all", "+all", None}:
             spf_recommendation = "Tighten SPF policy to -all or ~all"
 
-    dmarc_present = any(v.lower().startswith("v=dmarc1") for v in txt_records)
+    dmarc_present = any(v.lower().startswith("v=dmarc1") for v in dmarc_records)
     dmarc_policy = None
     dmarc_recommendation = None
     if dmarc_present:
-        dmarc = next(v for v in txt_records if v.lower().startswith("v=dmarc1"))
+        dmarc = next(v for v in dmarc_records if v.lower().startswith("v=dmarc1"))
         # parse p=reject|quarantine|none
         for tok in dmarc.split(";"):
             tok = tok.strip().lower()
@@ -67,3 +71,11 @@ def assess_dns(domain: str) -> DNSAssessment:
         dmarc_recommendation=dmarc_recommendation,
     )
 
+
+async def assess_dns_async(domain: str, timeout: float = DEFAULT_TIMEOUT) -> DNSAssessment:
+    answers = await resolve_many(dns_queries(domain), timeout=timeout)
+    return build_dns_assessment(domain, answers)
+
+
+def assess_dns(domain: str, timeout: float = DEFAULT_TIMEOUT) -> DNSAssessment:
+    return run_sync(assess_dns_async(domain, timeout=timeout))
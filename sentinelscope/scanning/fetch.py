@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from sentinelscope.scanning.body import BodyPipeline
+from sentinelscope.utils.http import borrow_client
+
+
+# Upper bound on body bytes kept per snapshot; analyzers only ever look at a prefix
+DEFAULT_MAX_BODY_BYTES = 1_048_576
+
+
+@dataclass
+class PageSnapshot:
+    """A single GET of a URL, shared by every analyzer that only needs to read it."""
+
+    url: str
+    final_url: str
+    status_code: Optional[int] = None
+    headers: httpx.Headers = field(default_factory=httpx.Headers)
+    redirects: List[str] = field(default_factory=list)
+    body: bytes = b""
+    truncated: bool = False
+    peer_cert_sha256: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def is_https(self) -> bool:
+        return self.final_url.lower().startswith("https://")
+
+    @property
+    def charset(self) -> str:
+        return _charset(self.headers)
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.body.decode(self.charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+async def fetch_page(
+    url: str,
+    timeout: float = 6.0,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    client: Optional[httpx.AsyncClient] = None,
+    headers: Optional[Dict[str, str]] = None,
+    pipeline: Optional[BodyPipeline] = None,
+) -> PageSnapshot:
+    """GET ``url`` once, following redirects, and keep at most ``max_body_bytes`` of the body.
+
+    ``headers`` are sent with the request (e.g. ``If-None-Match`` for a conditional GET).
+    A ``pipeline`` is fed each chunk as it arrives, independently of what is kept, and
+    reading stops as soon as neither needs more.
+    Never raises: network errors are reported through ``PageSnapshot.error`` so callers
+    can fall back to their neutral result.
+    """
+    try:
+        async with borrow_client(client, timeout=timeout) as c:
+            async with c.stream("GET", url, headers=headers, timeout=timeout, follow_redirects=True) as resp:
+                chunks: List[bytes] = []
+                size = 0
+                truncated = False
+                keeping = max_body_bytes > 0
+                if pipeline is not None:
+                    pipeline.set_charset(_charset(resp.headers))
+                if keeping or pipeline is not None:
+                    async for chunk in resp.aiter_bytes():
+                        if keeping:
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if size >= max_body_bytes:
+                                truncated = True
+                                keeping = False
+                        if pipeline is not None:
+                            pipeline.feed(chunk)
+                        if not keeping and (pipeline is None or pipeline.done):
+                            break
+                if pipeline is not None:
+                    pipeline.close()
+                body = b"".join(chunks)[:max_body_bytes] if max_body_bytes > 0 else b""
+                return PageSnapshot(
+                    url=url,
+                    final_url=str(resp.url),
+                    status_code=resp.status_code,
+                    headers=resp.headers,
+                    redirects=[str(r.url) for r in resp.history],
+                    body=body,
+                    truncated=truncated,
+                    peer_cert_sha256=_peer_cert_sha256(resp),
+                )
+    except Exception as e:  # noqa: BLE001
+        return PageSnapshot(url=url, final_url=url, error=str(e) or e.__class__.__name__)
+
+
+def _charset(headers: httpx.Headers) -> str:
+    content_type = headers.get("content-type", "")
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "charset" and value:
+            return value.strip('"\' ')
+    return "utf-8"
+
+
+def _peer_cert_sha256(resp: httpx.Response) -> Optional[str]:
+    # The TLS connection is still open while streaming; its leaf certificate comes for free
+    try:
+        ssl_object = resp.extensions["network_stream"].get_extra_info("ssl_object")
+        der = ssl_object.getpeercert(binary_form=True) if ssl_object is not None else None
+        return hashlib.sha256(der).hexdigest() if der else None
+    except Exception:  # noqa: BLE001
+        return None
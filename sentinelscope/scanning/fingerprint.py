@@ -5,28 +5,30 @@ from typing import List, Optional
 import httpx
 
 from sentinelscope.models import WebFingerprint
-
-
-WAF_SIGNS = {
-    'cloudflare': ['cloudflare', '__cf_bm', 'cf-ray'],
-    'akamai': ['akamai', 'aka-cache', 'akamai-ghost'],
-    'fastly': ['fastly', 'x-served-by'],
-}
-
-
-async def fingerprint_web(url: str, timeout: float = 6.0) -> WebFingerprint:
-    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-        resp = await client.get(url)
-    server = resp.headers.get('server')
-    waf: Optional[str] = None
-    header_blob = ' '.join(f"{k}:{v}" for k, v in resp.headers.items()).lower()
-    for vendor, tokens in WAF_SIGNS.items():
-        if any(t in header_blob for t in tokens):
-            waf = vendor
-            break
+from sentinelscope.scanning.fetch import PageSnapshot, fetch_page
+from sentinelscope.signatures.engine import load_pack
+
+
+async def fingerprint_web(
+    url: str,
+    timeout: float = 6.0,
+    page: Optional[PageSnapshot] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> WebFingerprint:
+    if page is None:
+        page = await fetch_page(url, timeout=timeout, max_body_bytes=0, client=client)
+    if not page.ok:
+        return WebFingerprint(url=url)
+    headers = page.headers
+    server = headers.get('server')
+    waf = load_pack('waf').first(headers=headers)
     techs: List[str] = []
-    if 'x-powered-by' in resp.headers:
-        techs.append(resp.headers.get('x-powered-by'))
+    if 'x-powered-by' in headers:
+        techs.append(headers.get('x-powered-by'))
+    # The body is only there when the page was shared with the other analyzers
+    for name in load_pack('tech').match(headers=headers, body=page.text):
+        if not any(t.lower() == name.lower() for t in techs):
+            techs.append(name)
     # Use the final effective URL to reflect redirects and scheme changes
-    return WebFingerprint(url=str(resp.url), server=server, waf_or_cdn=waf, technologies=techs)
+    return WebFingerprint(url=page.final_url, server=server, waf_or_cdn=waf, technologies=techs)
 
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import httpx
 
 from sentinelscope.models import HeaderFinding, SecurityHeadersAssessment
+from sentinelscope.scanning.fetch import PageSnapshot, fetch_page
 
 
 SECURITY_HEADERS = {
@@ -162,15 +163,20 @@ def _grade_from_findings(findings: List[HeaderFinding]) -> tuple[str, int]:
     return "F", raw_score
 
 
-async def analyze_security_headers(url: str, timeout: float = 5.0) -> SecurityHeadersAssessment:
+async def analyze_security_headers(
+    url: str,
+    timeout: float = 5.0,
+    page: Optional[PageSnapshot] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> SecurityHeadersAssessment:
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-            resp = await client.get(url)
-        effective_url = str(resp.url)
-        is_https = effective_url.lower().startswith("https://")
-        findings = evaluate_security_headers(dict(resp.headers), is_https=is_https)
+        if page is None:
+            page = await fetch_page(url, timeout=timeout, max_body_bytes=0, client=client)
+        if not page.ok:
+            raise RuntimeError(page.error)
+        findings = evaluate_security_headers(dict(page.headers), is_https=page.is_https)
         grade, score = _grade_from_findings(findings)
-        return SecurityHeadersAssessment(url=effective_url, findings=findings, grade=grade, score=score)
+        return SecurityHeadersAssessment(url=page.final_url, findings=findings, grade=grade, score=score)
     except Exception:
         # Network/HTTP errors should not crash the scan; return neutral result
         return SecurityHeadersAssessment(url=url, findings=[], grade="N/A", score=0)
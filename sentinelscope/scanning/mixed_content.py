@@ -1,23 +1,31 @@
 from __future__ import annotations
 
-import re
+from typing import Optional
 
 import httpx
 
 from sentinelscope.models import MixedContentReport
+from sentinelscope.scanning.body import BodyPipeline, InsecureReferenceCounter, analyze_body
+from sentinelscope.scanning.fetch import DEFAULT_MAX_BODY_BYTES, PageSnapshot, fetch_page
 
 
-INSECURE_RE = re.compile(r"http://[^\s'\"]+", re.IGNORECASE)
-
-
-async def check_mixed_content(url: str, timeout: float = 6.0) -> MixedContentReport:
+async def check_mixed_content(
+    url: str,
+    timeout: float = 6.0,
+    page: Optional[PageSnapshot] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+) -> MixedContentReport:
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-            resp = await client.get(url)
-        text = resp.text or ""
-        matches = INSECURE_RE.findall(text)
-        examples = list(dict.fromkeys(matches))[:10]
-        return MixedContentReport(url=url, insecure_reference_count=len(matches), examples=examples)
+        counter = InsecureReferenceCounter()
+        if page is None:
+            # Counted as the body streams in; nothing beyond the current chunk is kept
+            pipeline = BodyPipeline([counter], max_bytes=max_body_bytes)
+            page = await fetch_page(url, timeout=timeout, max_body_bytes=0, client=client, pipeline=pipeline)
+        else:
+            analyze_body(page.body, [counter], charset=page.charset, max_bytes=max_body_bytes)
+        if not page.ok:
+            raise RuntimeError(page.error)
+        return MixedContentReport(url=url, insecure_reference_count=counter.count, examples=counter.examples)
     except Exception:
         return MixedContentReport(url=url, insecure_reference_count=0, examples=[])
-
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Iterable, List
+import socket
+from typing import Dict, Iterable, List, Tuple
 
-from sentinelscope.models import PortResult, PortScanResult
-from sentinelscope.native import scan_ports_native_available, scan_ports_native
+from sentinelscope.models import PortScanResult
+from sentinelscope.scanning.connect import ConnectScanner, supported
+from sentinelscope.scanning.porttable import PortTable
+from sentinelscope.native import scan_many_native_async, scan_ports_native_available
+from sentinelscope.utils.dns import resolve_host
 
 
 TOP_30_PORTS = [
@@ -13,6 +17,14 @@ TOP_30_PORTS = [
     8443, 8000, 6379, 27017, 5432, 1521, 5000, 11211, 9200, 25565,
 ]
 
+# Basic extension of common ports
+TOP_100_PORTS = sorted(set(TOP_30_PORTS + [
+    19, 37, 49, 88, 161, 162, 389, 636, 873, 1025,
+    1433, 1521, 2049, 2082, 2083, 2086, 2087, 2483, 2484, 3268,
+    3269, 4444, 5000, 5001, 5060, 5222, 5900, 5985, 5986, 8081,
+    9000, 9090, 9200, 9300, 11211, 27017, 27018, 27019, 6379, 6380,
+]))
+
 
 async def _try_connect(host: str, port: int, timeout: float = 1.0) -> bool:
     try:
@@ -24,26 +36,107 @@ async def _try_connect(host: str, port: int, timeout: float = 1.0) -> bool:
         return False
 
 
-async def scan_ports(host: str, ports: Iterable[int], concurrency: int = 200, timeout: float = 1.0) -> PortScanResult:
-    ports_list: List[int] = sorted(set(int(p) for p in ports))
-    # Fast path via native Rust extension if available
-    if scan_ports_native_available():
-        try:
-            pairs = scan_ports_native(host, ports_list, int(timeout * 1000), concurrency)
-            results = [PortResult(port=int(p), is_open=bool(o)) for p, o in pairs]
-            open_ports = [r.port for r in results if r.is_open]
-            return PortScanResult(host=host, ports_scanned=ports_list, open_ports=open_ports, results=results)
-        except Exception:
-            pass
-
+async def _scan_streams(table: PortTable, targets: List[Tuple[str, List[int]]], concurrency: int, timeout: float) -> None:
+    # Event loops without raw socket callbacks (Windows' Proactor)
     semaphore = asyncio.Semaphore(concurrency)
 
-    async def scan_one(p: int) -> PortResult:
+    async def scan_one(target: str, p: int) -> None:
         async with semaphore:
-            is_open = await _try_connect(host, p, timeout=timeout)
-            return PortResult(port=p, is_open=is_open)
+            if await _try_connect(target, p, timeout=timeout):
+                table.mark_open(target, p)
+
+    await asyncio.gather(*(scan_one(t, p) for t, pl in targets for p in pl))
+
+
+async def _scan_python(
+    table: PortTable, targets: List[Tuple[str, List[int]]], concurrency: int, timeout: float, adaptive: bool = True
+) -> None:
+    if not supported():
+        return await _scan_streams(table, targets, concurrency, timeout)
+    scanner = ConnectScanner(concurrency=concurrency, timeout=timeout, adaptive=adaptive, on_result=table.record, collect=False)
+    await scanner.run((t, p) for t, pl in targets for p in pl)
+
+
+async def _native(table: PortTable, targets: List[Tuple[str, List[int]]], concurrency: int, timeout: float) -> bool:
+    # Runs on the extension's runtime; the event loop keeps serving other work meanwhile
+    if not scan_ports_native_available():
+        return False
+    try:
+        results = await scan_many_native_async(targets, int(timeout * 1000), concurrency)
+    except Exception:  # noqa: BLE001
+        return False
+    if len(results) != len(targets):
+        return False
+    for (address, _), (_, open_ports) in zip(targets, results):
+        table.extend(address, open_ports)
+    return True
+
+
+async def _scan(table: PortTable, targets: List[Tuple[str, List[int]]], concurrency: int, timeout: float, adaptive: bool) -> None:
+    # Fast path via native Rust extension if available
+    if not await _native(table, targets, concurrency, timeout):
+        await _scan_python(table, targets, concurrency, timeout, adaptive)
+
+
+async def _targets(host: str) -> List[str]:
+    # Resolve once through the shared cache instead of once per probe
+    addresses = await resolve_host(host)
+    if addresses:
+        return addresses
+    try:
+        # The system resolver still knows /etc/hosts and friends
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos)) or [host]
+    except OSError:
+        return [host]
+
+
+async def _scan_addresses(
+    table: PortTable, candidates: List[List[str]], port_lists: List[List[int]], concurrency: int, timeout: float, adaptive: bool
+) -> List[str]:
+    """Scan each host at its first address; a host with nothing open moves on to its next one.
+
+    Like ``create_connection`` trying every record, a dead first address (or an AAAA-only
+    host behind an unreachable A record) does not hide the others. Returns the address
+    each host was last scanned at.
+    """
+    chosen = [addresses[0] for addresses in candidates]
+    pending = list(range(len(candidates)))
+    attempt = 0
+    while pending:
+        for i in pending:
+            chosen[i] = candidates[i][attempt]
+        await _scan(table, [(chosen[i], port_lists[i]) for i in pending], concurrency, timeout, adaptive)
+        attempt += 1
+        pending = [i for i in pending if attempt < len(candidates[i]) and not table.open_ports(chosen[i])]
+    return chosen
+
+
+async def scan_ports(
+    host: str, ports: Iterable[int], concurrency: int = 200, timeout: float = 1.0, adaptive: bool = True
+) -> PortScanResult:
+    """Connect-scan ``ports`` on ``host``.
+
+    Without the native extension and with ``adaptive``, ``timeout`` and ``concurrency``
+    are upper bounds: the timeout tracks the host's measured RTT and concurrency backs
+    off when timeouts spike (see :class:`~sentinelscope.scanning.connect.ConnectScanner`).
+    """
+    ports_list: List[int] = sorted(set(int(p) for p in ports))
+    table = PortTable()
+    (target,) = await _scan_addresses(table, [await _targets(host)], [ports_list], concurrency, timeout, adaptive)
+    return table.result(host, target, ports_list)
+
 
-    results = await asyncio.gather(*(scan_one(p) for p in ports_list))
-    open_ports = [r.port for r in results if r.is_open]
-    return PortScanResult(host=host, ports_scanned=ports_list, open_ports=open_ports, results=results)
+async def scan_ports_many(
+    targets: Dict[str, Iterable[int]], concurrency: int = 500, timeout: float = 1.0, adaptive: bool = True
+) -> List[PortScanResult]:
+    """Scan several hosts at once with one shared budget of ``concurrency`` connects.
 
+    Results are returned in the order of ``targets``.
+    """
+    hosts = list(targets)
+    port_lists = [sorted(set(int(p) for p in targets[h])) for h in hosts]
+    candidates = await asyncio.gather(*(_targets(h) for h in hosts))
+    table = PortTable()
+    resolved = await _scan_addresses(table, list(candidates), port_lists, concurrency, timeout, adaptive)
+    return [table.result(h, address, pl) for h, address, pl in zip(hosts, resolved, port_lists)]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+from sentinelscope.models import PortScanResult
+
+
+def _contains(sorted_ports: List[int], port: int) -> bool:
+    i = bisect_left(sorted_ports, port)
+    return i < len(sorted_ports) and sorted_ports[i] == port
+
+
+class PortTable:
+    """Open ports per address, written by the scanners as probes complete.
+
+    Only open ports are stored, as an ``array('H')`` per address, so a 65,535-port scan
+    of a mostly closed host costs a few bytes instead of one object per port. The
+    pydantic :class:`PortScanResult` is built on request, without re-validation, and
+    its per-port ``results`` view only when it is serialised.
+    """
+
+    def __init__(self) -> None:
+        self._open: Dict[str, array] = {}
+
+    def record(self, target: Tuple[str, int], is_open: bool) -> None:
+        """``ConnectScanner`` ``on_result`` callback."""
+        if is_open:
+            self.mark_open(target[0], target[1])
+
+    def mark_open(self, address: str, port: int) -> None:
+        ports = self._open.get(address)
+        if ports is None:
+            ports = self._open[address] = array("H")
+        ports.append(port)
+
+    def extend(self, address: str, ports: Iterable[int]) -> None:
+        self._open.setdefault(address, array("H")).extend(ports)
+
+    def open_ports(self, address: str) -> List[int]:
+        return sorted(set(self._open.get(address, ())))
+
+    def forget(self, address: str) -> None:
+        self._open.pop(address, None)
+
+    def result(self, host: str, address: str, ports_scanned: List[int]) -> PortScanResult:
+        """Result for ``host`` (scanned at ``address``); ``ports_scanned`` must be sorted.
+
+        The same ``ports_scanned`` list may be passed for every host: results share it.
+        """
+        open_ports = [p for p in self.open_ports(address) if _contains(ports_scanned, p)]
+        # Everything here is already typed and sorted; skip validating one int per port
+        return PortScanResult.model_construct(host=host, ports_scanned=ports_scanned, open_ports=open_ports)
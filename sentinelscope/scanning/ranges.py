@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import ipaddress
+from dataclasses import dataclass
+from itertools import islice
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sentinelscope.models import PortScanResult
+from sentinelscope.scanning.connect import ConnectScanner
+from sentinelscope.scanning.porttable import PortTable
+
+
+# Unprivileged "ping": an open or refused connect on any of these means the host is up
+DEFAULT_DISCOVERY_PORTS = (80, 443, 22, 3389)
+# Addresses handled per round: discovery, then a port scan of the live ones
+DEFAULT_CHUNK_SIZE = 256
+
+
+@dataclass
+class RangeScanStats:
+    addresses: int = 0
+    live: int = 0
+    open_ports: int = 0
+
+
+def _bounds(spec: str) -> Tuple[int, int, int]:
+    # (first, last, version) as integers, so nothing is materialised per address
+    if "/" in spec:
+        network = ipaddress.ip_network(spec, strict=False)
+        first, last = int(network.network_address), int(network.broadcast_address)
+        if network.num_addresses > 2:
+            # Same hosts as network.hosts(): no network address, no IPv4 broadcast
+            first += 1
+            last -= 1 if network.version == 4 else 0
+        return first, last, network.version
+    if "-" in spec:
+        start_text, _, end_text = (part.strip() for part in spec.partition("-"))
+        start = ipaddress.ip_address(start_text)
+        if end_text.isdigit() and start.version == 4:
+            # 10.0.0.1-50: the end replaces the last octet
+            end_text = start_text.rsplit(".", 1)[0] + "." + end_text
+        end = ipaddress.ip_address(end_text)
+        if end.version != start.version or int(end) < int(start):
+            raise ValueError(f"Invalid address range: {spec!r}")
+        return int(start), int(end), start.version
+    address = ipaddress.ip_address(spec)
+    return int(address), int(address), address.version
+
+
+def iter_addresses(specs: Iterable[str]) -> Iterator[str]:
+    """Expand CIDR blocks (``10.0.0.0/16``), ranges (``10.0.0.1-10.0.0.50`` or ``10.0.0.1-50``)
+    and single addresses, lazily and in order. Raises ``ValueError`` on a malformed spec."""
+    for spec in specs:
+        first, last, version = _bounds(spec.strip())
+        factory = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+        for value in range(first, last + 1):
+            yield str(factory(value))
+
+
+async def scan_ranges(
+    specs: Iterable[str],
+    ports: Iterable[int],
+    *,
+    concurrency: int = 500,
+    timeout: float = 1.0,
+    adaptive: bool = True,
+    discover: bool = True,
+    discovery_ports: Iterable[int] = DEFAULT_DISCOVERY_PORTS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    stats: Optional[RangeScanStats] = None,
+) -> AsyncIterator[PortScanResult]:
+    """Port-scan every live host in ``specs`` and yield one result per host as it completes.
+
+    Addresses are taken ``chunk_size`` at a time: a discovery pass connects to a few
+    common ports (any answer, even a refusal, marks the host live), then the live hosts
+    are scanned with probes interleaved across hosts, port by port, so no single target
+    sees a burst. Only open ports are kept (see :class:`PortTable`), so memory depends on
+    ``chunk_size`` and what is found, not on the size of the range or the port list.
+    With ``discover=False`` every address is scanned.
+    """
+    ports_list: List[int] = sorted(set(int(p) for p in ports))
+    probes = sorted(set(int(p) for p in discovery_ports))
+    # Discovery already probed these on every address of the chunk
+    remaining = [p for p in ports_list if p not in probes] if discover else ports_list
+    stats = stats if stats is not None else RangeScanStats()
+    live: Set[str] = set()
+    table = PortTable()
+    scanner = ConnectScanner(
+        concurrency=concurrency, timeout=timeout, adaptive=adaptive,
+        on_result=table.record, on_answer=lambda target: live.add(target[0]), collect=False,
+    )
+    addresses = iter_addresses(specs)
+    while True:
+        chunk = list(islice(addresses, chunk_size))
+        if not chunk:
+            return
+        stats.addresses += len(chunk)
+        live.clear()
+        if discover:
+            await scanner.run((a, p) for p in probes for a in chunk)
+            hosts = [a for a in chunk if a in live]
+        else:
+            hosts = chunk
+        stats.live += len(hosts)
+        if hosts:
+            await scanner.run((a, p) for p in remaining for a in hosts)
+            for host in hosts:
+                result = table.result(host, host, ports_list)
+                stats.open_ports += len(result.open_ports)
+                yield result
+        for host in chunk:
+            scanner.forget(host)
+            table.forget(host)
@@ -5,9 +5,10 @@ from typing import List, Optional
 import httpx
 
 from sentinelscope.models import SecurityTxt
+from sentinelscope.utils.http import borrow_client
 
 
-async def fetch_security_txt(domain: str, timeout: float = 5.0) -> SecurityTxt:
+async def fetch_security_txt(domain: str, timeout: float = 5.0, client: Optional[httpx.AsyncClient] = None) -> SecurityTxt:
     # Always try HTTPS first, then HTTP for compatibility
     urls = [
         f"https://{domain}/.well-known/security.txt",
@@ -16,16 +17,16 @@ async def fetch_security_txt(domain: str, timeout: float = 5.0) -> SecurityTxt:
         f"http://{domain}/security.txt",
     ]
     text: Optional[str] = None
-    for u in urls:
-        try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-                r = await client.get(u)
+    async with borrow_client(client, timeout=timeout) as c:
+        for u in urls:
+            try:
+                r = await c.get(u, timeout=timeout, follow_redirects=True)
                 if r.status_code == 200 and r.text:
                     text = r.text
                     url = u
                     break
-        except Exception:
-            continue
+            except Exception:
+                continue
     if text is None:
         return SecurityTxt(url=urls[0], found=False)
     contacts: List[str] = []
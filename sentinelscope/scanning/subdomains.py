@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from typing import List, Set, Dict
+from pathlib import Path
+from typing import List, Optional, Set, Dict
 
-import dns.asyncresolver
 import httpx
 
 from sentinelscope.models import SubdomainsResult
+from sentinelscope.scanning.bruteforce import DEFAULT_QPS, brute_force_subdomains, iter_wordlist
+from sentinelscope.scanning.ct import fetch_crtsh
+from sentinelscope.utils.dns import resolve
 
 
 WORDLIST = [
@@ -16,33 +18,12 @@ WORDLIST = [
 
 
 async def _resolve(hostname: str, timeout: float = 2.0) -> bool:
-    try:
-        resolver = dns.asyncresolver.Resolver()
-        resolver.lifetime = timeout
-        await resolver.resolve(hostname, "A")
-        return True
-    except Exception:  # noqa: BLE001
-        return False
-
-
-async def _from_crtsh(domain: str, http_timeout: float = 8.0) -> List[str]:
-    url = f"https://crt.sh/?q=%25.{domain}&output=json"
-    try:
-        async with httpx.AsyncClient(timeout=http_timeout) as client:
-            r = await client.get(url)
-            if r.status_code != 200:
-                return []
-            data = json.loads(r.text)
-            names: Set[str] = set()
-            for entry in data:
-                name_value: str = entry.get("name_value", "")
-                for n in name_value.split("\n"):
-                    n = n.strip().lower()
-                    if n.endswith(domain.lower()):
-                        names.add(n)
-            return sorted(names)
-    except Exception:
-        return []
+    return bool(await resolve(hostname, "A", timeout=timeout))
+
+
+async def _from_crtsh(domain: str, http_timeout: float = 8.0, client: Optional[httpx.AsyncClient] = None) -> List[str]:
+    names, _ = await fetch_crtsh(domain, http_timeout=http_timeout, client=client)
+    return names
 
 
 async def enumerate_subdomains(
@@ -50,15 +31,26 @@ async def enumerate_subdomains(
     concurrent_dns: int = 50,
     http_timeout: float = 8.0,
     dns_timeout: float = 2.0,
+    client: Optional[httpx.AsyncClient] = None,
+    ct_names: Optional[List[str]] = None,
+    wordlist: Optional[str | Path] = None,
+    bruteforce_qps: float = DEFAULT_QPS,
 ) -> SubdomainsResult:
     discovered: Set[str] = set()
     sources: Dict[str, int] = {}
 
-    # CT source
-    ct = await _from_crtsh(root_domain, http_timeout=http_timeout)
+    # CT source (``ct_names`` when the caller already fetched it)
+    ct = ct_names if ct_names is not None else await _from_crtsh(root_domain, http_timeout=http_timeout, client=client)
     discovered.update(ct)
     sources["crt.sh"] = len(ct)
 
+    if wordlist is not None:
+        # Large wordlists go through the UDP brute-force engine (lazy, rate-limited, wildcard-aware)
+        brute = await brute_force_subdomains(root_domain, iter_wordlist(wordlist), qps=bruteforce_qps, timeout=dns_timeout)
+        discovered.update(brute.found)
+        sources["dns-bruteforce"] = len(brute.found)
+        return SubdomainsResult(root_domain=root_domain, discovered=sorted(discovered), sources=sources)
+
     # wordlist DNS source
     candidates = [f"{w}.{root_domain}" for w in WORDLIST]
     semaphore = asyncio.Semaphore(concurrent_dns)
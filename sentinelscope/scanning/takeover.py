@@ -1,34 +1,119 @@
 from __future__ import annotations
 
-from typing import List
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
 
 import httpx
 
 from sentinelscope.models import TakeoverAssessment, TakeoverFinding
+from sentinelscope.scanning.fetch import fetch_page
+from sentinelscope.signatures.engine import load_pack
+from sentinelscope.utils.dns import resolve
+from sentinelscope.utils.http import borrow_client
 
 
-SIGNATURES = [
-    ("There isn't a GitHub Pages site here.", "GitHub Pages"),
-    ("NoSuchBucket", "AWS S3"),
-    ("The specified bucket does not exist", "AWS S3"),
-    ("NoSuchDomain", "Azure"),
-    ("Heroku | No such app", "Heroku"),
-    ("There's nothing here, yet.", "Fastly/Netlify"),
-]
+DEFAULT_MAX_HOSTS = 50_000
+DEFAULT_CONCURRENCY = 100
+DEFAULT_DNS_CONCURRENCY = 500
+# Every signature sits near the top of the provider's error page
+DEFAULT_MAX_BODY_BYTES = 8192
+# CNAME hops followed before giving up (resolvers stop around here too)
+MAX_CNAME_DEPTH = 8
 
 
-async def check_takeover_candidates(subdomains: List[str], timeout: float = 5.0) -> TakeoverAssessment:
+async def _for_each(items: Iterable[str], concurrency: int, fn: Callable[[str], Awaitable[None]]) -> None:
+    # A fixed pool of workers, so memory does not grow with the number of hosts
+    it = iter(items)
+
+    async def worker() -> None:
+        for item in it:
+            await fn(item)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def provider_for_cname(target: str) -> Optional[str]:
+    """The provider of the "takeover" signature pack whose ``cname`` suffixes cover ``target``."""
+    return load_pack("takeover").for_cname(target)
+
+
+async def _provider_cnames(subdomains: List[str], timeout: float, concurrency: int) -> Dict[str, str]:
+    matches: Dict[str, str] = {}
+
+    async def lookup(sub: str) -> None:
+        # Follow the chain (sub -> cdn.corp.net -> x.github.io): any hop may be the provider
+        name, seen = sub, {sub.lower().rstrip(".")}
+        for _ in range(MAX_CNAME_DEPTH):
+            rdatas = await resolve(name, "CNAME", timeout=timeout)
+            if not rdatas:
+                return
+            name = rdatas[0].to_text()
+            vendor = provider_for_cname(name)
+            if vendor:
+                matches[sub] = vendor
+                return
+            key = name.lower().rstrip(".")
+            if key in seen:
+                return
+            seen.add(key)
+
+    await _for_each(subdomains, concurrency, lookup)
+    return matches
+
+
+def _match_signature(body: str) -> Optional[str]:
+    return load_pack("takeover").first(body=body)
+
+
+async def _probe(sub: str, client: httpx.AsyncClient, timeout: float, max_body_bytes: int) -> Optional[str]:
+    # HTTP and HTTPS together; the first provider error page wins
+    pages = await asyncio.gather(*(
+        fetch_page(f"{scheme}://{sub}", timeout=timeout, max_body_bytes=max_body_bytes, client=client)
+        for scheme in ("http", "https")
+    ))
+    for page in pages:
+        if page.ok:
+            vendor = _match_signature(page.text)
+            if vendor:
+                return vendor
+    return None
+
+
+async def check_takeover_candidates(
+    subdomains: List[str],
+    timeout: float = 5.0,
+    client: Optional[httpx.AsyncClient] = None,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_hosts: int = DEFAULT_MAX_HOSTS,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    prefilter: bool = True,
+    dns_timeout: float = 2.0,
+) -> TakeoverAssessment:
+    """Sweep ``subdomains`` for provider error pages that suggest a dangling record.
+
+    With ``prefilter`` only hosts whose CNAME points at a known provider are fetched,
+    which keeps sweeps of tens of thousands of names to a handful of requests. Hosts are
+    probed ``concurrency`` at a time over HTTP and HTTPS, each within ``timeout`` seconds,
+    reading at most ``max_body_bytes`` of each body.
+    """
+    hosts = subdomains[:max_hosts]
+    if prefilter:
+        candidates = list(await _provider_cnames(hosts, dns_timeout, DEFAULT_DNS_CONCURRENCY))
+    else:
+        candidates = hosts
     flagged: List[TakeoverFinding] = []
-    async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-        for sub in subdomains[:200]:  # cap to avoid abuse
+
+    async with borrow_client(client, timeout=timeout) as c:
+        async def check(sub: str) -> None:
             try:
-                resp = await client.get(f"http://{sub}")
-                body = resp.text[:8000]
-                for phrase, vendor in SIGNATURES:
-                    if phrase in body:
-                        flagged.append(TakeoverFinding(subdomain=sub, reason=f"Potential takeover signature: {vendor}"))
-                        break
-            except Exception:
-                continue
-    return TakeoverAssessment(checked_count=min(len(subdomains), 200), flagged=flagged)
+                vendor = await asyncio.wait_for(_probe(sub, c, timeout, max_body_bytes), timeout)
+            except Exception:  # noqa: BLE001
+                return
+            if vendor:
+                flagged.append(TakeoverFinding(subdomain=sub, reason=f"Potential takeover signature: {vendor}"))
+
+        await _for_each(candidates, concurrency, check)
 
+    flagged.sort(key=lambda f: f.subdomain)
+    return TakeoverAssessment(checked_count=len(hosts), probed_count=len(candidates), flagged=flagged)
@@ -1,75 +1,193 @@
 from __future__ import annotations
 
-import socket
+import asyncio
+import hashlib
 import ssl
-from datetime import datetime
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from sentinelscope.models import TLSInfo
+from sentinelscope.models import TLSCertificate, TLSInfo, TLSInventory, utc_now
+from sentinelscope.scanning.certificates import chain_issues, parse_certificate, peer_chain
+from sentinelscope.utils.dns import resolve_host, run_sync
 
 
-def _parse_name(obj) -> Dict[str, str]:
-    d: Dict[str, str] = {}
-    for tup in obj:  # list of tuples like ((('commonName', 'example.com'),), ...)
-        for k, v in tup:
-            d[str(k)] = str(v)
-    return d
+EXPIRY_WARNING = "Certificate expiring within 30 days"
+DEFAULT_PORTS = (443, 8443)
+DEFAULT_CONCURRENCY = 100
 
+# (host, port) or (host, port, sni); the SNI defaults to the host
+Endpoint = Union[Tuple[str, int], Tuple[str, int, Optional[str]]]
 
-def _convert_asn1_date(value: str) -> datetime:
-    # Format is 'Jun 10 12:00:00 2025 GMT'
-    return datetime.strptime(value, "%b %d %H:%M:%S %Y %Z")
 
-
-def get_tls_info(domain: str, port: int = 443, timeout: float = 3.0) -> TLSInfo:
+@lru_cache(maxsize=1)
+def _client_context() -> ssl.SSLContext:
+    # Built once: loading the CA bundle costs milliseconds per context. Verification is
+    # off on purpose; broken certificates are exactly what we want to look at
     ctx = ssl.create_default_context()
     ctx.check_hostname = False
     ctx.verify_mode = ssl.CERT_NONE
+    return ctx
 
-    warnings: List[str] = []
-    protocol: str | None = None
-    valid_from = None
-    valid_to = None
-    subject = None
-    issuer = None
-    sans: List[str] = []
 
+def _tls_info(domain: str, port: int, address: Optional[str], ssl_object: Optional[ssl.SSLObject], warnings: List[str], sni: Optional[str] = None) -> TLSInfo:
+    info = TLSInfo(domain=domain, port=port, address=address, warnings=warnings)
+    if ssl_object is None:
+        return info
+    info.protocol = ssl_object.version()
+    ders, complete = peer_chain(ssl_object)
+    if not ders:
+        return info
+    # getpeercert() is empty without verification, so parse the DER ourselves; each
+    # distinct certificate is parsed once per process
+    try:
+        chain = [parse_certificate(der) for der in ders]
+    except Exception as e:  # noqa: BLE001
+        info.fingerprint_sha256 = hashlib.sha256(ders[0]).hexdigest()
+        warnings.append(f"Certificate parse failed: {e}")
+        return info
+    leaf = chain[0]
+    info.fingerprint_sha256 = leaf.fingerprint_sha256
+    info.valid_from = leaf.valid_from
+    info.valid_to = leaf.valid_to
+    info.subject = dict(leaf.subject)
+    info.issuer = dict(leaf.issuer)
+    info.subject_alternative_names = list(leaf.subject_alternative_names)
+    info.key_type = leaf.key_type
+    info.key_size = leaf.key_size
+    info.signature_algorithm = leaf.signature_algorithm
+    info.serial_number = leaf.serial_number
+    info.chain_length = len(chain) if complete else None
+    info.chain_issues = chain_issues(chain, host=sni or domain, complete=complete)
+    return refresh_expiry(info)
+
+
+async def get_tls_info_async(
+    domain: str,
+    port: int = 443,
+    timeout: float = 3.0,
+    *,
+    address: Optional[str] = None,
+    sni: Optional[str] = None,
+) -> TLSInfo:
+    """Handshake with ``domain`` (or ``address``, if given) and describe the leaf certificate.
+
+    The SNI is ``sni`` or ``domain``. Never raises; failures end up in ``warnings``.
+    """
+    warnings: List[str] = []
+    ssl_object = None
+    writer = None
     try:
-        with socket.create_connection((domain, port), timeout=timeout) as sock:
-            with ctx.wrap_socket(sock, server_hostname=domain) as ssock:
-                protocol = ssock.version()
-                cert = ssock.getpeercert()
-                if cert:
-                    if 'notBefore' in cert:
-                        valid_from = _convert_asn1_date(cert['notBefore'])
-                    if 'notAfter' in cert:
-                        valid_to = _convert_asn1_date(cert['notAfter'])
-                    if 'subject' in cert:
-                        subject = _parse_name(cert['subject'])
-                    if 'issuer' in cert:
-                        issuer = _parse_name(cert['issuer'])
-                    for typ, vals in cert.get('subjectAltName', []):
-                        if typ == 'DNS':
-                            sans.append(vals)
+        if address is None:
+            # Connect to a cached address, trying each in turn like create_connection;
+            # SNI below still carries the hostname
+            candidates = await resolve_host(domain, timeout=timeout) or [domain]
+        else:
+            candidates = [address]
+        for i, address in enumerate(candidates):
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(address, port, ssl=_client_context(), server_hostname=sni or domain),
+                    timeout,
+                )
+                break
+            except (OSError, asyncio.TimeoutError):
+                if i == len(candidates) - 1:
+                    raise
+        ssl_object = writer.get_extra_info("ssl_object")
     except Exception as e:  # noqa: BLE001
         warnings.append(f"TLS check failed: {e}")
+    finally:
+        if writer is not None:
+            # Nothing to say to the server: skip the close_notify exchange
+            writer.transport.abort()
+    return _tls_info(domain, port, address, ssl_object, warnings, sni=sni)
+
+
+def get_tls_info(domain: str, port: int = 443, timeout: float = 3.0) -> TLSInfo:
+    return run_sync(get_tls_info_async(domain, port=port, timeout=timeout))
 
-    days_until_expiry = None
-    if valid_to:
-        days_until_expiry = (valid_to - datetime.utcnow()).days
-        if days_until_expiry is not None and days_until_expiry < 30:
-            warnings.append("Certificate expiring within 30 days")
-
-    return TLSInfo(
-        domain=domain,
-        port=port,
-        valid_from=valid_from,
-        valid_to=valid_to,
-        days_until_expiry=days_until_expiry,
-        subject=subject,
-        issuer=issuer,
-        subject_alternative_names=sans,
-        protocol=protocol,
-        warnings=warnings,
+
+def _endpoint(endpoint: Endpoint) -> Tuple[str, int, str]:
+    host, port = endpoint[0], int(endpoint[1])
+    sni = endpoint[2] if len(endpoint) > 2 and endpoint[2] else host
+    return host, port, sni
+
+
+async def inspect_tls_endpoints(
+    endpoints: Iterable[Endpoint],
+    *,
+    timeout: float = 3.0,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> TLSInventory:
+    """Handshake with many ``(host, port[, sni])`` endpoints at once and group them by certificate.
+
+    Hosts are resolved first and each distinct ``(address, port, sni)`` is handshaken
+    only once, so names sharing a load balancer cost a single connection. Every
+    certificate appears once, with the names and addresses that served it.
+    """
+    unique = list(dict.fromkeys(_endpoint(e) for e in endpoints))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(host: str) -> Tuple[str, Optional[str]]:
+        async with semaphore:
+            addresses = await resolve_host(host, timeout=timeout)
+        return host, addresses[0] if addresses else None
+
+    resolved = dict(await asyncio.gather(*(resolve(h) for h in dict.fromkeys(h for h, _, _ in unique))))
+    handshakes: Dict[Tuple[str, int, str], List[Tuple[str, int]]] = {}
+    failures: List[str] = []
+    for host, port, sni in unique:
+        address = resolved.get(host)
+        if address is None:
+            failures.append(f"{host}:{port}: does not resolve")
+            continue
+        handshakes.setdefault((address, port, sni), []).append((host, port))
+
+    async def handshake(key: Tuple[str, int, str]) -> Tuple[Tuple[str, int, str], TLSInfo]:
+        address, port, sni = key
+        async with semaphore:
+            return key, await get_tls_info_async(sni, port, timeout, address=address, sni=sni)
+
+    groups: Dict[str, TLSCertificate] = {}
+    for key, info in await asyncio.gather(*(handshake(k) for k in handshakes)):
+        address, port, _ = key
+        names = [f"{h}:{p}" for h, p in handshakes[key]]
+        if info.fingerprint_sha256 is None:
+            failures.extend(f"{n}: {'; '.join(info.warnings) or 'no certificate'}" for n in names)
+            continue
+        group = groups.get(info.fingerprint_sha256)
+        if group is None:
+            group = groups[info.fingerprint_sha256] = TLSCertificate(
+                **info.model_dump(include={
+                    "fingerprint_sha256", "subject", "issuer", "valid_from", "valid_to", "days_until_expiry",
+                    "subject_alternative_names", "key_type", "key_size", "signature_algorithm", "warnings",
+                }),
+            )
+        group.endpoints.extend(n for n in names if n not in group.endpoints)
+        if address not in group.addresses:
+            group.addresses.append(address)
+
+    # Soonest expiry first; certificates without a parsed expiry go last
+    certificates = sorted((c for c in groups.values() if c.valid_to), key=lambda c: c.valid_to)
+    certificates += [c for c in groups.values() if not c.valid_to]
+    for c in certificates:
+        c.endpoints.sort()
+        c.addresses.sort()
+    return TLSInventory(
+        endpoint_count=len(unique),
+        handshake_count=len(handshakes),
+        certificates=certificates,
+        failures=sorted(failures),
     )
 
+
+def refresh_expiry(info: TLSInfo) -> TLSInfo:
+    """Recompute the expiry countdown of a certificate carried over from an earlier scan."""
+    if info.valid_to is None:
+        return info
+    days = (info.valid_to - utc_now()).days
+    warnings = [w for w in info.warnings if w != EXPIRY_WARNING]
+    if days < 30:
+        warnings.append(EXPIRY_WARNING)
+    return info.model_copy(update={"days_until_expiry": days, "warnings": warnings})
+
@@ -1,27 +1,37 @@
 from __future__ import annotations
 
-import re
 from typing import Optional
 
 import httpx
 
 from sentinelscope.models import WebPreview
+from sentinelscope.scanning.body import BodyPipeline, TitleExtractor, analyze_body
+from sentinelscope.scanning.fetch import PageSnapshot, fetch_page
 
 
-TITLE_RE = re.compile(r"<title>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+# The title is normally in the first few KB; reading stops at </title> anyway
+DEFAULT_MAX_BODY_BYTES = 65536
 
 
-async def fetch_preview(url: str, timeout: float = 6.0) -> WebPreview:
+async def fetch_preview(
+    url: str,
+    timeout: float = 6.0,
+    page: Optional[PageSnapshot] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+) -> WebPreview:
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout) as client:
-            resp = await client.get(url)
-        text = resp.text[:10000] if isinstance(resp.text, str) else ""
-        title_match: Optional[re.Match[str]] = TITLE_RE.search(text)
-        title = title_match.group(1).strip() if title_match else None
-        server = resp.headers.get("server")
-        content_type = resp.headers.get("content-type")
+        extractor = TitleExtractor()
+        if page is None:
+            pipeline = BodyPipeline([extractor], max_bytes=max_body_bytes)
+            page = await fetch_page(url, timeout=timeout, max_body_bytes=0, client=client, pipeline=pipeline)
+        else:
+            analyze_body(page.body, [extractor], charset=page.charset, max_bytes=max_body_bytes)
+        if not page.ok:
+            raise RuntimeError(page.error)
+        server = page.headers.get("server")
+        content_type = page.headers.get("content-type")
         # Record effective URL after redirects (and potential scheme changes)
-        return WebPreview(url=str(resp.url), status_code=resp.status_code, title=title, server=server, content_type=content_type)
+        return WebPreview(url=page.final_url, status_code=page.status_code, title=extractor.title, server=server, content_type=content_type)
     except Exception:
         return WebPreview(url=url, status_code=None, title=None, server=None, content_type=None)
-
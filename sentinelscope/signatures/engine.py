@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+PACKS_DIR = Path(__file__).parent / "packs"
+# Extra pack directories (os.pathsep-separated); a <name>.json there extends the built-in pack
+SIGNATURE_PATH_ENV = "SENTINELSCOPE_SIGNATURE_PATH"
+
+WHERE = ("headers", "body", "any")
+
+
+@dataclass
+class Signature:
+    name: str
+    patterns: List[str]
+    where: str = "any"
+    # DNS suffixes the signature's service lives under (``github.io``); matched against CNAME targets
+    cnames: List[str] = field(default_factory=list)
+
+
+def _trie_regex(patterns: Iterable[str]) -> str:
+    # A trie folded into one regex: shared prefixes are tried once, and greedy optional
+    # groups prefer the longest pattern at each position
+    trie: Dict[str, dict] = {}
+    for p in patterns:
+        node = trie
+        for ch in p:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if terminal else body
+
+    return build(trie)
+
+
+class _Matcher:
+    """Every pattern of a pack compiled into a single automaton; one scan per text."""
+
+    def __init__(self, patterns: Mapping[str, Set[int]]):
+        self._hits: Dict[str, Set[int]] = {}
+        for p in patterns:
+            # The longest match at a position implies every shorter pattern that prefixes it
+            ids: Set[int] = set()
+            for k in range(1, len(p) + 1):
+                q_ids = patterns.get(p[:k])
+                if q_ids:
+                    ids |= q_ids
+            self._hits[p] = ids
+        # A lookahead consumes nothing, so matches starting at every position are reported
+        self._regex = re.compile("(?=(" + _trie_regex(patterns) + "))") if patterns else None
+
+    def scan(self, text: str, found: Set[int]) -> None:
+        if self._regex is None or not text:
+            return
+        for m in self._regex.finditer(text):
+            hit = m.group(1)
+            if hit:
+                found |= self._hits[hit]
+
+
+class SignaturePack:
+    """A named set of signatures matched against response headers and/or bodies.
+
+    Patterns are case-insensitive literals. Headers are matched as ``name:value`` pairs,
+    so a pattern may pin a value to a header (``server:nginx``).
+    """
+
+    def __init__(self, name: str, signatures: List[Signature]):
+        self.name = name
+        self.signatures = signatures
+        header_patterns: Dict[str, Set[int]] = {}
+        body_patterns: Dict[str, Set[int]] = {}
+        for i, sig in enumerate(signatures):
+            for p in sig.patterns:
+                p = p.lower()
+                if not p:
+                    continue
+                if sig.where in ("headers", "any"):
+                    header_patterns.setdefault(p, set()).add(i)
+                if sig.where in ("body", "any"):
+                    body_patterns.setdefault(p, set()).add(i)
+        self._headers = _Matcher(header_patterns)
+        self._body = _Matcher(body_patterns)
+        self._cnames: Dict[str, int] = {}
+        for i, sig in enumerate(signatures):
+            for suffix in sig.cnames:
+                self._cnames.setdefault(suffix.lower().strip("."), i)
+
+    def match(self, headers: Optional[Mapping[str, str]] = None, body: Optional[str] = None) -> List[str]:
+        """Names of the signatures found in ``headers`` and ``body``, in pack order."""
+        found: Set[int] = set()
+        if headers:
+            self._headers.scan(header_blob(headers), found)
+        if body:
+            self._body.scan(body.lower(), found)
+        return [self.signatures[i].name for i in sorted(found)]
+
+    def for_cname(self, target: str) -> Optional[str]:
+        """Name of the signature whose ``cnames`` suffix ``target`` falls under, if any."""
+        labels = target.lower().rstrip(".").split(".")
+        # Longest suffix first, one dict lookup per label
+        for k in range(len(labels)):
+            i = self._cnames.get(".".join(labels[k:]))
+            if i is not None:
+                return self.signatures[i].name
+        return None
+
+    def first(self, headers: Optional[Mapping[str, str]] = None, body: Optional[str] = None) -> Optional[str]:
+        names = self.match(headers=headers, body=body)
+        return names[0] if names else None
+
+
+def header_blob(headers: Mapping[str, str]) -> str:
+    return " ".join(f"{k}:{v}" for k, v in headers.items()).lower()
+
+
+def _read_pack(path: Path) -> Tuple[str, List[Signature]]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    signatures = []
+    for entry in data.get("signatures", []):
+        where = entry.get("where", "any")
+        if where not in WHERE:
+            raise ValueError(f"{path}: signature {entry.get('name')!r} has invalid 'where' {where!r}")
+        signatures.append(Signature(
+            name=str(entry["name"]),
+            patterns=[str(p) for p in entry["patterns"]],
+            where=where,
+            cnames=[str(c) for c in entry.get("cname", [])],
+        ))
+    return str(data.get("name", path.stem)), signatures
+
+
+def _pack_paths(name: str) -> List[Path]:
+    paths = [PACKS_DIR / f"{name}.json"]
+    for directory in os.environ.get(SIGNATURE_PATH_ENV, "").split(os.pathsep):
+        if directory:
+            paths.append(Path(directory) / f"{name}.json")
+    return [p for p in paths if p.is_file()]
+
+
+@lru_cache(maxsize=None)
+def load_pack(name: str) -> SignaturePack:
+    """Load and compile the pack ``name`` once per process.
+
+    Extra packs of the same name found on ``SENTINELSCOPE_SIGNATURE_PATH`` are merged in:
+    new signatures are appended, and patterns (and ``cname`` suffixes) for an existing
+    signature name are added to it.
+    """
+    paths = _pack_paths(name)
+    if not paths:
+        raise FileNotFoundError(f"No signature pack named {name!r}")
+    merged: Dict[Tuple[str, str], Signature] = {}
+    for path in paths:
+        for sig in _read_pack(path)[1]:
+            existing = merged.get((sig.name, sig.where))
+            if existing is None:
+                merged[(sig.name, sig.where)] = sig
+            else:
+                existing.patterns.extend(p for p in sig.patterns if p not in existing.patterns)
+                existing.cnames.extend(c for c in sig.cnames if c not in existing.cnames)
+    return SignaturePack(name, list(merged.values()))
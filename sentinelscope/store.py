@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sentinelscope.models import DERIVED_FIELDS, DomainScanResult, FieldChange, ScanRecord
+
+
+# Fields that change on every run and say nothing about the target
+VOLATILE_FIELDS = {"started_at", "finished_at", "days_until_expiry", "validators", "carried_over"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    domain TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    headers_grade TEXT,
+    tls_valid_to TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scans_domain_started ON scans (domain, started_at);
+CREATE INDEX IF NOT EXISTS scans_started ON scans (started_at);
+CREATE INDEX IF NOT EXISTS scans_headers_grade ON scans (headers_grade);
+CREATE INDEX IF NOT EXISTS scans_tls_valid_to ON scans (tls_valid_to);
+CREATE TABLE IF NOT EXISTS scan_ports (
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    port INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, port)
+);
+CREATE INDEX IF NOT EXISTS scan_ports_port ON scan_ports (port, scan_id);
+"""
+
+
+class ResultStore:
+    """Indexed history of ``DomainScanResult`` in SQLite (WAL).
+
+    The full result is kept as JSON; the columns that dashboards filter on
+    (domain, time, open ports, TLS expiry, header grade) are indexed next to it.
+    """
+
+    def __init__(self, path: str | Path):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA foreign_keys=ON")
+            self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def save(self, result: DomainScanResult) -> int:
+        open_ports = result.ports.open_ports if result.ports else []
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                cur = self._db.execute(
+                    "INSERT INTO scans (domain, started_at, finished_at, headers_grade, tls_valid_to, payload)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        result.domain,
+                        result.started_at.isoformat(),
+                        result.finished_at.isoformat(),
+                        result.headers.grade if result.headers else None,
+                        result.tls.valid_to.isoformat() if result.tls and result.tls.valid_to else None,
+                        result.model_dump_json(exclude=DERIVED_FIELDS),
+                    ),
+                )
+                scan_id = cur.lastrowid
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO scan_ports (scan_id, port) VALUES (?, ?)",
+                    [(scan_id, port) for port in open_ports],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return scan_id
+
+    def get(self, scan_id: int) -> Optional[DomainScanResult]:
+        with self._lock:
+            row = self._db.execute("SELECT payload FROM scans WHERE id = ?", (scan_id,)).fetchone()
+        return DomainScanResult.model_validate_json(row["payload"]) if row else None
+
+    def latest(self, domain: str, before: Optional[datetime] = None) -> Optional[DomainScanResult]:
+        """Most recent scan of ``domain`` (optionally the most recent one started before ``before``)."""
+        records = self.query(domain=domain, until=before, limit=1)
+        return self.get(records[0].id) if records else None
+
+    def query(
+        self,
+        *,
+        domain: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        open_port: Optional[int] = None,
+        tls_expires_before: Optional[datetime] = None,
+        headers_grade: Optional[str] = None,
+        latest_only: bool = False,
+        limit: int = 100,
+    ) -> List[ScanRecord]:
+        """Indexed lookup of scan records, newest first; payloads are not loaded."""
+        where: List[str] = []
+        params: List[Any] = []
+        if domain is not None:
+            where.append("s.domain = ?")
+            params.append(domain)
+        if since is not None:
+            where.append("s.started_at >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            where.append("s.started_at < ?")
+            params.append(until.isoformat())
+        if open_port is not None:
+            where.append("s.id IN (SELECT scan_id FROM scan_ports WHERE port = ?)")
+            params.append(open_port)
+        if tls_expires_before is not None:
+            where.append("s.tls_valid_to IS NOT NULL AND s.tls_valid_to < ?")
+            params.append(tls_expires_before.isoformat())
+        if headers_grade is not None:
+            where.append("s.headers_grade = ?")
+            params.append(headers_grade)
+        if latest_only:
+            where.append("s.id IN (SELECT MAX(id) FROM scans GROUP BY domain)")
+        sql = (
+            "SELECT s.id, s.domain, s.started_at, s.finished_at, s.headers_grade, s.tls_valid_to,"
+            " (SELECT group_concat(port) FROM scan_ports p WHERE p.scan_id = s.id) AS open_ports"
+            " FROM scans s"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY s.started_at DESC, s.id DESC LIMIT ?"
+        )
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            ScanRecord(
+                id=row["id"],
+                domain=row["domain"],
+                started_at=row["started_at"],
+                finished_at=row["finished_at"],
+                headers_grade=row["headers_grade"],
+                tls_valid_to=row["tls_valid_to"],
+                open_ports=sorted(int(p) for p in row["open_ports"].split(",")) if row["open_ports"] else [],
+            )
+            for row in rows
+        ]
+
+
+def _missing(items: List[Any], other: List[Any]) -> List[Any]:
+    """Items of ``items`` not in ``other``, in order; a set lookup unless values are unhashable."""
+    try:
+        seen = set(other)
+        return [v for v in items if v not in seen]
+    except TypeError:
+        return [v for v in items if v not in other]
+
+
+def _diff(path: str, before: Any, after: Any, changes: List[FieldChange]) -> None:
+    if before == after:
+        return
+    if isinstance(before, dict) and isinstance(after, dict):
+        for key in list(before) + [k for k in after if k not in before]:
+            if key not in VOLATILE_FIELDS:
+                _diff(f"{path}.{key}" if path else key, before.get(key), after.get(key), changes)
+        return
+    if isinstance(before, list) and isinstance(after, list) and all(
+        not isinstance(v, (dict, list)) for v in before + after
+    ):
+        changes.append(FieldChange(
+            path=path,
+            before=before,
+            after=after,
+            added=_missing(after, before),
+            removed=_missing(before, after),
+        ))
+        return
+    changes.append(FieldChange(path=path, before=before, after=after))
+
+
+def diff_results(old: DomainScanResult, new: DomainScanResult) -> List[FieldChange]:
+    """Field-by-field changes from ``old`` to ``new`` (timings and countdowns ignored).
+
+    Derived views such as ``ports.results`` are left out: ``ports.open_ports`` already
+    carries the change.
+    """
+    changes: List[FieldChange] = []
+    before: Dict[str, Any] = old.model_dump(mode="json", exclude=DERIVED_FIELDS)
+    after: Dict[str, Any] = new.model_dump(mode="json", exclude=DERIVED_FIELDS)
+    _diff("", before, after, changes)
+    return changes
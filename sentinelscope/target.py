@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, TypeVar
+
+from sentinelscope.utils.dns import DEFAULT_TIMEOUT, pin_addresses, resolve_host
+
+
+T = TypeVar("T")
+
+# Names pinned, and IP-level results kept; oldest entries go first (long batches)
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_MAX_RESULTS = 1_000
+
+
+class _Bounded(OrderedDict):
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+
+class TargetContext:
+    """Addresses of a scan's names, resolved once and pinned for every stage.
+
+    Inside :meth:`pinned`, every lookup that goes through ``resolve_host`` (the HTTP
+    client, the port scanners, TLS) gets the same answer for a name, so all checks talk
+    to the same machine. :meth:`once` runs IP-level work (a port scan) a single time per
+    address while name-level work (SNI, Host header) still covers every name; the TLS
+    inventory already handshakes once per ``(address, port, SNI)``. One context may be
+    shared by many scans, e.g. a batch.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_entries: int = DEFAULT_MAX_ENTRIES, max_results: int = DEFAULT_MAX_RESULTS):
+        self.timeout = timeout
+        self.pins: Dict[str, List[str]] = _Bounded(max_entries)
+        self._work: Dict[Hashable, asyncio.Future] = _Bounded(max_results)
+
+    @contextmanager
+    def pinned(self) -> Iterator["TargetContext"]:
+        with pin_addresses(self.pins):
+            yield self
+
+    async def resolve(self, name: str) -> List[str]:
+        with pin_addresses(self.pins):
+            return await resolve_host(name, timeout=self.timeout)
+
+    def addresses(self, name: str) -> List[str]:
+        """The addresses pinned for ``name``; empty until something has resolved it."""
+        return list(self.pins.get(name.lower().rstrip("."), []))
+
+    def address(self, name: str) -> Optional[str]:
+        addresses = self.addresses(name)
+        return addresses[0] if addresses else None
+
+    async def once(self, key: Hashable, run: Callable[[], Awaitable[T]]) -> T:
+        """Run ``run()`` once per ``key``; concurrent and later callers share its result.
+
+        A failure is not remembered: the next caller runs it again.
+        """
+        future = self._work.get(key)
+        if future is None:
+            future = asyncio.ensure_future(run())
+            self._work[key] = future
+            future.add_done_callback(lambda f: self._forget_failed(key, f))
+        # Shielded: one caller being cancelled must not cancel the work for the others
+        return await asyncio.shield(future)
+
+    def _forget_failed(self, key: Hashable, future: asyncio.Future) -> None:
+        if (future.cancelled() or future.exception() is not None) and self._work.get(key) is future:
+            del self._work[key]
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import ipaddress
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Coroutine, Dict, Iterable, Iterator, List, MutableMapping, Optional, Tuple, TypeVar
+
+import dns.asyncresolver
+import dns.rdata
+import dns.rdatatype
+import dns.resolver
+
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_CACHE_SIZE = 50_000
+DEFAULT_NEGATIVE_TTL = 300.0
+
+Query = Tuple[str, str]  # (name, rdtype)
+T = TypeVar("T")
+
+_resolver: Optional[dns.asyncresolver.Resolver] = None
+# Per-scan address pins (see pin_addresses); a context variable, so concurrent scans keep their own
+_pins: ContextVar[Optional[MutableMapping[str, List[str]]]] = ContextVar("sentinelscope_dns_pins", default=None)
+
+
+class DNSCache:
+    """Size-bounded LRU of DNS answers that expires entries at their record TTL.
+
+    Negative answers (NXDOMAIN / no data) are cached as empty lists for the SOA
+    negative TTL, falling back to ``negative_ttl``. Timeouts are never cached.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE, negative_ttl: float = DEFAULT_NEGATIVE_TTL):
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[Query, Tuple[float, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(name: str, rdtype: str) -> Query:
+        return name.lower().rstrip("."), rdtype.upper()
+
+    def get(self, name: str, rdtype: str) -> Optional[List[Any]]:
+        key = self.key(name, rdtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, rdatas = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if rdatas:
+                self.hits += 1
+            else:
+                self.negative_hits += 1
+            return list(rdatas)
+
+    def expires_at(self, name: str, rdtype: str) -> Optional[float]:
+        """Wall-clock expiry of a cached answer (no hit/miss accounting), or None."""
+        with self._lock:
+            entry = self._entries.get(self.key(name, rdtype))
+        return entry[0] if entry is not None else None
+
+    def put(self, name: str, rdtype: str, rdatas: List[Any], ttl: float) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        key = self.key(name, rdtype)
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, list(rdatas))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+    def save(self, path: str | Path) -> None:
+        now = time.time()
+        with self._lock:
+            rows = [
+                {"name": name, "rdtype": rdtype, "expires_at": expires_at, "records": [r.to_text() for r in rdatas]}
+                for (name, rdtype), (expires_at, rdatas) in self._entries.items()
+                if expires_at > now
+            ]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(rows), encoding="utf-8")
+
+    def load(self, path: str | Path) -> int:
+        """Warm the cache from a snapshot written by :meth:`save`; returns entries loaded."""
+        path = Path(path)
+        if not path.exists():
+            return 0
+        now = time.time()
+        loaded = 0
+        for row in json.loads(path.read_text(encoding="utf-8")):
+            ttl = float(row["expires_at"]) - now
+            if ttl <= 0:
+                continue
+            try:
+                rdatas = [dns.rdata.from_text("IN", row["rdtype"], text) for text in row["records"]]
+            except Exception:  # noqa: BLE001
+                continue
+            self.put(row["name"], row["rdtype"], rdatas, ttl)
+            loaded += 1
+        return loaded
+
+
+_cache = DNSCache()
+
+
+def get_dns_cache() -> DNSCache:
+    return _cache
+
+
+@contextmanager
+def dns_cache_snapshot(path: Optional[str | Path]) -> Iterator[DNSCache]:
+    """Load the shared cache from ``path`` (if given) and write it back on exit."""
+    if path:
+        _cache.load(path)
+    try:
+        yield _cache
+    finally:
+        if path:
+            _cache.save(path)
+
+
+def get_resolver() -> dns.asyncresolver.Resolver:
+    """Process-wide async resolver; reads the system configuration once."""
+    global _resolver
+    if _resolver is None:
+        _resolver = dns.asyncresolver.Resolver()
+    return _resolver
+
+
+def _negative_ttl(exc: Exception) -> float:
+    # RFC 2308: negative answers live for min(SOA TTL, SOA MINIMUM)
+    try:
+        if isinstance(exc, dns.resolver.NXDOMAIN):
+            responses = list(exc.responses().values())
+        else:
+            responses = [exc.kwargs["response"]]
+        for response in responses:
+            for rrset in response.authority:
+                if rrset.rdtype == dns.rdatatype.SOA:
+                    return float(min(rrset.ttl, rrset[0].minimum))
+    except Exception:  # noqa: BLE001
+        pass
+    return _cache.negative_ttl
+
+
+async def resolve(name: str, rdtype: str, timeout: float = DEFAULT_TIMEOUT) -> List[Any]:
+    """Return the rdata of an answer, or an empty list on NXDOMAIN/no answer/timeout.
+
+    Answers are served from the shared TTL cache when fresh.
+    """
+    cached = _cache.get(name, rdtype)
+    if cached is not None:
+        return cached
+    try:
+        answer = await get_resolver().resolve(name, rdtype, lifetime=timeout)
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+        _cache.put(name, rdtype, [], _negative_ttl(e))
+        return []
+    except Exception:  # noqa: BLE001
+        return []
+    rdatas = list(answer)
+    _cache.put(name, rdtype, rdatas, answer.expiration - time.time())
+    return rdatas
+
+
+async def resolve_many(queries: Iterable[Query], timeout: float = DEFAULT_TIMEOUT) -> Dict[Query, List[Any]]:
+    """Send every query concurrently; the whole batch costs roughly one round trip."""
+    unique = list(dict.fromkeys(queries))
+    answers = await asyncio.gather(*(resolve(name, rdtype, timeout) for name, rdtype in unique))
+    return dict(zip(unique, answers))
+
+
+@contextmanager
+def pin_addresses(pins: MutableMapping[str, List[str]]) -> Iterator[MutableMapping[str, List[str]]]:
+    """Within the block, ``resolve_host`` answers each name once and then sticks to that answer.
+
+    ``pins`` maps lowercased names to addresses; it is filled as names are first resolved
+    and may be shared between blocks (e.g. across a batch).
+    """
+    token = _pins.set(pins)
+    try:
+        yield pins
+    finally:
+        _pins.reset(token)
+
+
+async def resolve_host(host: str, timeout: float = DEFAULT_TIMEOUT) -> List[str]:
+    """Addresses for ``host`` (IPv4 first), or the host itself if it is already an IP literal.
+
+    Under :func:`pin_addresses` the first answer for a name is reused for the rest of the block.
+    """
+    try:
+        return [str(ipaddress.ip_address(host.strip("[]")))]
+    except ValueError:
+        pass
+    pins = _pins.get()
+    key = host.lower().rstrip(".")
+    if pins is not None and key in pins:
+        return list(pins[key])
+    answers = await resolve_many([(host, "A"), (host, "AAAA")], timeout=timeout)
+    addresses = [rdata.to_text() for rdatas in answers.values() for rdata in rdatas]
+    if pins is not None and addresses:
+        # A concurrent lookup may have pinned the name first; everyone uses that answer.
+        # Empty answers (possibly a timeout) are not pinned
+        if key not in pins:
+            pins[key] = addresses
+        return list(pins[key])
+    return addresses
+
+
+def lookup_host(host: str, timeout: float = DEFAULT_TIMEOUT) -> List[str]:
+    return run_sync(resolve_host(host, timeout=timeout))
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run an async DNS helper from synchronous code, even when called under a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
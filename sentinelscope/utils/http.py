@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from http.cookiejar import CookieJar
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional
+
+import httpcore
+import httpx
+
+from sentinelscope.utils.dns import resolve_host
+
+
+DEFAULT_MAX_CONNECTIONS = 200
+DEFAULT_MAX_PER_HOST = 10
+DEFAULT_MAX_KEEPALIVE = 100
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 6.0
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class _NoCookieJar(CookieJar):
+    """A jar that never stores anything: the shared client serves unrelated targets and callers."""
+
+    def set_cookie(self, cookie) -> None:
+        pass
+
+    def extract_cookies(self, response, request) -> None:
+        pass
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps in-flight requests per origin; the slot is held until the response is closed."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int = DEFAULT_MAX_PER_HOST):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._users: Dict[str, int] = {}
+
+    def _release(self, key: str) -> None:
+        self._slots[key].release()
+        self._users[key] -= 1
+        if not self._users[key]:
+            del self._users[key]
+            del self._slots[key]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = f"{request.url.scheme}://{request.url.host}:{request.url.port}"
+        slot = self._slots.setdefault(key, asyncio.Semaphore(self._max_per_host))
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            await slot.acquire()
+        except BaseException:
+            self._users[key] -= 1
+            raise
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._release(key)
+            raise
+        if response.is_closed:
+            # Body already loaded (e.g. mock or cached responses): nothing left to hold the slot for
+            self._release(key)
+        else:
+            response.stream = _ReleasingStream(response.stream, lambda: self._release(key))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """Resolves hostnames through the shared DNS cache; TLS still uses the hostname for SNI."""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend):
+        self._backend = backend
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        addresses = await resolve_host(host, timeout=timeout or DEFAULT_TIMEOUT) or [host]
+        # Like create_connection: a dead first address must not hide the others
+        for i, address in enumerate(addresses):
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                if i == len(addresses) - 1:
+                    raise
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def build_client(
+    *,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    timeout: float = DEFAULT_TIMEOUT,
+    http2: Optional[bool] = None,
+) -> httpx.AsyncClient:
+    """Create a pooled client: keep-alive, global and per-host connection caps, HTTP/2 when ``h2`` is installed."""
+    if http2 is None:
+        http2 = http2_available()
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+    )
+    inner = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+    pool = getattr(inner, "_pool", None)
+    if isinstance(getattr(pool, "_network_backend", None), httpcore.AsyncNetworkBackend):
+        # httpx has no public hook for name resolution; wrap the pool's backend in place
+        pool._network_backend = CachedDNSBackend(pool._network_backend)
+    transport = HostLimitedTransport(inner, max_per_host=max_per_host)
+    return httpx.AsyncClient(
+        transport=transport, timeout=timeout, follow_redirects=True, cookies=_NoCookieJar()
+    )
+
+
+def get_shared_client() -> Optional[httpx.AsyncClient]:
+    return _shared_client
+
+
+@asynccontextmanager
+async def http_client_scope(**kwargs) -> AsyncIterator[httpx.AsyncClient]:
+    """Install a process-wide pooled client for the duration of an app lifespan or CLI run.
+
+    Nested scopes reuse the outer client.
+    """
+    global _shared_client
+    if _shared_client is not None:
+        yield _shared_client
+        return
+    client = build_client(**kwargs)
+    _shared_client = client
+    try:
+        yield client
+    finally:
+        _shared_client = None
+        await client.aclose()
+
+
+@asynccontextmanager
+async def borrow_client(
+    client: Optional[httpx.AsyncClient] = None, timeout: float = DEFAULT_TIMEOUT
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the injected client, else the shared one, else a throwaway client closed on exit.
+
+    Callers pass ``timeout``/``follow_redirects`` per request, since a borrowed client
+    carries someone else's defaults.
+    """
+    client = client or _shared_client
+    if client is not None:
+        yield client
+        return
+    async with httpx.AsyncClient(timeout=timeout) as own:
+        yield own
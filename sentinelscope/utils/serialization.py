@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import io
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple
+
+import pydantic_core
+from pydantic import BaseModel
+
+from sentinelscope.models import PortScanResult
+
+try:
+    # Optional fast encoder (pip install sentinelscope[fast])
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+# Items of a large list encoded (and written) per call
+CHUNK_ITEMS = 4096
+INDENT = b"  "
+
+_SCALARS = (str, int, float, bool, type(None))
+_SCALAR_TYPES = frozenset(_SCALARS)
+
+
+def _port_results(result: PortScanResult) -> Iterator[Dict[str, Any]]:
+    open_ports = set(result.open_ports)
+    return ({"port": p, "is_open": p in open_ports} for p in result.ports_scanned)
+
+
+# Computed fields that can be streamed from plain data instead of building models
+_FIELD_ENCODERS: Dict[Tuple[type, str], Callable[[Any], Iterable[Any]]] = {
+    (PortScanResult, "results"): _port_results,
+}
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+def _plain(value: Any) -> bool:
+    # JSON-native data that both backends encode identically
+    if type(value) in _SCALARS:
+        return True
+    return type(value) is dict and all(type(k) is str and type(v) in _SCALARS for k, v in value.items())
+
+
+def _dumps_plain(value: Any, pretty: bool) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return pydantic_core.to_json(value, indent=2 if pretty else None)
+
+
+def _encode(value: Any, pretty: bool, depth: int) -> bytes:
+    if isinstance(value, BaseModel):
+        data = value.model_dump_json(indent=2 if pretty else None).encode()
+    elif _plain(value):
+        data = _dumps_plain(value, pretty)
+    else:
+        data = pydantic_core.to_json(value, indent=2 if pretty else None)
+    if pretty and depth:
+        data = data.replace(b"\n", b"\n" + INDENT * depth)
+    return data
+
+
+def _model_items(model: BaseModel) -> Iterator[Tuple[str, Any]]:
+    cls = type(model)
+    for name in cls.model_fields:
+        yield name, getattr(model, name)
+    for name in cls.model_computed_fields:
+        encoder = _FIELD_ENCODERS.get((cls, name))
+        yield name, encoder(model) if encoder is not None else getattr(model, name)
+
+
+def _iter_object(items: Iterable[Tuple[str, Any]], pretty: bool, depth: int, chunk_items: int) -> Iterator[bytes]:
+    pad = INDENT * (depth + 1)
+    first = True
+    for key, value in items:
+        if pretty:
+            yield (b"{\n" if first else b",\n") + pad + _dumps_plain(str(key), False) + b": "
+        else:
+            yield (b"{" if first else b",") + _dumps_plain(str(key), False) + b":"
+        first = False
+        yield from _iter(value, pretty, depth + 1, chunk_items)
+    if first:
+        yield b"{}"
+    else:
+        yield (b"\n" + INDENT * depth + b"}") if pretty else b"}"
+
+
+def _iter_array(values: Iterable[Any], pretty: bool, depth: int, chunk_items: int) -> Iterator[bytes]:
+    pad = INDENT * depth
+    it = iter(values)
+    first = True
+    while True:
+        chunk = list(islice(it, chunk_items))
+        if not chunk:
+            break
+        if all(map(_SCALAR_TYPES.__contains__, map(type, chunk))) or all(map(_plain, chunk)):
+            # One encoder call per chunk; strip the chunk's own brackets
+            data = _dumps_plain(chunk, pretty)
+            if pretty:
+                yield (b"[\n" if first else b",\n") + pad + data[2:-2].replace(b"\n", b"\n" + pad)
+            else:
+                yield (b"[" if first else b",") + data[1:-1]
+            first = False
+            continue
+        for value in chunk:
+            if pretty:
+                yield (b"[\n" if first else b",\n") + pad + INDENT
+            else:
+                yield b"[" if first else b","
+            first = False
+            yield from _iter(value, pretty, depth + 1, chunk_items)
+    if first:
+        yield b"[]"
+    else:
+        yield (b"\n" + pad + b"]") if pretty else b"]"
+
+
+def _iter(value: Any, pretty: bool, depth: int, chunk_items: int) -> Iterator[bytes]:
+    if isinstance(value, BaseModel):
+        yield from _iter_object(_model_items(value), pretty, depth, chunk_items)
+    elif type(value) is dict and not _plain(value):
+        yield from _iter_object(value.items(), pretty, depth, chunk_items)
+    elif isinstance(value, (list, tuple)) or (not isinstance(value, (str, bytes, dict)) and isinstance(value, Iterator)):
+        yield from _iter_array(value, pretty, depth, chunk_items)
+    else:
+        yield _encode(value, pretty, depth)
+
+
+def iter_json(obj: Any, *, pretty: bool = False, chunk_items: int = CHUNK_ITEMS) -> Iterator[bytes]:
+    """Encode ``obj`` (a model or plain data) as JSON, piece by piece.
+
+    Output matches ``model_dump_json()`` (``indent=2`` with ``pretty``), but large lists
+    are encoded ``chunk_items`` at a time, so no full-size string is ever built. Plain
+    lists go through orjson when it is installed.
+    """
+    return _iter(obj, pretty, 0, chunk_items)
+
+
+def dumps(obj: Any, *, pretty: bool = False) -> bytes:
+    return b"".join(iter_json(obj, pretty=pretty))
+
+
+def write_json(obj: Any, fp: Any, *, pretty: bool = False, chunk_items: int = CHUNK_ITEMS) -> None:
+    """Stream ``obj`` as JSON into a binary or text file object."""
+    text = isinstance(fp, io.TextIOBase)
+    for piece in iter_json(obj, pretty=pretty, chunk_items=chunk_items):
+        fp.write(piece.decode() if text else piece)
+
+
+def write_json_file(obj: Any, path: str | Path, *, pretty: bool = False) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as fp:
+        write_json(obj, fp, pretty=pretty)
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from sentinelscope import api
+from sentinelscope.models import DomainScanResult, WebPreview, utc_now
+
+
+async def _fake_scan(req, limits=None, on_result=None):
+    preview = WebPreview(url="https://example.com", status_code=200)
+    await asyncio.sleep(0)
+    if on_result is not None:
+        on_result("preview", preview)
+        on_result("takeover", None)
+    now = utc_now()
+    return DomainScanResult(domain="example.com", started_at=now, finished_at=now, preview=preview)
+
+
+def test_stream_emits_modules_then_done(monkeypatch, tmp_path):
+    monkeypatch.setattr(api, "run_domain_scan", _fake_scan)
+    monkeypatch.setattr(api, "JOBS_DB", str(tmp_path / "jobs.db"))
+    with TestClient(api.app) as client:
+        resp = client.post("/scan/domain/stream", json={"domain": "example.com"})
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in resp.text.splitlines()]
+        assert [e["event"] for e in events] == ["preview", "takeover", "done"]
+        assert events[0]["data"]["status_code"] == 200
+        assert events[-1]["data"]["modules"] == ["preview"]
+
+        sse = client.post("/scan/domain/stream?format=sse", json={"domain": "example.com"})
+        assert sse.text.startswith("event: preview\ndata: ")
+
+
+def test_results_are_recorded_and_queryable(monkeypatch, tmp_path):
+    monkeypatch.setattr(api, "run_domain_scan", _fake_scan)
+    monkeypatch.setattr(api, "JOBS_DB", str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(api, "RESULTS_DB", str(tmp_path / "results.db"))
+    with TestClient(api.app) as client:
+        client.post("/scan/domain/stream", json={"domain": "example.com"})
+        client.post("/scan/domain", json={"domain": "example.com"})
+        records = client.get("/results", params={"domain": "example.com"}).json()
+        assert len(records) == 2
+        assert client.get(f"/results/{records[0]['id']}").json()["preview"]["status_code"] == 200
+        assert client.get("/diff/example.com").json() == []
+
+
+def test_every_endpoint_shares_the_process_stage_limits(monkeypatch, tmp_path):
+    seen = []
+
+    async def recording_scan(req, limits=None, on_result=None):
+        seen.append(limits)
+        return await _fake_scan(req, on_result=on_result)
+
+    monkeypatch.setattr(api, "run_domain_scan", recording_scan)
+    monkeypatch.setattr(api, "JOBS_DB", str(tmp_path / "jobs.db"))
+    with TestClient(api.app) as client:
+        client.post("/scan/domain", json={"domain": "example.com"})
+        client.post("/scan/domain/stream", json={"domain": "example.com"})
+        job_id = client.post("/scans", json={"domain": "example.com"}).json()["id"]
+        for _ in range(200):
+            if client.get(f"/scans/{job_id}").json()["status"] == "done":
+                break
+            time.sleep(0.01)
+        limits = api.app.state.limits
+    assert len(seen) == 3 and all(s is limits for s in seen)
+    assert set(limits) >= {"ports", "takeover", "subdomains"}
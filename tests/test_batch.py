@@ -0,0 +1,36 @@
+import asyncio
+import io
+import json
+
+from sentinelscope import batch
+from sentinelscope.models import DomainScanRequest, DomainScanResult, utc_now
+from sentinelscope.target import TargetContext
+
+
+def test_batch_streams_results_and_resumes(tmp_path, monkeypatch):
+    active = {"now": 0, "peak": 0}
+    contexts = []
+
+    async def fake_scan(req, limits=None, on_result=None, previous=None, target=None):
+        contexts.append(target)
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        now = utc_now()
+        return DomainScanResult(domain=req.domain, started_at=now, finished_at=now)
+
+    monkeypatch.setattr(batch, "run_domain_scan", fake_scan)
+    checkpoint = tmp_path / "done.txt"
+    checkpoint.write_text("a.example\n")
+    out = io.StringIO()
+    targets = batch.iter_targets(["a.example", "", "# skip", "b.example", "c.example", "d.example"])
+    stats = asyncio.run(batch.run_batch(targets, DomainScanRequest(domain=""), out, concurrency=2, checkpoint=checkpoint))
+
+    domains = sorted(json.loads(line)["domain"] for line in out.getvalue().splitlines())
+    assert domains == ["b.example", "c.example", "d.example"]
+    assert (stats.scanned, stats.skipped, stats.failed) == (3, 1, 0)
+    assert active["peak"] == 2
+    # One resolution context shared by the whole batch
+    assert len({id(c) for c in contexts}) == 1 and isinstance(contexts[0], TargetContext)
+    assert batch.load_checkpoint(checkpoint) == {"a.example", "b.example", "c.example", "d.example"}
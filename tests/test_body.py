@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+import pytest
+
+from sentinelscope.scanning.body import BodyAnalyzer, BodyPipeline, InsecureReferenceCounter, TitleExtractor, analyze_body
+from sentinelscope.scanning.mixed_content import check_mixed_content
+from sentinelscope.scanning.web_preview import fetch_preview
+
+
+PAGE = (
+    "<html><head><TITLE> Café </title></head><body>"
+    "<img src='http://a.example/x.png'><script src=\"HTTP://b.example/y.js\"></script>"
+    "<a href='http://a.example/x.png'>again</a> https://fine.example http:/not-a-url"
+    "</body></html>"
+).encode("utf-8")
+
+
+def _chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_analyzers_agree_across_every_chunk_boundary():
+    for size in (1, 2, 7, 64, len(PAGE)):
+        title, counter = TitleExtractor(), InsecureReferenceCounter()
+        pipeline = BodyPipeline([title, counter])
+        for chunk in _chunked(PAGE, size):
+            pipeline.feed(chunk)
+        pipeline.close()
+        assert title.title == "Café"
+        assert counter.count == 3
+        assert counter.examples == ["http://a.example/x.png", "HTTP://b.example/y.js"]
+
+
+def test_title_offsets_survive_case_mapping_that_changes_length():
+    # "İ".lower() is two characters; offsets must come from the original text
+    page = "<p>İİİİ</p><title>Hello İstanbul</TITLE>".encode("utf-8")
+    for size in (1, 3, len(page)):
+        title = TitleExtractor()
+        pipeline = BodyPipeline([title])
+        for chunk in _chunked(page, size):
+            pipeline.feed(chunk)
+        pipeline.close()
+        assert title.title == "Hello İstanbul"
+
+
+def test_url_at_end_of_input_is_counted_once():
+    counter = InsecureReferenceCounter()
+    analyze_body(b"see http://tail.example/path", [counter])
+    assert (counter.count, counter.examples) == (1, ["http://tail.example/path"])
+
+
+def test_title_stops_reading_and_byte_cap_applies():
+    reads = []
+
+    async def body():
+        yield b"<title>Hi</title>"
+        for i in range(100):
+            reads.append(i)
+            yield b"x" * 1024
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body())))
+    preview = asyncio.run(fetch_preview("https://example.com", client=client))
+    assert preview.title == "Hi"
+    assert len(reads) <= 1
+
+    page = b"http://x.example/ " * 1000
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=page)))
+    report = asyncio.run(check_mixed_content("https://example.com", client=client, max_body_bytes=18 * 10))
+    assert report.insecure_reference_count == 10
+
+
+def test_analyzer_without_feed_fails_at_construction():
+    class Incomplete(BodyAnalyzer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,79 @@
+import asyncio
+import socket
+import struct
+
+from sentinelscope.scanning.bruteforce import brute_force_subdomains, encode_query, iter_wordlist, parse_response
+
+
+def test_iter_wordlist_is_lazy_and_skips_comments(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"www\r\n# comment\n\nAPI\nmail")
+    words = iter_wordlist(path)
+    assert next(words) == "www"
+    assert list(words) == ["api", "mail"]
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert list(iter_wordlist(empty)) == []
+
+
+def test_query_encoding_and_answer_parsing():
+    packet, question = encode_query(0x1234, "www.example.com")
+    assert packet[:2] == b"\x12\x34"
+    assert question == b"\x03www\x07example\x03com\x00\x00\x01\x00\x01"
+    answer = (
+        struct.pack("!HHHHHH", 0x1234, 0x8180, 1, 2, 0, 0)
+        + question
+        + b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, 60, 4) + socket.inet_aton("192.0.2.1")
+        + b"\xc0\x0c" + struct.pack("!HHIH", 16, 1, 60, 3) + b"\x02hi"
+    )
+    assert parse_response(answer) == (0x1234, 0, question, ["192.0.2.1"])
+
+
+class _FakeResolver(asyncio.DatagramProtocol):
+    """Answers www/api with 192.0.2.1 and, under wild.test, everything with 198.51.100.7."""
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        txid = struct.unpack_from("!H", data)[0]
+        question = data[12:]
+        name = question[:-4].lower()
+        address = None
+        if name.startswith((b"\x03www\x07", b"\x03api\x07")):
+            address = "192.0.2.1"
+        elif name.endswith(b"\x04wild\x04test\x00"):
+            address = "198.51.100.7"
+        if address is None:
+            self.transport.sendto(struct.pack("!HHHHHH", txid, 0x8183, 1, 0, 0, 0) + question, addr)
+            return
+        rr = b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, 60, 4) + socket.inet_aton(address)
+        # Mixed case in the echoed question, as resolvers using 0x20 encoding do
+        self.transport.sendto(struct.pack("!HHHHHH", txid, 0x8180, 1, 1, 0, 0) + question.upper() + rr, addr)
+
+
+def test_brute_force_finds_names_and_filters_wildcards():
+    async def run():
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(_FakeResolver, local_addr=("127.0.0.1", 0))
+        port = transport.get_extra_info("sockname")[1]
+        progress = []
+        try:
+            plain = await brute_force_subdomains(
+                "example.com", iter(["www", "api", "nope", "x" * 70]),
+                nameservers=["127.0.0.1"], port=port, timeout=0.5, on_progress=progress.append,
+            )
+            wild = await brute_force_subdomains(
+                "wild.test", ["www", "anything"], nameservers=["127.0.0.1"], port=port, timeout=0.5,
+            )
+        finally:
+            transport.close()
+        return plain, wild, progress
+
+    plain, wild, progress = asyncio.run(run())
+    assert plain.found == {"www.example.com": ["192.0.2.1"], "api.example.com": ["192.0.2.1"]}
+    assert plain.wildcard_addresses == set()
+    assert plain.stats.errors == 1  # the over-long label
+    assert progress and progress[-1].found == 2
+    assert wild.wildcard_addresses == {"198.51.100.7"}
+    assert wild.found == {} and wild.stats.wildcard_filtered == 2
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+import time
+
+import httpx
+import pytest
+
+from sentinelscope.scanning.ct import CTCache, CTCacheEntry, fetch_crtsh, iter_json_array, use_ct_cache
+
+
+async def _collect(chunks):
+    async def gen():
+        for chunk in chunks:
+            yield chunk
+    return [item async for item in iter_json_array(gen())]
+
+
+def test_iter_json_array_handles_any_chunk_boundary():
+    entries = [{"id": i, "name_value": f"a{i}.example.com\nbé\\\"{i}.example.com"} for i in range(5)] + [7, "x"]
+    text = json.dumps(entries, indent=1)
+    for size in (1, 3, 17, len(text)):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert asyncio.run(_collect(chunks)) == entries
+    assert asyncio.run(_collect(["[", "]"])) == []
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(['[{"id": 1}, {"id"']))
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(["<html>"]))
+
+
+def _client(entries, calls):
+    def handler(request):
+        calls.append(str(request.url))
+        return httpx.Response(200, content=json.dumps(entries).encode())
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_fetch_crtsh_dedupes_and_caches(tmp_path):
+    calls = []
+    entries = [
+        {"id": 10, "name_value": "www.example.com\nAPI.example.com"},
+        {"id": 12, "name_value": "www.example.com"},
+        {"id": 11, "name_value": "other.test"},
+    ]
+
+    async def run():
+        with use_ct_cache(tmp_path):
+            first = await fetch_crtsh("example.com", client=_client(entries, calls))
+            # Fresh cache: no request
+            second = await fetch_crtsh("example.com", client=_client(entries, calls))
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert first == (["api.example.com", "www.example.com"], 12)
+    assert second == first
+    assert len(calls) == 1
+
+
+def test_stale_cache_merges_only_new_entries(tmp_path):
+    calls = []
+    cache = CTCache(tmp_path)
+    path = tmp_path / "example.com.json"
+    path.write_text(json.dumps({"fetched_at": time.time() - 7 * 86400, "max_id": 12, "names": ["old.example.com"]}))
+
+    entries = [
+        {"id": 12, "name_value": "ignored.example.com"},  # at or below the high-water mark: already merged
+        {"id": 13, "name_value": "new.example.com"},
+    ]
+
+    async def run():
+        with use_ct_cache(tmp_path):
+            return await fetch_crtsh("example.com", client=_client(entries, calls))
+
+    assert asyncio.run(run()) == (["new.example.com", "old.example.com"], 13)
+    entry = cache.load("example.com")
+    assert entry.max_id == 13 and cache.is_fresh(entry)
+    assert not os.path.exists(tmp_path / "example.com.tmp")
+
+
+def test_failed_refresh_falls_back_to_cached_names(tmp_path):
+    (tmp_path / "example.com.json").write_text(json.dumps({"fetched_at": 0, "max_id": 5, "names": ["a.example.com"]}))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(502)))
+
+    async def run():
+        with use_ct_cache(tmp_path):
+            return await fetch_crtsh("example.com", client=client)
+
+    assert asyncio.run(run()) == (["a.example.com"], 5)
+    assert asyncio.run(fetch_crtsh("example.com", client=client)) == ([], None)
+
+
+def test_cache_ignores_domains_that_are_not_hostnames(tmp_path):
+    cache = CTCache(tmp_path / "ct")
+    outside = tmp_path / "x.json"
+    outside.write_text(json.dumps({"fetched_at": time.time(), "max_id": 1, "names": ["a.example.com"]}))
+    entry = CTCacheEntry(fetched_at=time.time(), max_id=1)
+
+    for domain in ("../x", "../../some/dir/x", "a/b.example.com", "..", ""):
+        cache.store(domain, entry)
+        assert cache.load(domain) is None
+    assert not (tmp_path / "ct").exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["x.json"]
+
+    cache.store("Example.COM.", entry)
+    assert cache.load("example.com").max_id == 1
@@ -1,4 +1,4 @@
-from sentinelscope.scanning.dns_records import assess_dns
+from sentinelscope.scanning.dns_records import assess_dns, build_dns_assessment
 
 
 def test_dns_assessment_fields():
@@ -7,3 +7,18 @@ def test_dns_assessment_fields():
     assert isinstance(res.spf_present, bool)
     assert res.dmarc_policy in {None, "none", "quarantine", "reject"}
 
+
+
+def test_dns_assessment_reads_dmarc_from_dmarc_label():
+    import dns.rdata
+
+    def txt(value: str):
+        return dns.rdata.from_text("IN", "TXT", f'"{value}"')
+
+    answers = {
+        ("example.com", "TXT"): [txt("v=spf1 include:_spf.example.com -all")],
+        ("_dmarc.example.com", "TXT"): [txt("v=DMARC1; p=reject; rua=mailto:d@example.com")],
+    }
+    res = build_dns_assessment("example.com", answers)
+    assert res.spf_policy == "-all"
+    assert res.dmarc_present and res.dmarc_policy == "reject"
@@ -0,0 +1,42 @@
+import time
+
+import dns.rdata
+
+from sentinelscope.utils.dns import DNSCache
+
+
+def _a(address: str):
+    return dns.rdata.from_text("IN", "A", address)
+
+
+def test_cache_honours_ttl_and_counts_hits():
+    cache = DNSCache()
+    cache.put("Example.com.", "a", [_a("192.0.2.1")], ttl=60)
+    assert [r.to_text() for r in cache.get("example.com", "A")] == ["192.0.2.1"]
+    cache.put("gone.example.com", "A", [_a("192.0.2.2")], ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("gone.example.com", "A") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["expired"] == 1
+
+
+def test_cache_negative_entries_and_lru_eviction():
+    cache = DNSCache(max_entries=2)
+    cache.put("nx.example.com", "A", [], ttl=60)
+    assert cache.get("nx.example.com", "A") == []
+    cache.put("a.example.com", "A", [_a("192.0.2.1")], ttl=60)
+    cache.get("nx.example.com", "A")
+    cache.put("b.example.com", "A", [_a("192.0.2.2")], ttl=60)
+    assert cache.get("a.example.com", "A") is None
+    assert cache.stats()["negative_hits"] == 2 and cache.stats()["evictions"] == 1
+
+
+def test_cache_snapshot_roundtrip(tmp_path):
+    cache = DNSCache()
+    cache.put("example.com", "A", [_a("192.0.2.1")], ttl=60)
+    cache.put("nx.example.com", "AAAA", [], ttl=60)
+    path = tmp_path / "dns.json"
+    cache.save(path)
+    warm = DNSCache()
+    assert warm.load(path) == 2
+    assert [r.to_text() for r in warm.get("example.com", "A")] == ["192.0.2.1"]
+    assert warm.get("nx.example.com", "AAAA") == []
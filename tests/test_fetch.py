@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+
+from sentinelscope.scanning.cookies import analyze_cookies
+from sentinelscope.scanning.fetch import PageSnapshot
+from sentinelscope.scanning.fingerprint import fingerprint_web
+from sentinelscope.scanning.mixed_content import check_mixed_content
+from sentinelscope.scanning.web_preview import fetch_preview
+
+
+def _page() -> PageSnapshot:
+    headers = httpx.Headers([
+        ("server", "nginx"),
+        ("cf-ray", "abc"),
+        ("content-type", "text/html; charset=utf-8"),
+        ("set-cookie", "sid=1; Secure; HttpOnly; SameSite=Lax"),
+        ("set-cookie", "theme=dark"),
+    ])
+    body = b"<html><title> Hello </title><img src='http://cdn.example.com/a.png'></html>"
+    return PageSnapshot(url="http://example.com", final_url="https://example.com/", status_code=200, headers=headers, body=body)
+
+
+def test_analyzers_share_snapshot():
+    async def _run():
+        page = _page()
+        preview = await fetch_preview(page.url, page=page)
+        assert preview.title == "Hello"
+        assert preview.url == "https://example.com/"
+        cookies = await analyze_cookies(page.url, page=page)
+        assert [c.name for c in cookies.cookies] == ["sid", "theme"]
+        fp = await fingerprint_web(page.url, page=page)
+        assert fp.waf_or_cdn == "cloudflare"
+        mixed = await check_mixed_content(page.url, page=page)
+        assert mixed.insecure_reference_count == 1
+    asyncio.run(_run())
+
+
+def test_failed_snapshot_yields_neutral_results():
+    async def _run():
+        page = PageSnapshot(url="https://example.invalid", final_url="https://example.invalid", error="boom")
+        preview = await fetch_preview(page.url, page=page)
+        assert preview.status_code is None
+        fp = await fingerprint_web(page.url, page=page)
+        assert fp.server is None
+    asyncio.run(_run())
@@ -0,0 +1,93 @@
+import asyncio
+
+import httpcore
+import httpx
+
+from sentinelscope.scanning.cookies import analyze_cookies
+from sentinelscope.scanning.fetch import fetch_page
+from sentinelscope.utils.dns import pin_addresses
+from sentinelscope.utils.http import CachedDNSBackend, HostLimitedTransport, build_client
+
+
+def test_host_limited_transport_caps_in_flight_requests():
+    in_flight = {"now": 0, "peak": 0}
+
+    async def body():
+        yield b"ok"
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return httpx.Response(200, content=body())
+
+    async def _run():
+        transport = HostLimitedTransport(httpx.MockTransport(handler), max_per_host=2)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await asyncio.gather(*(client.get("https://example.com/") for _ in range(8)))
+        assert in_flight["peak"] == 2
+        assert transport._slots == {}
+
+    asyncio.run(_run())
+
+
+def test_fetch_page_uses_injected_client():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"server": "mock"}, content=b"x" * 100)
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            page = await fetch_page("https://example.com/", client=client, max_body_bytes=10)
+        assert page.ok and page.headers["server"] == "mock"
+        assert page.body == b"x" * 10 and page.truncated
+
+    asyncio.run(_run())
+
+
+def test_shared_client_does_not_carry_cookies_between_scans():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("cookie"))
+        if request.headers.get("cookie"):
+            return httpx.Response(200)
+        return httpx.Response(200, headers={"set-cookie": "sid=1; Path=/"})
+
+    async def _run():
+        client = build_client()
+        client._transport = HostLimitedTransport(httpx.MockTransport(handler))
+        async with client:
+            first = await analyze_cookies("https://a.example/", client=client)
+            second = await analyze_cookies("https://a.example/", client=client)
+            assert len(client.cookies) == 0
+        assert [c.name for c in first.cookies] == ["sid"]
+        assert [c.name for c in second.cookies] == ["sid"]
+        assert seen == [None, None]
+
+    asyncio.run(_run())
+
+
+def test_cached_dns_backend_tries_every_address():
+    dialled = []
+
+    class Backend(httpcore.AsyncNetworkBackend):
+        async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+            dialled.append(host)
+            if host != "2001:db8::1":
+                raise httpcore.ConnectError("unreachable")
+            return "stream"
+
+    async def _run():
+        backend = CachedDNSBackend(Backend())
+        with pin_addresses({"dual.test": ["192.0.2.1", "2001:db8::1"], "dead.test": ["192.0.2.1", "192.0.2.2"]}):
+            assert await backend.connect_tcp("dual.test", 443) == "stream"
+            try:
+                await backend.connect_tcp("dead.test", 443)
+            except httpcore.ConnectError:
+                pass
+            else:
+                raise AssertionError("expected ConnectError")
+
+    asyncio.run(_run())
+    assert dialled == ["192.0.2.1", "2001:db8::1", "192.0.2.1", "192.0.2.2"]
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import timedelta
+
+import httpx
+
+from sentinelscope import scan
+from sentinelscope.models import DNSAxfrCheck, DomainScanRequest, DomainScanResult, SubdomainsResult, WebPreview, utc_now
+from sentinelscope.scanning.dns_posture import DNSPosture
+from sentinelscope.scanning.fetch import PageSnapshot
+
+
+REQ = DomainScanRequest(
+    domain="example.com",
+    scan_ports=False,
+    analyze_tls=False,
+    analyze_headers=False,
+    analyze_cookies=False,
+    fingerprint_web=False,
+    check_mixed_content=False,
+    analyze_cors=False,
+    check_security_txt=False,
+    analyze_dns=False,
+    check_dnssec_caa=False,
+)
+
+
+def _fakes(monkeypatch, seen_headers):
+    async def fake_fetch_page(url, timeout=6.0, headers=None):
+        seen_headers.append(headers)
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return PageSnapshot(url=url, final_url=url, status_code=304, headers=httpx.Headers({"etag": '"v1"'}))
+        return PageSnapshot(url=url, final_url=url, status_code=200, headers=httpx.Headers({"etag": '"v1"'}), body=b"<title>Hi</title>")
+
+    async def fake_crtsh(domain, http_timeout=8.0):
+        return ["www.example.com"], 42
+
+    async def fake_enumerate(root, dns_timeout=2.0, http_timeout=8.0, ct_names=None, **kwargs):
+        return SubdomainsResult(root_domain=root, discovered=ct_names, sources={"crt.sh": len(ct_names)})
+
+    async def fake_takeover(subdomains):
+        return None
+
+    async def fake_posture(domain, timeout=2.0, records=True, extras=True, known_zone=None):
+        zone = "ns1.example.net|7"
+        axfr = None if known_zone == zone else DNSAxfrCheck(domain=domain, attempted_ns=["ns1.example.net"])
+        return DNSPosture(None, None, axfr, zone, utc_now())
+
+    monkeypatch.setattr(scan, "fetch_page", fake_fetch_page)
+    monkeypatch.setattr(scan, "fetch_crtsh", fake_crtsh)
+    monkeypatch.setattr(scan, "enumerate_subdomains", fake_enumerate)
+    monkeypatch.setattr(scan, "check_takeover_candidates", fake_takeover)
+    monkeypatch.setattr(scan, "dns_posture", fake_posture)
+
+
+def test_rescan_carries_over_modules_with_unchanged_validators(monkeypatch):
+    seen_headers = []
+    _fakes(monkeypatch, seen_headers)
+
+    first = asyncio.run(scan.run_domain_scan(REQ))
+    assert first.carried_over == []
+    assert first.validators["http.etag"] == '"v1"'
+    assert first.validators["crtsh.max_id"] == "42"
+    assert first.validators["dns.zone"] == "ns1.example.net|7"
+
+    second = asyncio.run(scan.run_domain_scan(REQ, previous=first))
+    assert seen_headers[-1] == {"If-None-Match": '"v1"'}
+    assert second.carried_over == ["dns_axfr", "preview", "subdomains"]
+    assert second.preview == first.preview
+    assert second.dns_axfr == first.dns_axfr
+    assert second.validators["http.etag"] == '"v1"'
+
+
+def test_rescan_recomputes_when_previous_lacks_the_module(monkeypatch):
+    seen_headers = []
+    _fakes(monkeypatch, seen_headers)
+    now = utc_now()
+    previous = DomainScanResult(
+        domain="example.com",
+        started_at=now - timedelta(days=1),
+        finished_at=now - timedelta(days=1),
+        preview=WebPreview(url="https://example.com"),
+        validators={"http.etag": '"v1"', "crtsh.max_id": "41"},
+    )
+    result = asyncio.run(scan.run_domain_scan(REQ, previous=previous))
+    assert "subdomains" not in result.carried_over  # CT high-water mark moved
+    assert "dns_axfr" not in result.carried_over  # no zone validator recorded before
+    assert result.carried_over == ["preview"]
+
+
+def test_rescan_reruns_subdomains_when_the_wordlist_changes(monkeypatch, tmp_path):
+    _fakes(monkeypatch, [])
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("www\n")
+    first = asyncio.run(scan.run_domain_scan(REQ))
+
+    with_wordlist = REQ.model_copy(update={"subdomain_wordlist": str(wordlist)})
+    second = asyncio.run(scan.run_domain_scan(with_wordlist, previous=first))
+    assert "subdomains" not in second.carried_over  # wordlist added
+    assert "subdomains" in asyncio.run(scan.run_domain_scan(with_wordlist, previous=second)).carried_over
+
+    wordlist.write_text("www\napi\n")
+    third = asyncio.run(scan.run_domain_scan(with_wordlist, previous=second))
+    assert "subdomains" not in third.carried_over  # wordlist edited
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from sentinelscope.jobs import JobQueue, JobStore, QueueFull
+from sentinelscope.models import DomainScanRequest, DomainScanResult, utc_now
+
+
+async def _fake_runner(req):
+    await asyncio.sleep(0.01)
+    if req.domain == "broken.example":
+        raise RuntimeError("boom")
+    now = utc_now()
+    return DomainScanResult(domain=req.domain, started_at=now, finished_at=now)
+
+
+async def _wait_for(store, job_id, status):
+    for _ in range(200):
+        job = store.get(job_id)
+        if job.status == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+def test_jobs_run_to_completion_and_record_failures(tmp_path):
+    async def _run():
+        queue = JobQueue(JobStore(tmp_path / "jobs.db"), workers=2, runner=_fake_runner)
+        await queue.start()
+        ok = queue.submit(DomainScanRequest(domain="a.example"))
+        bad = queue.submit(DomainScanRequest(domain="broken.example"))
+        done = await _wait_for(queue.store, ok.id, "done")
+        failed = await _wait_for(queue.store, bad.id, "failed")
+        await queue.stop()
+        return done, failed
+
+    done, failed = asyncio.run(_run())
+    assert done.result.domain == "a.example" and done.finished_at is not None
+    assert failed.error == "boom" and failed.result is None
+
+
+def test_queue_rejects_when_full_and_survives_restart(tmp_path):
+    path = tmp_path / "jobs.db"
+
+    async def _run():
+        queue = JobQueue(JobStore(path), workers=1, max_queued=2, runner=_fake_runner)
+        first = queue.submit(DomainScanRequest(domain="a.example"))
+        queue.submit(DomainScanRequest(domain="b.example"))
+        with pytest.raises(QueueFull):
+            queue.submit(DomainScanRequest(domain="c.example"))
+        # A fresh process over the same file picks the queued work up
+        restarted = JobQueue(JobStore(path), workers=1, runner=_fake_runner)
+        await restarted.start()
+        job = await _wait_for(restarted.store, first.id, "done")
+        await restarted.stop()
+        return job
+
+    assert asyncio.run(_run()).result.domain == "a.example"
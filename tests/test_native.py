@@ -0,0 +1,73 @@
+import asyncio
+import importlib
+import sys
+import threading
+import types
+
+import pytest
+
+import sentinelscope.native as native
+
+
+class _FakeHandle:
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def done(self):
+        return self.cancelled.is_set()
+
+
+@pytest.fixture
+def fake_rs(monkeypatch):
+    """Load sentinelscope.native against a stand-in for the extension that answers from its own thread."""
+    module = types.SimpleNamespace(handles=[], release=threading.Event())
+
+    def spawn_scan_many(targets, timeout_ms, concurrency, callback):
+        handle = _FakeHandle()
+        module.handles.append(handle)
+
+        def run():
+            module.release.wait(5)
+            if not handle.cancelled.is_set():
+                callback([(host, sorted(ports)[:1]) for host, ports in targets])
+
+        threading.Thread(target=run, daemon=True).start()
+        return handle
+
+    module.spawn_scan_many = spawn_scan_many
+    monkeypatch.setitem(sys.modules, "sentinelscope_rs", module)
+    yield importlib.reload(native), module
+    monkeypatch.delitem(sys.modules, "sentinelscope_rs")
+    importlib.reload(native)
+
+
+def test_scan_many_native_async_delivers_results_from_runtime_thread(fake_rs):
+    mod, rs = fake_rs
+
+    async def run():
+        task = asyncio.create_task(mod.scan_many_native_async([("a", [443, 80]), ("b", [22])], 100, 10))
+        await asyncio.sleep(0.01)
+        assert not task.done()  # the loop stays free while the scan runs
+        rs.release.set()
+        return await task
+
+    assert asyncio.run(run()) == [("a", [80]), ("b", [22])]
+    assert rs.handles[0].cancelled.is_set()  # cancel() after completion is harmless
+
+
+def test_cancelling_scan_many_native_async_cancels_the_native_scan(fake_rs):
+    mod, rs = fake_rs
+
+    async def run():
+        task = asyncio.create_task(mod.scan_ports_native_async("a", [80], 100, 10))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert rs.handles[0].cancelled.is_set()
+    rs.release.set()
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+
+from sentinelscope.pipeline import Stage, run_stages, stage_limits
+
+
+def _sleeper(value, delay=0.05):
+    async def run(_):
+        await asyncio.sleep(delay)
+        return value
+    return run
+
+
+def test_independent_stages_run_concurrently_and_feed_dependents():
+    seen = []
+
+    async def combine(r):
+        return r["a"] + r["b"]
+
+    stages = [
+        Stage("a", _sleeper(1)),
+        Stage("b", _sleeper(2)),
+        Stage("sum", combine, deps=("a", "b")),
+    ]
+    started = time.perf_counter()
+    results = asyncio.run(run_stages(stages, on_result=lambda name, value: seen.append(name)))
+    assert time.perf_counter() - started < 0.09
+    assert results == {"a": 1, "b": 2, "sum": 3}
+    assert seen[-1] == "sum"
+
+
+def test_failing_stage_yields_none_and_hidden_stages_are_not_emitted():
+    async def boom(_):
+        raise RuntimeError("boom")
+
+    seen = []
+    stages = [Stage("raw", boom, emit=False), Stage("view", lambda r: _sleeper(r["raw"], 0)(r), deps=("raw",))]
+    results = asyncio.run(run_stages(stages, on_result=lambda name, value: seen.append(name)))
+    assert results == {"raw": None, "view": None}
+    assert seen == ["view"]
+
+
+def test_stage_limits_cap_concurrency():
+    active = {"now": 0, "peak": 0}
+
+    async def probe(_):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+
+    async def _run():
+        limits = stage_limits(net=2)
+        await run_stages([Stage(f"s{i}", probe, limit="net") for i in range(6)], limits=limits)
+
+    asyncio.run(_run())
+    assert active["peak"] == 2
+
+
+def test_cycles_and_unknown_deps_are_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(run_stages([Stage("a", _sleeper(1), deps=("b",)), Stage("b", _sleeper(1), deps=("a",))]))
+    with pytest.raises(ValueError):
+        asyncio.run(run_stages([Stage("a", _sleeper(1), deps=("missing",))]))
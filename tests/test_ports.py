@@ -0,0 +1,134 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+from sentinelscope.scanning.connect import CongestionWindow, ConnectScanner, RTTEstimator
+from sentinelscope.models import PortScanResult
+from sentinelscope.scanning.ports import scan_ports, scan_ports_many
+from sentinelscope.scanning.porttable import PortTable
+from sentinelscope.utils.dns import pin_addresses
+
+
+def _closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_scan_ports_many_shares_one_budget_and_keeps_order():
+    async def run():
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        open_port = server.sockets[0].getsockname()[1]
+        closed = _closed_port()
+        try:
+            many = await scan_ports_many({"127.0.0.1": [closed, open_port], "localhost": [closed]}, concurrency=2, timeout=0.5)
+            single = await scan_ports("127.0.0.1", [open_port, open_port, closed], timeout=0.5)
+        finally:
+            server.close()
+        return open_port, closed, many, single
+
+    open_port, closed, many, single = asyncio.run(run())
+    assert [r.host for r in many] == ["127.0.0.1", "localhost"]
+    assert many[0].open_ports == [open_port]
+    assert many[1].open_ports == [] and many[1].ports_scanned == [closed]
+    assert single.open_ports == [open_port] and len(single.results) == 2
+
+
+def test_scan_ports_falls_through_to_the_next_address():
+    async def run():
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        open_port = server.sockets[0].getsockname()[1]
+        try:
+            # Nothing listens on 127.0.0.2, the first record
+            with pin_addresses({"multi.test": ["127.0.0.2", "127.0.0.1"]}):
+                single = await scan_ports("multi.test", [open_port], timeout=0.5)
+                many = await scan_ports_many({"multi.test": [open_port]}, timeout=0.5)
+        finally:
+            server.close()
+        return open_port, single, many
+
+    open_port, single, many = asyncio.run(run())
+    assert single.open_ports == [open_port] and single.host == "multi.test"
+    assert many[0].open_ports == [open_port]
+
+
+def test_connect_scanner_reports_open_closed_and_unroutable():
+    async def run():
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        open_port = server.sockets[0].getsockname()[1]
+        closed = _closed_port()
+        seen = []
+        try:
+            results = await ConnectScanner(concurrency=2, timeout=0.2, on_result=lambda t, o: seen.append(t)).run(
+                iter([("127.0.0.1", open_port), ("127.0.0.1", closed), ("192.0.2.1", 80), ("not-an-ip", 80)])
+            )
+        finally:
+            server.close()
+        return open_port, closed, results, seen
+
+    open_port, closed, results, seen = asyncio.run(run())
+    assert results == {
+        ("127.0.0.1", open_port): True,
+        ("127.0.0.1", closed): False,
+        ("192.0.2.1", 80): False,
+        ("not-an-ip", 80): False,
+    }
+    assert len(seen) == 4
+
+
+def test_rtt_estimator_derives_clamped_timeout():
+    rtt = RTTEstimator(max_timeout=1.0, min_timeout=0.1)
+    assert rtt.timeout == 1.0  # nothing measured yet
+    rtt.update(0.05)
+    assert rtt.timeout == pytest.approx(0.15)  # SRTT + 4 * RTTVAR = 0.05 + 4 * 0.025
+    for _ in range(50):
+        rtt.update(0.001)
+    assert rtt.timeout == 0.1
+    rtt.update(5.0)
+    assert rtt.timeout == 1.0
+
+
+def test_congestion_window_grows_and_backs_off_on_timeout_spikes():
+    window = CongestionWindow(maximum=100, initial=10, minimum=4)
+    for _ in range(50):
+        window.on_answer()
+    assert window.size == 60  # slow start: one per answer
+    for i in range(5):
+        window.on_timeout(now=0.0, hold=1.0)
+    assert window.size == 31  # grew through the first timeouts (63), halved once, then held
+    window.on_timeout(now=2.0, hold=1.0)
+    assert window.size == 15
+
+    # A host that drops everything has a timeout baseline of 1: no spike, so it keeps growing
+    filtered = CongestionWindow(maximum=100, initial=10)
+    for i in range(100):
+        filtered.on_timeout(now=float(i), hold=0.5)
+    assert filtered.size == 100
+
+
+def test_port_table_keeps_only_open_ports_and_builds_results_lazily():
+    async def run():
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        open_port = server.sockets[0].getsockname()[1]
+        closed = _closed_port()
+        table = PortTable()
+        scanner = ConnectScanner(concurrency=4, timeout=0.5, on_result=table.record, collect=False)
+        try:
+            returned = await scanner.run([("127.0.0.1", closed), ("127.0.0.1", open_port)])
+        finally:
+            server.close()
+        return table, returned, open_port, closed
+
+    table, returned, open_port, closed = asyncio.run(run())
+    assert returned == {}
+    assert table.open_ports("127.0.0.1") == [open_port]
+    scanned = sorted([closed, open_port])
+    result = table.result("localhost", "127.0.0.1", scanned)
+    assert result.host == "localhost" and result.ports_scanned is scanned and result.open_ports == [open_port]
+    assert [(r.port, r.is_open) for r in result.results] == [(p, p == open_port) for p in scanned]
+    dumped = json.loads(result.model_dump_json())
+    assert PortScanResult.model_validate(dumped) == result
+    table.forget("127.0.0.1")
+    assert table.open_ports("127.0.0.1") == []
@@ -0,0 +1,64 @@
+import asyncio
+import itertools
+import socket
+
+import pytest
+
+from sentinelscope.scanning.ranges import RangeScanStats, iter_addresses, scan_ranges
+
+
+def test_iter_addresses_expands_specs_lazily():
+    assert list(iter_addresses(["10.0.0.0/30", "10.0.0.9-11", "192.0.2.5", "10.1.0.0/31"])) == [
+        "10.0.0.1", "10.0.0.2", "10.0.0.9", "10.0.0.10", "10.0.0.11", "192.0.2.5", "10.1.0.0", "10.1.0.1",
+    ]
+    # A /8 (or a v6 /32) is never materialised
+    assert list(itertools.islice(iter_addresses(["10.0.0.0/8"]), 2)) == ["10.0.0.1", "10.0.0.2"]
+    assert next(iter_addresses(["2001:db8::/32"])) == "2001:db8::1"
+    with pytest.raises(ValueError):
+        list(iter_addresses(["10.0.0.9-10.0.0.1"]))
+
+
+def _silent_port(sockets):
+    # A listener on 127.0.0.2 that never accepts: once its queue is full, SYNs are dropped
+    listener = socket.socket()
+    listener.bind(("127.0.0.2", 0))
+    listener.listen(0)
+    port = listener.getsockname()[1]
+    sockets.append(listener)
+    for _ in range(3):
+        filler = socket.socket()
+        filler.setblocking(False)
+        filler.connect_ex(("127.0.0.2", port))
+        sockets.append(filler)
+    return port
+
+
+def test_scan_ranges_only_scans_live_hosts_and_streams_results():
+    sockets = []
+
+    async def run():
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        open_port = server.sockets[0].getsockname()[1]
+        probe = _silent_port(sockets)
+        await asyncio.sleep(0.05)
+        stats = RangeScanStats()
+        try:
+            results = [
+                r async for r in scan_ranges(
+                    ["127.0.0.1-2"], [open_port],
+                    timeout=0.3, discovery_ports=[probe], chunk_size=1, stats=stats,
+                )
+            ]
+        finally:
+            server.close()
+        return open_port, results, stats
+
+    try:
+        open_port, results, stats = asyncio.run(run())
+    finally:
+        for s in sockets:
+            s.close()
+    # A refused discovery probe is enough to mark 127.0.0.1 live; 127.0.0.2 stays silent
+    assert [r.host for r in results] == ["127.0.0.1"]
+    assert results[0].open_ports == [open_port]
+    assert (stats.addresses, stats.live, stats.open_ports) == (2, 1, 1)
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sentinelscope.models import DomainScanResult, SubdomainsResult
+from sentinelscope.reporting import html
+from sentinelscope.scanning.porttable import PortTable
+
+
+def test_html_report_collapses_large_sections(tmp_path):
+    table = PortTable()
+    table.extend("192.0.2.1", [22, 443, 444])
+    now = datetime(2026, 1, 2, 3, 4, 5)
+    names = [f"s{i}.example.com" for i in range(2_500)]
+    result = DomainScanResult(
+        domain="example.com",
+        started_at=now,
+        finished_at=now,
+        subdomains=SubdomainsResult(root_domain="example.com", discovered=names, sources={"crt.sh": 2_500}),
+        ports=table.result("example.com", "192.0.2.1", list(range(1, 65536))),
+    )
+
+    path = html.write_html_report(result, tmp_path / "out" / "report.html")
+    page = path.read_text(encoding="utf-8")
+    assert page == html.render_html_report(result)
+    assert html._template() is html._template()
+
+    # One row per run of ports, not per port
+    assert html._port_runs(result.ports) == [("1–21", False), ("22", True), ("23–442", False), ("443–444", True), ("445–65535", False)]
+    assert page.count("<tr><td>") == 5
+    # Subdomains in pages; only the first is expanded
+    assert "<summary class=\"small\">2001–2500 of 2500</summary>" in page
+    assert page.count("<details open>") == 1
+    assert page.count("<li>s") == 2_500
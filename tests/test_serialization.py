@@ -0,0 +1,39 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from sentinelscope.models import DomainScanResult, SubdomainsResult, TLSInfo
+from sentinelscope.scanning.porttable import PortTable
+from sentinelscope.utils import serialization
+
+
+@pytest.mark.parametrize("backend", ["orjson", "pydantic"])
+def test_streamed_json_matches_model_dump_json(monkeypatch, backend):
+    if backend == "pydantic":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif not serialization.orjson_available():
+        pytest.skip("orjson not installed")
+    table = PortTable()
+    table.extend("192.0.2.1", [443, 22])
+    now = datetime(2026, 1, 2, 3, 4, 5)
+    result = DomainScanResult(
+        domain="example.com",
+        started_at=now,
+        finished_at=now,
+        subdomains=SubdomainsResult(root_domain="example.com", discovered=[f"s{i}.example.com" for i in range(25)], sources={"crt.sh": 25}),
+        ports=table.result("example.com", "192.0.2.1", list(range(1, 30)) + [443]),
+        tls=TLSInfo(domain="example.com", subject={"commonName": "example.com"}, valid_to=now, warnings=['quote " and\nnewline']),
+    )
+
+    for pretty, indent in ((False, None), (True, 2)):
+        expected = result.model_dump_json(indent=indent).encode()
+        # Small chunks: list boundaries fall inside every large list
+        assert b"".join(serialization.iter_json(result, pretty=pretty, chunk_items=7)) == expected
+        assert serialization.dumps(result, pretty=pretty) == expected
+
+    text, binary = io.StringIO(), io.BytesIO()
+    serialization.write_json([result, {"empty": [], "map": {}}], text)
+    serialization.write_json([result, {"empty": [], "map": {}}], binary)
+    assert text.getvalue().encode() == binary.getvalue()
+    assert binary.getvalue() == b"[" + result.model_dump_json().encode() + b',{"empty":[],"map":{}}]'
@@ -0,0 +1,55 @@
+import json
+
+from sentinelscope.signatures.engine import Signature, SignaturePack, load_pack
+from sentinelscope.scanning.takeover import _match_signature
+
+
+def test_pack_matches_overlapping_and_prefix_patterns_in_one_pass():
+    pack = SignaturePack("t", [
+        Signature("short", ["ab"], where="body"),
+        Signature("long", ["abcd"], where="body"),
+        Signature("inner", ["bc"], where="body"),
+        Signature("hdr", ["server:nginx"], where="headers"),
+        Signature("both", ["x-cache"], where="any"),
+    ])
+    assert pack.match(body="xxABCDxx") == ["short", "long", "inner"]
+    assert pack.match(body="abcx") == ["short", "inner"]
+    assert pack.match(headers={"Server": "nginx/1.25"}) == ["hdr"]
+    # "where" is respected: header-only patterns never match the body
+    assert pack.match(body="server:nginx x-cache") == ["both"]
+    assert pack.first(headers={"a": "b"}, body="") is None
+
+
+def test_builtin_packs_load_once_and_drive_takeover():
+    assert load_pack("waf") is load_pack("waf")
+    assert load_pack("waf").first(headers={"CF-RAY": "1"}) == "cloudflare"
+    assert load_pack("waf").first(headers={"Set-Cookie": "BIGipServerpool=123.0000"}) == "f5-big-ip"
+    # Vendor markers must not fire inside ordinary header values
+    assert load_pack("waf").first(headers={"Server": "Apache", "ETag": '"1f5-5e2f0a1b3c4d"'}) is None
+    assert _match_signature("<h1>404</h1><p>There isn't a GitHub Pages site here.</p>") == "GitHub Pages"
+    assert _match_signature("<Code>NoSuchBucket</Code>") == "AWS S3"
+    assert _match_signature("hello") is None
+
+
+def test_extra_pack_directory_extends_builtin(tmp_path, monkeypatch):
+    (tmp_path / "waf.json").write_text(json.dumps({"name": "waf", "signatures": [
+        {"name": "acme-shield", "where": "headers", "patterns": ["x-acme-shield"]},
+        {"name": "cloudflare", "where": "headers", "patterns": ["cf-connecting-thing"]},
+    ]}))
+    monkeypatch.setenv("SENTINELSCOPE_SIGNATURE_PATH", str(tmp_path))
+    load_pack.cache_clear()
+    try:
+        pack = load_pack("waf")
+        assert pack.first(headers={"x-acme-shield": "1"}) == "acme-shield"
+        assert pack.first(headers={"cf-connecting-thing": "1"}) == "cloudflare"
+    finally:
+        monkeypatch.delenv("SENTINELSCOPE_SIGNATURE_PATH")
+        load_pack.cache_clear()
+
+
+def test_large_pack_compiles_and_keeps_prefix_hits():
+    signatures = [Signature(f"sig{i}", [f"marker-{i:05d}", f"m{i}x"], where="body") for i in range(3000)]
+    signatures.append(Signature("prefix", ["marker-0"], where="body"))
+    pack = SignaturePack("big", signatures)
+    assert pack.match(body="... MARKER-00042 ...") == ["sig42", "prefix"]
+    assert pack.match(body="m7x m12x") == ["sig7", "sig12"]
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+from sentinelscope.models import (
+    DomainScanResult,
+    PortResult,
+    PortScanResult,
+    SecurityHeadersAssessment,
+    TLSInfo,
+)
+from sentinelscope.store import ResultStore, _diff, diff_results
+
+
+def _result(domain, started, grade="B", open_ports=(443,), valid_to=None):
+    return DomainScanResult(
+        domain=domain,
+        started_at=started,
+        finished_at=started + timedelta(seconds=5),
+        headers=SecurityHeadersAssessment(url=f"https://{domain}", grade=grade, score=50, findings=[]),
+        ports=PortScanResult(
+            host=domain,
+            ports_scanned=[22, 443, 8443],
+            open_ports=list(open_ports),
+            results=[PortResult(port=p, is_open=True) for p in open_ports],
+        ),
+        tls=TLSInfo(domain=domain, valid_to=valid_to, days_until_expiry=10),
+    )
+
+
+def test_store_indexes_and_queries(tmp_path):
+    store = ResultStore(tmp_path / "results.db")
+    t0 = datetime(2026, 1, 1)
+    first = store.save(_result("a.example", t0, grade="C", open_ports=(22, 443)))
+    store.save(_result("a.example", t0 + timedelta(days=7), grade="A", valid_to=t0 + timedelta(days=20)))
+    store.save(_result("b.example", t0 + timedelta(days=1), grade="C", open_ports=(22,)))
+
+    assert [r.domain for r in store.query(open_port=22)] == ["b.example", "a.example"]
+    assert [r.headers_grade for r in store.query(domain="a.example")] == ["A", "C"]
+    assert [r.domain for r in store.query(latest_only=True, headers_grade="C")] == ["b.example"]
+    assert [r.domain for r in store.query(tls_expires_before=t0 + timedelta(days=30))] == ["a.example"]
+    assert len(store.query(since=t0 + timedelta(days=1))) == 2
+    assert store.query(domain="a.example")[1].open_ports == [22, 443]
+
+    assert store.latest("a.example").headers.grade == "A"
+    assert store.latest("a.example", before=t0 + timedelta(days=7)).headers.grade == "C"
+    assert store.get(first).ports.open_ports == [22, 443]
+    assert store.get(999) is None
+    store.close()
+
+
+def test_diff_results_reports_changed_fields():
+    t0 = datetime(2026, 1, 1)
+    old = _result("a.example", t0, grade="C", open_ports=(22, 443))
+    new = _result("a.example", t0 + timedelta(days=7), grade="A", open_ports=(443, 8443))
+    new.tls.days_until_expiry = 3
+
+    changes = {c.path: c for c in diff_results(old, new)}
+    assert changes["headers.grade"].before == "C" and changes["headers.grade"].after == "A"
+    assert changes["ports.open_ports"].added == [8443]
+    assert changes["ports.open_ports"].removed == [22]
+    # The per-port view is derived from open_ports; it is not reported separately
+    assert not any(path.startswith("ports.results") for path in changes)
+    # Timings and countdowns always move; they are not reported
+    assert "started_at" not in changes and "tls.days_until_expiry" not in changes
+    assert diff_results(old, old) == []
+
+
+def test_list_diff_scales_and_keeps_order():
+    before = [f"h{i}.example" for i in range(50_000)]
+    after = before[1:] + ["new.example"]
+    changes = []
+    _diff("subdomains", before, after, changes)
+    assert changes[0].added == ["new.example"] and changes[0].removed == ["h0.example"]
+
+
+def test_payload_leaves_out_the_per_port_view(tmp_path):
+    store = ResultStore(tmp_path / "results.db")
+    result = _result("a.example", datetime(2026, 1, 1), open_ports=(443,))
+    result.ports = PortScanResult(host="a.example", ports_scanned=list(range(1, 65536)), open_ports=[443])
+    scan_id = store.save(result)
+    payload = store._db.execute("SELECT payload FROM scans WHERE id = ?", (scan_id,)).fetchone()["payload"]
+    assert '"results"' not in payload
+    # Rebuilt from the stored lists on load
+    loaded = store.get(scan_id).ports
+    assert loaded.open_ports == [443] and len(loaded.results) == 65535 and loaded.results[442].is_open
+    store.close()
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import dns.rdata
+import httpx
+
+from sentinelscope.scanning import takeover
+from sentinelscope.scanning.takeover import _provider_cnames, check_takeover_candidates, provider_for_cname
+from sentinelscope.signatures.engine import load_pack
+
+
+CNAMES = {
+    "docs.example.com": "example.github.io.",
+    "blog.example.com": "cdn.corp.net.",
+    "cdn.corp.net.": "corp.herokudns.com.",
+    "loop.example.com": "loop.example.com.",
+    "files.example.com": "bucket.s3.amazonaws.com.",
+    "www.example.com": "example.com.",
+}
+
+
+async def _fake_resolve(name, rdtype, timeout=2.0):
+    target = CNAMES.get(name)
+    return [dns.rdata.from_text("IN", "CNAME", target)] if target else []
+
+
+def test_provider_for_cname():
+    assert provider_for_cname("foo.herokuapp.com.") == "Heroku"
+    assert provider_for_cname("notgithub.io") is None
+
+
+def test_sweep_probes_only_provider_cnames(monkeypatch):
+    monkeypatch.setattr(takeover, "resolve", _fake_resolve)
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        if request.url.host == "docs.example.com" and request.url.scheme == "https":
+            return httpx.Response(404, content=b"<h1>There isn't a GitHub Pages site here.</h1>" + b"x" * 100_000)
+        return httpx.Response(200, content=b"<html>fine</html>")
+
+    subdomains = ["docs.example.com", "files.example.com", "www.example.com", "api.example.com"]
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    result = asyncio.run(check_takeover_candidates(subdomains, client=client, concurrency=2))
+
+    assert result.checked_count == 4
+    assert result.probed_count == 2
+    assert [f.subdomain for f in result.flagged] == ["docs.example.com"]
+    assert "GitHub Pages" in result.flagged[0].reason
+    assert sorted(requested) == [
+        "http://docs.example.com", "http://files.example.com",
+        "https://docs.example.com", "https://files.example.com",
+    ]
+
+
+def test_sweep_without_prefilter_respects_cap(monkeypatch):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"NoSuchBucket")))
+    result = asyncio.run(check_takeover_candidates(
+        [f"h{i}.example.com" for i in range(10)], client=client, prefilter=False, max_hosts=5,
+    ))
+    assert result.checked_count == 5 and result.probed_count == 5
+    assert len(result.flagged) == 5
+
+
+def test_prefilter_follows_cname_chains(monkeypatch):
+    monkeypatch.setattr(takeover, "resolve", _fake_resolve)
+    matches = asyncio.run(_provider_cnames(["blog.example.com", "loop.example.com", "www.example.com"], 2.0, 4))
+    assert matches == {"blog.example.com": "Heroku"}
+
+
+def test_extra_pack_cnames_are_probed(tmp_path, monkeypatch):
+    (tmp_path / "takeover.json").write_text(json.dumps({"name": "takeover", "signatures": [
+        {"name": "Acme Hosting", "where": "body", "patterns": ["no such acme site"], "cname": ["acmehost.example"]},
+    ]}))
+    monkeypatch.setenv("SENTINELSCOPE_SIGNATURE_PATH", str(tmp_path))
+    load_pack.cache_clear()
+    try:
+        assert provider_for_cname("shop.acmehost.example.") == "Acme Hosting"
+        assert provider_for_cname("x.github.io") == "GitHub Pages"
+    finally:
+        load_pack.cache_clear()
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from sentinelscope import scan
+from sentinelscope.models import DomainScanRequest, PortScanResult
+from sentinelscope.target import TargetContext
+from sentinelscope.utils import dns as dns_utils
+
+
+class _Rdata:
+    def __init__(self, text):
+        self.text = text
+
+    def to_text(self):
+        return self.text
+
+
+def test_names_are_resolved_once_and_pinned(monkeypatch):
+    calls = []
+
+    async def fake_resolve_many(queries, timeout=2.0):
+        queries = list(queries)
+        calls.append(queries[0][0])
+        # Round-robin DNS: a different answer every time
+        answer = {"A": [_Rdata(f"10.0.0.{len(calls)}")], "AAAA": []}
+        return {q: answer[q[1]] for q in queries}
+
+    monkeypatch.setattr(dns_utils, "resolve_many", fake_resolve_many)
+
+    async def run():
+        target = TargetContext()
+        first = await target.resolve("WWW.example.com.")
+        with target.pinned():
+            # Any code path that goes through resolve_host sees the pinned answer
+            second = await dns_utils.resolve_host("www.example.com")
+        unpinned = await dns_utils.resolve_host("www.example.com")
+        return target, first, second, unpinned
+
+    target, first, second, unpinned = asyncio.run(run())
+    assert first == second == ["10.0.0.1"]
+    assert unpinned == ["10.0.0.2"]
+    assert target.address("www.example.com") == "10.0.0.1"
+
+
+def test_once_shares_work_and_forgets_failures():
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return len(runs)
+
+    async def boom():
+        runs.append(1)
+        raise OSError("unreachable")
+
+    async def run():
+        target = TargetContext()
+        shared = await asyncio.gather(target.once("a", work), target.once("a", work))
+        again = await target.once("a", work)
+        for _ in range(2):
+            with pytest.raises(OSError):
+                await target.once("b", boom)
+        return shared, again
+
+    shared, again = asyncio.run(run())
+    assert shared == [1, 1] and again == 1
+    assert len(runs) == 3  # one run of "a", two of "b"
+
+
+def test_domains_on_one_address_share_a_port_scan(monkeypatch):
+    scanned = []
+
+    async def fake_scan_ports(host, ports, concurrency=200, timeout=1.0, adaptive=True):
+        scanned.append(host)
+        ports = sorted(ports)
+        return PortScanResult(host=host, ports_scanned=ports, open_ports=[443], results=[])
+
+    monkeypatch.setattr(scan, "scan_ports", fake_scan_ports)
+    base = dict(
+        scan_subdomains=False, analyze_headers=False, analyze_tls=False, analyze_dns=False, web_preview=False,
+        analyze_cors=False, analyze_cookies=False, fingerprint_web=False, check_security_txt=False,
+        check_mixed_content=False, check_dnssec_caa=False, port_profile="custom", custom_ports=[443],
+    )
+
+    async def fake_posture(domain, **kwargs):
+        return None
+
+    monkeypatch.setattr(scan, "dns_posture", fake_posture)
+
+    async def run():
+        target = TargetContext()
+        # Same addresses, answered in a different order (round-robin DNS)
+        target.pins.update({"a.example": ["192.0.2.10", "192.0.2.11"], "b.example": ["192.0.2.11", "192.0.2.10"]})
+        return await asyncio.gather(*(
+            scan.run_domain_scan(DomainScanRequest(domain=d, **base), target=target) for d in ("a.example", "b.example")
+        ))
+
+    a, b = asyncio.run(run())
+    # One scan for both names, through whichever name got there first (it resolves to the pinned address)
+    assert len(scanned) == 1 and scanned[0] in ("a.example", "b.example")
+    assert (a.ports.host, b.ports.host) == ("a.example", "b.example")
+    assert a.addresses == ["192.0.2.10", "192.0.2.11"] and b.addresses == ["192.0.2.11", "192.0.2.10"]
@@ -0,0 +1,135 @@
+import asyncio
+import socket
+import ssl
+from datetime import timedelta
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.x509.oid import NameOID
+
+from sentinelscope.models import utc_now
+from sentinelscope.scanning.certificates import CertificateCache, chain_issues, parse_certificate
+from sentinelscope.scanning.tls import get_tls_info, get_tls_info_async, inspect_tls_endpoints
+
+
+def _certificate(name: str, key, issuer_name=None, issuer_key=None, days: int = 90):
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, name)])
+    now = utc_now()
+    return (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(issuer_name or subject)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=days))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName(name)]), critical=False)
+        .sign(issuer_key or key, hashes.SHA256())
+    )
+
+
+def _server_context(tmp_path, name: str) -> ssl.SSLContext:
+    key = ec.generate_private_key(ec.SECP256R1())
+    cert = _certificate(name, key)
+    cert_path, key_path = tmp_path / f"{name}.pem", tmp_path / f"{name}.key"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    ))
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.load_cert_chain(cert_path, key_path)
+    return ctx
+
+
+def _closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _serve(ctx: ssl.SSLContext, handshakes: list):
+    async def handle(reader, writer):
+        handshakes.append(writer.get_extra_info("peername"))
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, ssl=ctx)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_get_tls_info_async_reads_leaf(tmp_path):
+    async def run():
+        server, port = await _serve(_server_context(tmp_path, "a.test"), [])
+        try:
+            return await get_tls_info_async("127.0.0.1", port, timeout=2.0, sni="a.test"), port
+        finally:
+            server.close()
+
+    info, port = asyncio.run(run())
+    assert info.port == port and info.address == "127.0.0.1"
+    assert info.protocol and info.protocol.startswith("TLS")
+    assert info.fingerprint_sha256 and len(info.fingerprint_sha256) == 64
+    assert info.warnings == []
+    # Parsed from the DER even though nothing was verified
+    assert info.subject == {"commonName": "a.test"} and info.issuer == {"commonName": "a.test"}
+    assert info.subject_alternative_names == ["a.test"]
+    assert info.key_type == "EC (secp256r1)" and info.key_size == 256
+    assert info.signature_algorithm == "ecdsa-with-SHA256"
+    assert info.days_until_expiry in (88, 89)
+    assert info.chain_issues == ["Self-signed certificate"]
+
+    failed = get_tls_info("127.0.0.1", port=_closed_port(), timeout=1.0)
+    assert failed.fingerprint_sha256 is None
+    assert failed.warnings and failed.warnings[0].startswith("TLS check failed")
+
+
+def test_inspect_tls_endpoints_dedupes_handshakes_and_groups_certificates(tmp_path):
+    async def run():
+        seen_a, seen_b = [], []
+        server_a, port_a = await _serve(_server_context(tmp_path, "a.test"), seen_a)
+        server_b, port_b = await _serve(_server_context(tmp_path, "b.test"), seen_b)
+        closed = _closed_port()
+        try:
+            inventory = await inspect_tls_endpoints(
+                [("127.0.0.1", port_a), ("127.0.0.1", port_a), ("127.0.0.1", port_b), ("127.0.0.1", closed)],
+                timeout=2.0,
+            )
+        finally:
+            server_a.close()
+            server_b.close()
+        return inventory, port_a, port_b, closed, len(seen_a), len(seen_b)
+
+    inventory, port_a, port_b, closed, count_a, count_b = asyncio.run(run())
+    assert inventory.endpoint_count == 3 and inventory.handshake_count == 3
+    assert count_a == 1 and count_b == 1
+    assert sorted(c.endpoints[0] for c in inventory.certificates) == sorted([f"127.0.0.1:{port_a}", f"127.0.0.1:{port_b}"])
+    assert all(c.addresses == ["127.0.0.1"] for c in inventory.certificates)
+    assert len(inventory.failures) == 1 and inventory.failures[0].startswith(f"127.0.0.1:{closed}:")
+
+
+def test_parse_certificate_is_cached_and_flags_chain_problems():
+    root_key = ec.generate_private_key(ec.SECP256R1())
+    root = _certificate("Test Root", root_key)
+    leaf_key = rsa.generate_private_key(public_exponent=65537, key_size=1024)
+    leaf = _certificate("*.example.test", leaf_key, issuer_name=root.subject, issuer_key=root_key)
+    stray = _certificate("Stray CA", ec.generate_private_key(ec.SECP256R1()), days=-1)
+    leaf_der = leaf.public_bytes(serialization.Encoding.DER)
+
+    cache = CertificateCache(max_entries=2)
+    parsed = parse_certificate(leaf_der, cache=cache)
+    assert parse_certificate(leaf_der, cache=cache) is parsed
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert parsed.key_type == "RSA" and parsed.key_size == 1024
+    assert parsed.issues == ["Weak RSA key (1024 bits)"]
+
+    good = [parsed, parse_certificate(root.public_bytes(serialization.Encoding.DER), cache=cache)]
+    assert chain_issues(good, host="www.example.test") == ["Weak RSA key (1024 bits)"]
+    assert "Certificate does not cover a.b.example.test" in chain_issues(good, host="a.b.example.test")
+
+    bad = [parsed, parse_certificate(stray.public_bytes(serialization.Encoding.DER), cache=cache)]
+    issues = chain_issues(bad, host="www.example.test")
+    assert "Chain out of order: *.example.test is not issued by Stray CA" in issues
+    assert "Expired chain certificate: Stray CA" in issues
+    assert cache.stats()["evictions"] == 1
+    assert chain_issues([parsed], host="www.example.test") == ["Weak RSA key (1024 bits)", "No intermediate certificates sent"]
+    assert chain_issues([parsed], host="www.example.test", complete=False) == ["Weak RSA key (1024 bits)"]